@@ -0,0 +1,237 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from core.caches import shared_cache
+from core.metrics import registry
+
+
+class TokenEntry(namedtuple(
+        'TokenEntry', 'expires user_id version db values')):
+    """Cached token lookup: the user's field values and marker version"""
+
+    def build(self):
+        """Return a new user instance from the cached values"""
+        names, values = zip(*self.values)
+
+        return get_user_model().from_db(self.db, names, values)
+
+
+class TokenCache:
+    """Bounded, TTL-evicted cache of token key to user
+
+    Entries live in an in-process LRU map. Deleting a token, or changing
+    or deactivating its user, drops them in the process doing it; other
+    processes accept the token until the TTL runs out. With a cache
+    shared by the processes, entries are also kept there with the
+    version of their token's marker, which is read on every hit, and
+    revocations delete the markers, so every process stops accepting
+    the token at once.
+
+    Entries keep the user_fields values of the user, never the password
+    hash, and each hit builds a new user, so requests never share an
+    instance; other fields are loaded from the database when read.
+    """
+    key_prefix = 'token-auth:'
+    version_prefix = 'token-auth-version:'
+    user_fields = ('email', 'name', 'is_active', 'is_staff', 'is_superuser')
+
+    def __init__(self, max_size=10000, ttl=300, shared_alias=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.shared_alias = shared_alias
+        self._entries = OrderedDict()
+        self._user_keys = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_settings(cls):
+        """Return a cache configured by settings.TOKEN_AUTH_CACHE"""
+        options = getattr(settings, 'TOKEN_AUTH_CACHE', {})
+        return cls(
+            max_size=options.get('MAX_SIZE', 10000),
+            ttl=options.get('TTL', 300),
+            shared_alias=options.get('SHARED_CACHE'),
+        )
+
+    @property
+    def shared(self):
+        return shared_cache(self.shared_alias)
+
+    def _forget(self, key):
+        """Drop a key from the local map, lock must be held"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            keys = self._user_keys.get(entry.user_id)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del self._user_keys[entry.user_id]
+
+    def _store(self, key, entry):
+        """Add an entry to the local map, lock must be held"""
+        self._forget(key)
+        self._entries[key] = entry
+        self._user_keys.setdefault(entry.user_id, set()).add(key)
+        while len(self._entries) > self.max_size:
+            self._forget(next(iter(self._entries)))
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def version(self, key):
+        """Return the version of a token's marker, starting it if missing
+
+        Read it before looking the token up, so that a revocation made
+        during the lookup is not hidden by the entry cached after it.
+        """
+        shared = self.shared
+        if shared is None:
+            return None
+        version_key = self.version_prefix + key
+        shared.add(version_key, time.time_ns(), self.ttl)
+
+        return shared.get(version_key)
+
+    def get(self, key):
+        """Return the cached user of a token key or None"""
+        shared = self.shared
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires <= time.monotonic():
+                self._forget(key)
+                entry = None
+        if shared is None:
+            version = None
+        elif entry is not None:
+            version = shared.get(self.version_prefix + key)
+        else:
+            found = shared.get_many(
+                [self.key_prefix + key, self.version_prefix + key]
+            )
+            version = found.get(self.version_prefix + key)
+            entry = found.get(self.key_prefix + key)
+            if entry is not None:
+                entry = TokenEntry(
+                    time.monotonic() + self.ttl, *entry[1:]
+                )
+
+        if entry is None or entry.version != version:
+            with self._lock:
+                self._forget(key)
+            self._count(False)
+            return None
+
+        with self._lock:
+            self._store(key, entry)
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return entry.build()
+
+    def set(self, key, user, version):
+        """Cache the user of a token key, looked up at a marker version"""
+        shared = self.shared
+        if shared is not None and version is None:
+            return
+        names = {user._meta.pk.attname, *self.user_fields}
+        entry = TokenEntry(
+            time.monotonic() + self.ttl, user.pk, version, user._state.db,
+            tuple(
+                (field.attname, getattr(user, field.attname))
+                for field in user._meta.concrete_fields
+                if field.attname in names
+            ),
+        )
+        with self._lock:
+            self._store(key, entry)
+        if shared is not None:
+            shared.set(self.key_prefix + key, tuple(entry), self.ttl)
+
+    def invalidate(self, *keys):
+        """Stop accepting token keys from the cache in every process"""
+        with self._lock:
+            for key in keys:
+                self._forget(key)
+        shared = self.shared
+        if shared is not None and keys:
+            shared.delete_many([
+                prefix + key for key in keys
+                for prefix in (self.version_prefix, self.key_prefix)
+            ])
+
+    def invalidate_user(self, user):
+        """Stop accepting every token of a user"""
+        with self._lock:
+            keys = set(self._user_keys.get(user.pk, ()))
+        if self.shared is not None:
+            keys.update(
+                Token.objects.filter(user=user).values_list('key', flat=True)
+            )
+        self.invalidate(*keys)
+
+    def clear(self):
+        """Empty the local cache and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._user_keys.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        """Return the size and hit ratio of the cache"""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+        }
+
+
+token_cache = TokenCache.from_settings()
+
+
+@registry.collector
+def token_cache_metrics():
+    stats = token_cache.stats()
+    return [
+        ('token_cache_hits_total', 'counter',
+         'Token lookups served from the cache', stats['hits']),
+        ('token_cache_misses_total', 'counter',
+         'Token lookups that went to the database', stats['misses']),
+        ('token_cache_size', 'gauge',
+         'Tokens held by the local cache', stats['size']),
+    ]
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Token authentication serving token lookups from token_cache"""
+
+    def authenticate_credentials(self, key):
+        user = token_cache.get(key)
+        if user is None:
+            version = token_cache.version(key)
+            user, token = super().authenticate_credentials(key)
+            token_cache.set(key, user, version)
+            return (user, token)
+
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(
+                _('User inactive or deleted.')
+            )
+
+        return (user, Token(key=key, user=user))
@@ -0,0 +1,18 @@
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+
+# Backends whose entries only the process writing them can read
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+
+def shared_cache(alias):
+    """Return the cache named alias if processes share it, else None"""
+    if not alias:
+        return None
+    cache = caches[alias]
+    if isinstance(cache, PROCESS_LOCAL_BACKENDS):
+        return None
+
+    return cache
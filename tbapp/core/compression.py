@@ -0,0 +1,136 @@
+import gzip
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+DEFAULTS = {
+    'MIN_SIZE': 1024,
+    'GZIP_LEVEL': 6,
+    'BROTLI_QUALITY': 5,
+}
+
+
+def options():
+    """Return settings.COMPRESSION over the defaults"""
+    return dict(DEFAULTS, **getattr(settings, 'COMPRESSION', {}))
+
+
+def encodings():
+    """Return the supported content codings, most compact first"""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate(request):
+    """Return the coding to compress a response to request with, if any
+
+    Codings the client gives a q of 0 are refused; among the others the
+    most compact supported one is picked.
+    """
+    accepted = {}
+    for item in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        name, _, params = item.partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    for encoding in encodings():
+        if accepted.get(encoding, accepted.get('*', 0)) > 0:
+            return encoding
+
+    return None
+
+
+def compress(content, encoding):
+    """Return content compressed with a content coding"""
+    if encoding == 'br':
+        return brotli.compress(content, quality=options()['BROTLI_QUALITY'])
+
+    return gzip.compress(
+        content, compresslevel=options()['GZIP_LEVEL'], mtime=0
+    )
+
+
+def compress_stream(chunks, encoding):
+    """Yield the chunks of a streamed body compressed with a content
+    coding, flushing after each chunk so clients get rows as they come"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=options()['BROTLI_QUALITY'])
+        for chunk in chunks:
+            yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+        return
+
+    compressor = zlib.compressobj(
+        options()['GZIP_LEVEL'], zlib.DEFLATED, 16 + zlib.MAX_WBITS
+    )
+    for chunk in chunks:
+        yield compressor.compress(chunk) + \
+            compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+def compress_response(response, encoding):
+    """Compress a response with a content coding, if it is worth it
+
+    Bodies under COMPRESSION['MIN_SIZE'] bytes, already encoded ones and
+    those compression does not shrink are left as they are. Returns
+    whether the response was compressed.
+    """
+    if response.has_header('Content-Encoding') or (
+            not response.streaming and
+            len(response.content) < options()['MIN_SIZE']):
+        return False
+
+    patch_vary_headers(response, ('Accept-Encoding',))
+    if encoding is None:
+        return False
+
+    if response.streaming:
+        response.streaming_content = compress_stream(
+            response.streaming_content, encoding
+        )
+        del response['Content-Length']
+    else:
+        content = compress(response.content, encoding)
+        if len(content) >= len(response.content):
+            return False
+        response.content = content
+        response['Content-Length'] = str(len(content))
+
+    # A strong ETag would claim the encoded body is the same bytes
+    etag = response.get('ETag')
+    if etag and etag.startswith('"'):
+        response['ETag'] = 'W/' + etag
+    response['Content-Encoding'] = encoding
+
+    return True
+
+
+class CompressionMiddleware:
+    """Compress responses over a size threshold for clients accepting it
+
+    Uses brotli when it is installed and accepted, else gzip; responses
+    already encoded, such as cached list bodies, pass through.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        compress_response(response, negotiate(request))
+
+        return response
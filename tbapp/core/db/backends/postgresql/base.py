@@ -0,0 +1,7 @@
+from django.db.backends.postgresql import base
+
+from core.db.mixins import HealthCheckMixin, PoolMixin
+
+
+class DatabaseWrapper(HealthCheckMixin, PoolMixin, base.DatabaseWrapper):
+    """PostgreSQL backend with health checks and an optional pool"""
@@ -0,0 +1,80 @@
+from core.db.pool import get_pool
+
+
+class HealthCheckMixin:
+    """Check a persistent connection works before a request reuses it
+
+    Enabled by CONN_HEALTH_CHECKS in the database settings. The check
+    runs once per request, on the first query, so a connection dropped
+    by the server while idle is replaced instead of failing the query.
+    """
+    health_check_done = False
+
+    def connect(self):
+        super().connect()
+        self.health_check_done = True
+
+    def close_if_unusable_or_obsolete(self):
+        super().close_if_unusable_or_obsolete()
+        self.health_check_done = False
+
+    def ensure_connection(self):
+        if self.connection is not None and not self.health_check_done \
+                and self.settings_dict.get('CONN_HEALTH_CHECKS'):
+            self.health_check_done = True
+            if not self.in_atomic_block and not self.is_usable():
+                self.close()
+        super().ensure_connection()
+
+
+class PoolMixin:
+    """Borrow connections from a pool shared by the threads of a process
+
+    Enabled by a POOL setting with a MAX_SIZE. Closing the connection
+    at the end of a request, as CONN_MAX_AGE = 0 does, gives it back to
+    the pool instead of closing it.
+    """
+
+    @property
+    def pool(self):
+        options = self.settings_dict.get('POOL') or {}
+        if not options.get('MAX_SIZE'):
+            return None
+
+        return get_pool(self.alias, options, check=self.check_raw)
+
+    def check_raw(self, raw):
+        """Return whether a pooled connection still answers"""
+        try:
+            cursor = raw.cursor()
+            try:
+                cursor.execute('SELECT 1')
+            finally:
+                cursor.close()
+        except Exception:
+            return False
+
+        return True
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+
+        return pool.checkout(
+            lambda: super(PoolMixin, self).get_new_connection(conn_params)
+        )
+
+    def _close(self):
+        pool = self.pool
+        if pool is None or self.connection is None:
+            return super()._close()
+
+        # Connections left in a transaction or after errors are not reused
+        discard = self.in_atomic_block or self.errors_occurred
+        if not discard:
+            try:
+                self.connection.rollback()
+            except Exception:
+                discard = True
+        pool.checkin(self.connection, discard=discard)
@@ -0,0 +1,249 @@
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+
+from django.db.utils import OperationalError
+
+
+class PoolTimeout(OperationalError):
+    """No connection was returned to a full pool in time"""
+
+
+class ConnectionPool:
+    """Bounded pool of raw database connections shared by threads
+
+    Connections are handed out most recently returned first, so a
+    quiet pool keeps a few hot connections while the rest reach
+    max_idle and are closed. A connection idle longer than check_after
+    is checked before it is handed out again.
+    """
+
+    def __init__(self, alias='default', max_size=10, timeout=30.0,
+                 max_idle=300.0, max_lifetime=3600.0, check_after=5.0,
+                 check=None, stats_dir=None):
+        self.alias = alias
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.check_after = check_after
+        self.check = check
+        self.stats_dir = stats_dir
+        self._cond = threading.Condition()
+        self._idle = deque()
+        self._born = {}
+        self._size = 0
+        self._in_use = 0
+        self._published = 0.0
+        self.checkouts = 0
+        self.created = 0
+        self.discarded = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+        self.timeouts = 0
+        self.peak_in_use = 0
+
+    def _expired(self, raw, returned, now):
+        return now - returned > self.max_idle \
+            or now - self._born[id(raw)] > self.max_lifetime
+
+    def _discard(self, raw):
+        """Forget a connection; called with the lock held"""
+        self._born.pop(id(raw), None)
+        self._size -= 1
+        self.discarded += 1
+        self._cond.notify()
+
+    def _take(self, deadline):
+        """Return (raw, idle seconds) of an idle connection, or (None, 0)
+        once a new one may be opened, waiting while the pool is full"""
+        stale = []
+        try:
+            with self._cond:
+                while True:
+                    now = time.monotonic()
+                    while self._idle:
+                        raw, returned = self._idle.pop()
+                        if self._expired(raw, returned, now):
+                            self._discard(raw)
+                            stale.append(raw)
+                            continue
+                        return raw, now - returned
+                    if self._size < self.max_size:
+                        self._size += 1
+                        return None, 0.0
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        raise PoolTimeout(
+                            f'No connection of the {self.alias!r} pool '
+                            f'was free after {self.timeout}s'
+                        )
+                    self.waits += 1
+                    self._cond.wait(remaining)
+        finally:
+            for raw in stale:
+                close_quietly(raw)
+
+    def checkout(self, connect):
+        """Return a connection, opening one with connect() if needed"""
+        started = time.monotonic()
+        deadline = started + self.timeout
+        while True:
+            raw, idle = self._take(deadline)
+            if raw is None:
+                try:
+                    raw = connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._born[id(raw)] = time.monotonic()
+                    self.created += 1
+                break
+            if idle < self.check_after or self.check is None \
+                    or self.check(raw):
+                break
+            with self._cond:
+                self._discard(raw)
+            close_quietly(raw)
+
+        waited = time.monotonic() - started
+        with self._cond:
+            self.checkouts += 1
+            self.wait_time += waited
+            self.max_wait = max(self.max_wait, waited)
+            self._in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self._in_use)
+
+        return raw
+
+    def checkin(self, raw, discard=False):
+        """Give a connection back, closing it when discard is set"""
+        with self._cond:
+            self._in_use -= 1
+            keep = not discard and id(raw) in self._born
+            if keep:
+                self._idle.append((raw, time.monotonic()))
+                self._cond.notify()
+            elif id(raw) in self._born:
+                self._discard(raw)
+        if not keep:
+            close_quietly(raw)
+        self.publish()
+
+    def close_all(self):
+        """Close every idle connection"""
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+            for raw, _ in idle:
+                self._discard(raw)
+        for raw, _ in idle:
+            close_quietly(raw)
+
+    def stats(self):
+        """Return the usage counters of the pool"""
+        with self._cond:
+            return {
+                'alias': self.alias,
+                'pid': os.getpid(),
+                'max_size': self.max_size,
+                'connections': self._size,
+                'idle': len(self._idle),
+                'in_use': self._in_use,
+                'peak_in_use': self.peak_in_use,
+                'saturation': self._in_use / self.max_size,
+                'checkouts': self.checkouts,
+                'created': self.created,
+                'discarded': self.discarded,
+                'waits': self.waits,
+                'timeouts': self.timeouts,
+                'avg_wait_ms': self.wait_time / self.checkouts * 1000
+                if self.checkouts else 0.0,
+                'max_wait_ms': self.max_wait * 1000,
+            }
+
+    def publish(self, interval=5.0):
+        """Write the stats to stats_dir, at most once per interval"""
+        now = time.monotonic()
+        if self.stats_dir is None or now - self._published < interval:
+            return
+        self._published = now
+        write_stats(self.stats_dir, self.stats())
+
+
+def close_quietly(raw):
+    try:
+        raw.close()
+    except Exception:
+        pass
+
+
+def stats_path(stats_dir, alias, pid):
+    return os.path.join(stats_dir, f'pool-{alias}-{pid}.json')
+
+
+def write_stats(stats_dir, stats):
+    """Atomically write the stats of one process's pool"""
+    os.makedirs(stats_dir, exist_ok=True)
+    path = stats_path(stats_dir, stats['alias'], stats['pid'])
+    fd, tmp = tempfile.mkstemp(dir=stats_dir, suffix='.tmp')
+    with os.fdopen(fd, 'w') as stream:
+        json.dump(stats, stream)
+    os.replace(tmp, path)
+
+
+def read_stats(stats_dir):
+    """Return the published stats of the pools of live processes"""
+    found = []
+    for path in sorted(glob.glob(os.path.join(stats_dir, 'pool-*.json'))):
+        try:
+            with open(path) as stream:
+                stats = json.load(stream)
+        except (OSError, ValueError):
+            continue
+        try:
+            os.kill(stats['pid'], 0)
+        except ProcessLookupError:
+            continue
+        except PermissionError:
+            pass
+        found.append(stats)
+
+    return found
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, options, check=None):
+    """Return the process-wide pool of a database alias"""
+    with _pools_lock:
+        pool = _pools.get(alias)
+        if pool is None:
+            pool = _pools[alias] = ConnectionPool(
+                alias=alias,
+                max_size=options.get('MAX_SIZE', 10),
+                timeout=options.get('TIMEOUT', 30.0),
+                max_idle=options.get('MAX_IDLE', 300.0),
+                max_lifetime=options.get('MAX_LIFETIME', 3600.0),
+                check_after=options.get('CHECK_AFTER', 5.0),
+                check=check,
+                stats_dir=options.get('STATS_DIR'),
+            )
+
+    return pool
+
+
+def pools():
+    """Return the pools of this process by alias"""
+    with _pools_lock:
+        return dict(_pools)
@@ -0,0 +1,75 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+from core.caches import shared_cache
+
+
+# Database serving the reads of the current request, None for the primary
+_read_alias = ContextVar('read_alias', default=None)
+
+
+def pin_key(user_id):
+    return f'db-pin:{user_id}'
+
+
+def pin_cache():
+    """Return the cache shared by every process holding the pins, None
+    when READ_YOUR_WRITES_CACHE names none"""
+    return shared_cache(getattr(settings, 'READ_YOUR_WRITES_CACHE', None))
+
+
+def pin_to_primary(user_id):
+    """Send a user's reads to the primary for READ_YOUR_WRITES_SECONDS"""
+    cache = pin_cache()
+    if cache is not None:
+        cache.set(pin_key(user_id), True, settings.READ_YOUR_WRITES_SECONDS)
+
+
+def is_pinned(user_id):
+    """Return whether a user wrote recently enough to read the primary
+
+    Without a shared cache a pin set by another process could not be
+    seen, so every user reads the primary.
+    """
+    cache = pin_cache()
+    if cache is None:
+        return True
+
+    return bool(cache.get(pin_key(user_id)))
+
+
+def choose_replica():
+    """Return a replica alias, None when no replica is configured"""
+    replicas = getattr(settings, 'DATABASE_REPLICAS', ())
+    return random.choice(replicas) if replicas else None
+
+
+def set_read_alias(alias):
+    """Send the following reads to a database, returning a reset token"""
+    return _read_alias.set(alias)
+
+
+def reset_read_alias(token):
+    _read_alias.reset(token)
+
+
+class ReplicaRouter:
+    """Route reads to the replica chosen for the current request
+
+    Reads go to the primary unless a view opted into a replica, so
+    management commands, signals and writes in progress always see
+    committed data of the primary. Writes always go to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
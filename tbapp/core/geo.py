@@ -0,0 +1,127 @@
+import math
+from decimal import Decimal
+
+
+# Size of a grid cell in degrees, about 11 km of latitude
+CELL_DEGREES = 0.1
+ROWS = int(round(180 / CELL_DEGREES))
+COLUMNS = int(round(360 / CELL_DEGREES))
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# Above this many latitude rows a query scans one coarse cell range
+MAX_CELL_RANGES = 64
+
+
+def _row(latitude):
+    row = int(math.floor((float(latitude) + 90) / CELL_DEGREES))
+    return min(max(row, 0), ROWS - 1)
+
+
+def _column(longitude):
+    column = int(math.floor((float(longitude) + 180) / CELL_DEGREES))
+    return column % COLUMNS
+
+
+def cell_for(latitude, longitude):
+    """Return the grid cell of a point, None if it has no coordinates
+
+    Cells are numbered row by row from the south-west corner, so the
+    cells of a latitude band within a longitude range are consecutive.
+    """
+    if latitude is None or longitude is None:
+        return None
+
+    return _row(latitude) * COLUMNS + _column(longitude)
+
+
+def _column_spans(west, east):
+    """Return the column ranges between two longitudes, split at 180"""
+    if east - west >= 360:
+        return [(0, COLUMNS - 1)]
+    first, last = _column(west), _column(east)
+    if first <= last:
+        return [(first, last)]
+
+    return [(first, COLUMNS - 1), (0, last)]
+
+
+def cell_ranges(south, west, north, east):
+    """Return the (first, last) cell ranges covering a bounding box
+
+    A box with west > east crosses the antimeridian. Boxes spanning
+    more than MAX_CELL_RANGES rows get a single range from the first
+    to the last cell; callers refine the candidates anyway.
+    """
+    first_row, last_row = _row(south), _row(north)
+    spans = _column_spans(west, east)
+    if last_row - first_row + 1 > MAX_CELL_RANGES:
+        return [(
+            first_row * COLUMNS + min(span[0] for span in spans),
+            last_row * COLUMNS + max(span[1] for span in spans),
+        )]
+
+    return [
+        (row * COLUMNS + first, row * COLUMNS + last)
+        for row in range(first_row, last_row + 1)
+        for first, last in spans
+    ]
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """Return the (south, west, north, east) box around a circle"""
+    delta_lat = radius_km / KM_PER_DEGREE
+    south = max(latitude - delta_lat, -90.0)
+    north = min(latitude + delta_lat, 90.0)
+    widest = max(abs(south), abs(north))
+    if widest >= 90 or radius_km >= EARTH_RADIUS_KM * math.pi / 2:
+        return south, -180.0, north, 180.0
+    delta_lng = delta_lat / math.cos(math.radians(widest))
+    if delta_lng >= 180:
+        return south, -180.0, north, 180.0
+    west = (longitude - delta_lng + 180) % 360 - 180
+    east = (longitude + delta_lng + 180) % 360 - 180
+
+    return south, west, north, east
+
+
+def haversine(latitude, longitude, other_latitude, other_longitude):
+    """Return the great-circle distance between two points in km"""
+    lat1, lat2 = math.radians(latitude), math.radians(other_latitude)
+    d_lat = lat2 - lat1
+    d_lng = math.radians(other_longitude - longitude)
+    a = math.sin(d_lat / 2) ** 2 \
+        + math.cos(lat1) * math.cos(lat2) * math.sin(d_lng / 2) ** 2
+
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def parse_point(value):
+    """Parse 'lat,lng' into floats, raising ValueError when invalid"""
+    try:
+        latitude, longitude = (float(part) for part in value.split(','))
+    except (AttributeError, ValueError):
+        raise ValueError('Expected "latitude,longitude".')
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValueError('Coordinates out of range.')
+
+    return latitude, longitude
+
+
+def parse_bbox(value):
+    """Parse 'south,west,north,east' into floats, raising ValueError"""
+    try:
+        south, west, north, east = (float(part) for part in value.split(','))
+    except (AttributeError, ValueError):
+        raise ValueError('Expected "south,west,north,east".')
+    if not (-90 <= south <= north <= 90
+            and -180 <= west <= 180 and -180 <= east <= 180):
+        raise ValueError('Coordinates out of range.')
+
+    return south, west, north, east
+
+
+def to_decimal(value):
+    """Return a float coordinate as a Decimal for database comparisons"""
+    return Decimal(repr(value))
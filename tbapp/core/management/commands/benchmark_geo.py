@@ -0,0 +1,111 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.test.utils import (
+    setup_databases, setup_test_environment, teardown_databases,
+    teardown_test_environment,
+)
+
+from core.models import Place
+
+from travel import seeding
+
+
+def timed(function):
+    """Return (seconds, result) of a call"""
+    started = time.perf_counter()
+    result = function()
+
+    return time.perf_counter() - started, result
+
+
+def measure(queries, radius, rng):
+    """Time radius queries around random places of their owner
+
+    Each query is answered by a scan of the owner's places and by
+    Place.objects.nearest, which filters on the geo_cell index first.
+    Returns the seconds of both, the matches and the points where their
+    results differ.
+    """
+    points = list(Place.objects.filter(geo_cell__isnull=False).values_list(
+        'user_id', 'latitude', 'longitude'
+    ))
+    result = {
+        'scan_seconds': 0.0, 'grid_seconds': 0.0, 'matches': 0,
+        'mismatches': [],
+    }
+    for _ in range(queries if points else 0):
+        user_id, latitude, longitude = rng.choice(points)
+        latitude, longitude = float(latitude), float(longitude)
+        places = Place.objects.filter(user_id=user_id)
+
+        elapsed, expected = timed(lambda: list(
+            places.with_distance(latitude, longitude)
+            .filter(distance__lte=radius)
+            .order_by('distance', 'pk').values_list('distance', 'pk')
+        ))
+        result['scan_seconds'] += elapsed
+        elapsed, found = timed(
+            lambda: places.nearest(latitude, longitude, radius)
+        )
+        result['grid_seconds'] += elapsed
+
+        if found != expected:
+            result['mismatches'].append((latitude, longitude))
+        result['matches'] += len(found)
+
+    return result
+
+
+class Command(BaseCommand):
+    """Django command to benchmark radius queries on the place grid"""
+    help = (
+        'Seed a test database with places and compare radius queries of '
+        'a user answered by a scan of their places with queries filtered '
+        'on the geo_cell index'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--places', type=int, default=10000,
+                            help='Places per user')
+        parser.add_argument('--queries', type=int, default=20)
+        parser.add_argument('--radius', type=float, default=10)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        databases = setup_databases(verbosity=0, interactive=False)
+        try:
+            started = time.perf_counter()
+            for _ in seeding.seed(
+                options['users'], options['places'], 0, 0,
+                seed=options['seed']
+            ):
+                pass
+            self.stdout.write(
+                f'Seeded {Place.objects.count()} places in '
+                f'{time.perf_counter() - started:.2f}s'
+            )
+            result = measure(
+                options['queries'], options['radius'],
+                random.Random(options['seed'])
+            )
+        finally:
+            teardown_databases(databases, verbosity=0)
+            teardown_test_environment()
+
+        for latitude, longitude in result['mismatches']:
+            self.stderr.write(f'Mismatch near {latitude:.4f},{longitude:.4f}')
+        queries = max(options['queries'], 1)
+        scan, grid = result['scan_seconds'], result['grid_seconds']
+        self.stdout.write(
+            f'scan: {scan / queries * 1000:.2f} ms/query\n'
+            f'grid: {grid / queries * 1000:.2f} ms/query, '
+            f'{result["matches"] / queries:.0f} matches'
+        )
+        if grid:
+            self.stdout.write(self.style.SUCCESS(
+                f'Speed-up: {scan / grid:.1f}x'
+            ))
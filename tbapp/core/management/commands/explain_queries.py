@@ -0,0 +1,106 @@
+import re
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+
+from core.models import Category, Place, Visit, Plan
+
+
+# Full table scans in EXPLAIN output of PostgreSQL and SQLite
+FULL_SCAN_PATTERNS = (
+    re.compile(r'Seq Scan on (\w+)'),
+    re.compile(r'SCAN (?:TABLE )?(\w+)(?! USING)(?:\s|$)'),
+)
+
+
+def full_scans(plan):
+    """Return the tables read with a full scan in a query plan"""
+    tables = set()
+    for pattern in FULL_SCAN_PATTERNS:
+        tables.update(pattern.findall(plan))
+
+    return sorted(tables)
+
+
+def access_queries(user, page_size):
+    """Return the list endpoint querysets of a user by name"""
+    place_ids = list(
+        Place.objects.filter(user=user).values_list('id', flat=True)[:5]
+    )
+    visit_ids = list(
+        Visit.objects.filter(user=user).values_list('id', flat=True)[:5]
+    )
+    return {
+        'categories': Category.objects.order_by('-name')[:page_size],
+        'places': Place.objects.filter(user=user)
+        .order_by('-id')[:page_size],
+        'visits': Visit.objects.filter(user=user)
+        .order_by('-id')[:page_size],
+        'visits by place': Visit.objects
+        .filter(user=user, place__id__in=place_ids)
+        .order_by('-id')[:page_size],
+        'visits by time': Visit.objects.filter(user=user)
+        .order_by('-time')[:page_size],
+        'plans': Plan.objects.filter(user=user)
+        .order_by('-id')[:page_size],
+        'plans by visit': Plan.objects
+        .filter(user=user, visits__id__in=visit_ids)
+        .distinct().order_by('-id')[:page_size],
+        'plans by begin': Plan.objects.filter(user=user)
+        .order_by('-begins')[:page_size],
+    }
+
+
+class Command(BaseCommand):
+    """Django command to explain and time the API's list queries"""
+    help = (
+        'Print the query plan and timing of each list query, flagging '
+        'full table scans. Run against a seeded database: planners '
+        'prefer sequential scans on tiny tables.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--email', help='User to query as, defaults to the busiest'
+        )
+        parser.add_argument('--page-size', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument(
+            '--verbose-plans', action='store_true',
+            help='Print the full query plans'
+        )
+
+    def get_user(self, email):
+        users = get_user_model().objects
+        if email:
+            user = users.filter(email=email).first()
+        else:
+            user = users.annotate(visits=Count('visit')) \
+                .order_by('-visits').first()
+        if user is None:
+            raise CommandError('No user to run the queries as')
+
+        return user
+
+    def handle(self, *args, **options):
+        user = self.get_user(options['email'])
+        self.stdout.write(f'Explaining queries of {user.email} '
+                          f'on {connection.vendor}')
+
+        for name, queryset in access_queries(
+                user, options['page_size']).items():
+            plan = queryset.explain()
+            start = time.perf_counter()
+            for _ in range(options['repeat']):
+                list(queryset.all())
+            elapsed = (time.perf_counter() - start) / options['repeat']
+
+            scans = full_scans(plan)
+            status = self.style.WARNING(f'full scan of {", ".join(scans)}') \
+                if scans else self.style.SUCCESS('indexed')
+            self.stdout.write(f'{name:<16} {elapsed * 1000:8.3f} ms  {status}')
+            if options['verbose_plans']:
+                self.stdout.write(plan)
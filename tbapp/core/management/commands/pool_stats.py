@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.db.pool import read_stats
+
+
+class Command(BaseCommand):
+    """Django command to print the connection pool stats of the servers"""
+    help = (
+        'Print checkouts, waits and saturation of the database connection '
+        'pool of every running server process'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database', help='Only show the pools of this alias'
+        )
+
+    def handle(self, *args, **options):
+        found = []
+        for alias, database in settings.DATABASES.items():
+            if options['database'] and alias != options['database']:
+                continue
+            stats_dir = (database.get('POOL') or {}).get('STATS_DIR')
+            if stats_dir:
+                found.extend(
+                    stats for stats in read_stats(stats_dir)
+                    if stats['alias'] == alias
+                )
+        if not found:
+            self.stdout.write('No pool stats published')
+            return
+
+        self.stdout.write(
+            f'{"alias":<10} {"pid":>7} {"conns":>5} {"in use":>6} '
+            f'{"peak":>5} {"sat":>5} {"checkouts":>9} {"waits":>6} '
+            f'{"avg wait":>9} {"max wait":>9} {"timeouts":>8}'
+        )
+        for stats in found:
+            saturation = f'{stats["saturation"]:.0%}'
+            self.stdout.write(
+                f'{stats["alias"]:<10} {stats["pid"]:>7} '
+                f'{stats["connections"]:>3}/{stats["max_size"]:<2}'
+                f'{stats["in_use"]:>6} {stats["peak_in_use"]:>5} '
+                f'{saturation:>5} {stats["checkouts"]:>9} '
+                f'{stats["waits"]:>6} {stats["avg_wait_ms"]:>7.2f}ms '
+                f'{stats["max_wait_ms"]:>7.2f}ms {stats["timeouts"]:>8}'
+            )
+            if stats['timeouts'] or stats['peak_in_use'] >= stats['max_size']:
+                self.stdout.write(self.style.WARNING(
+                    f'Pool of {stats["alias"]} in process {stats["pid"]} '
+                    f'was saturated, consider raising DB_POOL_SIZE'
+                ))
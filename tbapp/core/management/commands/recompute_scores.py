@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Place
+
+
+class Command(BaseCommand):
+    """Django command to rebuild place scores from their visits"""
+    help = 'Recompute score totals and avg_score of every place'
+
+    def handle(self, *args, **options):
+        count = Place.objects.recompute_scores()
+        self.stdout.write(self.style.SUCCESS(f'Recomputed {count} places'))
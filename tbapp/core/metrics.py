@@ -0,0 +1,262 @@
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Summaries recorded per view: name, help text, smallest and largest
+# bucket bound
+SUMMARIES = (
+    ('request_duration_seconds', 'Wall time of the request', 1e-5, 300),
+    ('db_duration_seconds', 'Time spent in database queries', 1e-6, 300),
+    ('db_queries', 'Number of database queries', 1, 1e5),
+    ('serializer_duration_seconds', 'Time spent in serializers', 1e-6, 300),
+    ('response_size_bytes', 'Size of the response body', 1, 1e9),
+)
+
+PREFIX = 'tbapp_'
+
+_sample = ContextVar('request_sample', default=None)
+
+
+class Histogram:
+    """Counts of observations in exponentially growing buckets
+
+    Each bucket is about 19% wider than the previous one, so quantiles
+    interpolated within a bucket are within a few percent of the exact
+    value at constant memory.
+    """
+    growth = 2 ** 0.25
+
+    def __init__(self, low, high):
+        steps = math.ceil(math.log(high / low, self.growth))
+        self.bounds = [low * self.growth ** i for i in range(steps + 1)]
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+            self.min = min(self.min, value)
+            self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Return the estimated value below which a fraction q falls"""
+        with self._lock:
+            if not self.count:
+                return math.nan
+            rank = q * self.count
+            seen = 0
+            for index, count in enumerate(self.counts):
+                if seen + count >= rank and count:
+                    low = self.bounds[index - 1] if index else 0.0
+                    high = self.bounds[index] \
+                        if index < len(self.bounds) else self.max
+                    value = low + (high - low) * (rank - seen) / count
+                    return min(max(value, self.min), self.max)
+                seen += count
+
+            return self.max
+
+
+class Registry:
+    """Histograms of every recorded view"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+        self._requests = {}
+        self._collectors = []
+
+    def collector(self, function):
+        """Register a function returning (name, type, help, value)
+        tuples of metrics kept elsewhere, such as cache counters"""
+        self._collectors.append(function)
+        return function
+
+    def _histograms(self, view):
+        histograms = self._views.get(view)
+        if histograms is None:
+            with self._lock:
+                histograms = self._views.setdefault(view, {
+                    name: Histogram(low, high)
+                    for name, _, low, high in SUMMARIES
+                })
+
+        return histograms
+
+    def record(self, view, status_code, values):
+        """Add the measurements of one request to a view's histograms"""
+        histograms = self._histograms(view)
+        for name, value in values.items():
+            histograms[name].observe(value)
+        key = (view, f'{status_code // 100}xx')
+        with self._lock:
+            self._requests[key] = self._requests.get(key, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._views = {}
+            self._requests = {}
+
+    def summary(self, view, name):
+        """Return the histogram of a measurement of a view, if any"""
+        return self._views.get(view, {}).get(name)
+
+    def render(self):
+        """Return the metrics in the Prometheus text exposition format"""
+        with self._lock:
+            views = sorted(self._views.items())
+            requests = sorted(self._requests.items())
+        lines = [
+            f'# HELP {PREFIX}requests_total Requests by view and status',
+            f'# TYPE {PREFIX}requests_total counter',
+        ]
+        for (view, status), count in requests:
+            lines.append(
+                f'{PREFIX}requests_total{{view="{escape(view)}",'
+                f'status="{status}"}} {count}'
+            )
+        for name, help_text, _, _ in SUMMARIES:
+            metric = PREFIX + name
+            lines.append(f'# HELP {metric} {help_text}')
+            lines.append(f'# TYPE {metric} summary')
+            for view, histograms in views:
+                histogram = histograms[name]
+                label = f'view="{escape(view)}"'
+                for q in QUANTILES:
+                    lines.append(
+                        f'{metric}{{{label},quantile="{q}"}} '
+                        f'{number(histogram.quantile(q))}'
+                    )
+                lines.append(
+                    f'{metric}_sum{{{label}}} {number(histogram.sum)}'
+                )
+                lines.append(f'{metric}_count{{{label}}} {histogram.count}')
+        for collect in self._collectors:
+            for name, kind, help_text, value in collect():
+                metric = PREFIX + name
+                lines.append(f'# HELP {metric} {help_text}')
+                lines.append(f'# TYPE {metric} {kind}')
+                lines.append(f'{metric} {number(value)}')
+
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+def escape(value):
+    return value.replace('\\', r'\\').replace('"', r'\"') \
+        .replace('\n', r'\n')
+
+
+def number(value):
+    if math.isnan(value):
+        return 'NaN'
+
+    return repr(float(value))
+
+
+@contextmanager
+def serialization_timer():
+    """Add the time spent in the block to the current request's
+    serializer time
+
+    Only the outermost block is timed, so nested serializers are not
+    counted twice.
+    """
+    sample = _sample.get()
+    if sample is None or sample['depth']:
+        yield
+        return
+
+    sample['depth'] += 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        sample['serializer_duration_seconds'] += \
+            time.perf_counter() - started
+        sample['depth'] -= 1
+
+
+class SerializerTimingMixin:
+    """Add the time spent serializing to the current request's sample"""
+
+    def to_representation(self, instance):
+        with serialization_timer():
+            return super().to_representation(instance)
+
+
+class PerformanceMiddleware:
+    """Record wall time, database and serializer time and response size
+    of every request under its resolved view name"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        sample = {
+            'db_duration_seconds': 0.0,
+            'db_queries': 0,
+            'serializer_duration_seconds': 0.0,
+            'depth': 0,
+        }
+
+        def timed_query(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                sample['db_duration_seconds'] += \
+                    time.perf_counter() - started
+                sample['db_queries'] += 1
+
+        token = _sample.set(sample)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(timed_query)
+                    )
+                response = self.get_response(request)
+        finally:
+            _sample.reset(token)
+
+        sample.pop('depth')
+        sample['request_duration_seconds'] = time.perf_counter() - started
+        if not response.streaming:
+            sample['response_size_bytes'] = len(response.content)
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else '<unresolved>'
+        registry.record(view, response.status_code, sample)
+
+        return response
+
+
+def metrics_view(request):
+    """Return the recorded metrics for Prometheus to scrape"""
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token and request.META.get('HTTP_AUTHORIZATION') != f'Bearer {token}':
+        return HttpResponseForbidden()
+
+    return HttpResponse(
+        registry.render(), content_type='text/plain; version=0.0.4'
+    )
@@ -0,0 +1,46 @@
+# Generated by Django 3.0.14 on 2026-10-17 02:10
+
+from django.db import migrations, models
+from django.db.models import Avg, Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def compute_scores(apps, schema_editor):
+    Place = apps.get_model('core', 'Place')
+    Visit = apps.get_model('core', 'Visit')
+    db_alias = schema_editor.connection.alias
+    visits = Visit.objects.using(db_alias).filter(
+        place=OuterRef('pk'), score__isnull=False
+    ).order_by().values('place')
+    Place.objects.using(db_alias).update(
+        score_sum=Coalesce(
+            Subquery(visits.annotate(total=Sum('score')).values('total')), 0
+        ),
+        score_count=Coalesce(
+            Subquery(visits.annotate(count=Count('id')).values('count')), 0
+        ),
+        avg_score=Subquery(
+            visits.annotate(average=Avg('score')).values('average')
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_plan'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='place',
+            name='score_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='place',
+            name='score_sum',
+            field=models.DecimalField(decimal_places=1, default=0, max_digits=12),
+        ),
+        migrations.RunPython(compute_scores, migrations.RunPython.noop),
+    ]
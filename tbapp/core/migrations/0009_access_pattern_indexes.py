@@ -0,0 +1,43 @@
+# Generated by Django 3.0.14 on 2026-10-17 02:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_place_scores'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='place',
+            index=models.Index(fields=['user', 'id'], name='place_user_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='plan',
+            index=models.Index(fields=['user', 'id'], name='plan_user_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='plan',
+            index=models.Index(fields=['user', 'begins'], name='plan_user_begins_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='visit',
+            index=models.Index(fields=['user', 'id'], name='visit_user_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='visit',
+            index=models.Index(fields=['user', 'place'], name='visit_user_place_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='visit',
+            index=models.Index(fields=['user', 'time'], name='visit_user_time_idx'),
+        ),
+        # Covers visits__id__in lookups from the visit side of the join
+        migrations.RunSQL(
+            'CREATE INDEX plan_visits_visit_plan_idx '
+            'ON core_plan_visits (visit_id, plan_id)',
+            'DROP INDEX plan_visits_visit_plan_idx',
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 3.0.14 on 2026-10-17 02:22
+
+from django.db import migrations, models
+
+from core.geo import cell_for
+
+
+def compute_cells(apps, schema_editor):
+    Place = apps.get_model('core', 'Place')
+    db_alias = schema_editor.connection.alias
+    places = Place.objects.using(db_alias).filter(
+        latitude__isnull=False, longitude__isnull=False
+    ).only('latitude', 'longitude')
+    batch = []
+    for place in places.iterator(chunk_size=2000):
+        place.geo_cell = cell_for(place.latitude, place.longitude)
+        batch.append(place)
+        if len(batch) == 2000:
+            Place.objects.using(db_alias).bulk_update(batch, ['geo_cell'])
+            batch = []
+    Place.objects.using(db_alias).bulk_update(batch, ['geo_cell'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='place',
+            name='geo_cell',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='place',
+            index=models.Index(fields=['user', 'geo_cell'], name='place_user_cell_idx'),
+        ),
+        migrations.RunPython(compute_cells, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 3.0.14 on 2026-10-17 02:25
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+from core.search import SEARCH_CONFIG
+
+
+# Text columns of the search vectors by weight label
+SEARCH_COLUMNS = {
+    'core_place': {'name': 'A', 'notes': 'B'},
+    'core_visit': {'title': 'A', 'notes': 'B'},
+}
+
+
+def vector_sql(columns, prefix=''):
+    return ' || '.join(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', "
+        f"coalesce({prefix}{column}, '')), '{weight}')"
+        for column, weight in columns.items()
+    )
+
+
+def create_search_triggers(apps, schema_editor):
+    """Maintain the vectors with triggers and index them, on PostgreSQL"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, columns in SEARCH_COLUMNS.items():
+        watched = ', '.join([*columns, 'search_vector'])
+        schema_editor.execute(
+            f'CREATE FUNCTION {table}_search_vector_update() '
+            f'RETURNS trigger AS $$ BEGIN '
+            f'NEW.search_vector := {vector_sql(columns, "NEW.")}; '
+            f'RETURN NEW; END $$ LANGUAGE plpgsql'
+        )
+        schema_editor.execute(
+            f'CREATE TRIGGER {table}_search_vector_trigger '
+            f'BEFORE INSERT OR UPDATE OF {watched} ON {table} '
+            f'FOR EACH ROW EXECUTE PROCEDURE {table}_search_vector_update()'
+        )
+        schema_editor.execute(
+            f'UPDATE {table} SET search_vector = {vector_sql(columns)}'
+        )
+        schema_editor.execute(
+            f'CREATE INDEX {table}_search_idx ON {table} '
+            f'USING GIN (search_vector)'
+        )
+
+
+def drop_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table in SEARCH_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {table}_search_idx')
+        schema_editor.execute(
+            f'DROP TRIGGER IF EXISTS {table}_search_vector_trigger '
+            f'ON {table}'
+        )
+        schema_editor.execute(
+            f'DROP FUNCTION IF EXISTS {table}_search_vector_update()'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_place_geo_cell'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='place',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='visit',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_triggers, drop_search_triggers),
+    ]
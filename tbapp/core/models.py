@@ -1,7 +1,18 @@
+import math
+from decimal import Decimal
+
 from django.db import models
+from django.db.models import Avg, Case, Count, ExpressionWrapper, F, \
+                             FloatField, OuterRef, Q, Subquery, Sum, Value, \
+                             When
+from django.db.models.functions import ASin, Cast, Coalesce, Cos, Least, \
+                                       Now, Power, Radians, Sin, Sqrt
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, \
                                         PermissionsMixin
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
+
+from core import geo, search
 
 
 class UserManager(BaseUserManager):
@@ -41,11 +52,137 @@ class User(AbstractBaseUser, PermissionsMixin):
 class Category(models.Model):
     """Category to be used for a place"""
     name = models.CharField(max_length=255, unique=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
 
 
+class SearchQuerySet(models.QuerySet):
+    """QuerySet with full-text search over the search_fields"""
+    # Text fields by search vector weight label
+    search_fields = {}
+
+    def search(self, text):
+        """Filter the rows holding every word of text"""
+        return search.filter_search(self, text, self.search_fields)
+
+    def ranked_search(self, text, limit):
+        """Return (rank, pk) of the best matching rows, best first"""
+        return search.ranked_search(self, text, self.search_fields, limit)
+
+
+class PlaceQuerySet(SearchQuerySet):
+    search_fields = {'name': 'A', 'notes': 'B'}
+
+    def add_scores(self, total, count):
+        """Add visit scores to the running totals and refresh avg_score
+
+        The sum, count and average are updated in a single UPDATE with
+        F() expressions, so concurrent visits never lose an update.
+        """
+        total = Decimal(str(total))
+        average = ExpressionWrapper(
+            (Cast(F('score_sum'), FloatField()) + total)
+            / (F('score_count') + count),
+            output_field=FloatField()
+        )
+        return self.update(
+            score_sum=F('score_sum') + total,
+            score_count=F('score_count') + count,
+            avg_score=Case(
+                When(score_count__gt=-count, then=average),
+                default=Value(None),
+            ),
+            updated_at=Now(),
+        )
+
+    def recompute_scores(self):
+        """Rebuild the score totals from the visits in one UPDATE"""
+        visits = Visit.objects.filter(
+            place=OuterRef('pk'), score__isnull=False
+        ).order_by().values('place')
+
+        return self.update(
+            score_sum=Coalesce(
+                Subquery(visits.annotate(total=Sum('score')).values('total')),
+                0
+            ),
+            score_count=Coalesce(
+                Subquery(visits.annotate(count=Count('id')).values('count')),
+                0
+            ),
+            avg_score=Subquery(
+                visits.annotate(average=Avg('score')).values('average')
+            ),
+            updated_at=Now(),
+        )
+
+    def in_cells(self, south, west, north, east):
+        """Filter on the grid cells covering a bounding box"""
+        query = Q()
+        for first, last in geo.cell_ranges(south, west, north, east):
+            query |= Q(geo_cell__range=(first, last))
+
+        return self.filter(query)
+
+    def in_bbox(self, south, west, north, east):
+        """Filter the places inside a bounding box"""
+        longitude = Q(longitude__gte=geo.to_decimal(west))
+        if west <= east:
+            longitude &= Q(longitude__lte=geo.to_decimal(east))
+        else:
+            longitude |= Q(longitude__lte=geo.to_decimal(east))
+
+        return self.in_cells(south, west, north, east).filter(
+            longitude,
+            latitude__gte=geo.to_decimal(south),
+            latitude__lte=geo.to_decimal(north),
+        )
+
+    def with_distance(self, latitude, longitude):
+        """Annotate the great-circle distance in km to a point"""
+        def radians(name):
+            return Radians(Cast(name, FloatField()))
+
+        def constant(value):
+            return Value(value, output_field=FloatField())
+
+        def half_sin(delta):
+            return Power(Sin(delta / constant(2)), 2)
+
+        lat1 = math.radians(latitude)
+        a = half_sin(radians('latitude') - constant(lat1)) + \
+            constant(math.cos(lat1)) * Cos(radians('latitude')) * \
+            half_sin(radians('longitude') - constant(math.radians(longitude)))
+
+        return self.annotate(distance=ExpressionWrapper(
+            constant(2 * geo.EARTH_RADIUS_KM) *
+            ASin(Sqrt(Least(a, constant(1.0)))),
+            output_field=FloatField()
+        ))
+
+    def within(self, latitude, longitude, radius_km):
+        """Filter the places within a radius in km, annotated with their
+        distance
+
+        Candidates are read from the grid cells around the circle, so
+        the distance is only computed for their rows.
+        """
+        box = geo.bounding_box(latitude, longitude, radius_km)
+
+        return self.in_cells(*box).with_distance(latitude, longitude) \
+            .filter(distance__lte=radius_km)
+
+    def nearest(self, latitude, longitude, radius_km, limit=None):
+        """Return (distance, pk) of at most limit places within a radius
+        in km, nearest first"""
+        return list(
+            self.within(latitude, longitude, radius_km)
+            .order_by('distance', 'pk').values_list('distance', 'pk')[:limit]
+        )
+
+
 class Place(models.Model):
     """Place object"""
     user = models.ForeignKey(
@@ -71,14 +208,54 @@ class Place(models.Model):
         blank=True,
         null=True
     )
+    score_sum = models.DecimalField(
+        max_digits=12,
+        decimal_places=1,
+        default=0
+    )
+    score_count = models.PositiveIntegerField(default=0)
+    geo_cell = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        editable=False
+    )
     notes = models.TextField(max_length=1000, blank=True)
     external_source = models.URLField(blank=True)
     categories = models.ManyToManyField('Category')
+    updated_at = models.DateTimeField(auto_now=True)
+    # Maintained by a database trigger on PostgreSQL
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = PlaceQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'id'], name='place_user_id_idx'),
+            models.Index(
+                fields=['user', 'geo_cell'], name='place_user_cell_idx'
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.set_geo_cell()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None \
+                and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'geo_cell'}
+        super().save(*args, **kwargs)
+
+    def set_geo_cell(self):
+        """Derive the grid cell from the coordinates"""
+        self.geo_cell = geo.cell_for(self.latitude, self.longitude)
 
     def __str__(self):
         return self.name
 
 
+class VisitQuerySet(SearchQuerySet):
+    search_fields = {'title': 'A', 'notes': 'B'}
+
+
 class Visit(models.Model):
     """Visit object"""
     user = models.ForeignKey(
@@ -99,6 +276,40 @@ class Visit(models.Model):
         null=True
     )
     notes = models.TextField(max_length=1000, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Maintained by a database trigger on PostgreSQL
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = VisitQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'id'], name='visit_user_id_idx'),
+            models.Index(
+                fields=['user', 'place'], name='visit_user_place_idx'
+            ),
+            models.Index(fields=['user', 'time'], name='visit_user_time_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_score()
+
+        return instance
+
+    def remember_score(self):
+        """Record the place and score last known to be in the database
+
+        Nothing is recorded while either is deferred, so that saving
+        reads them from the database instead.
+        """
+        if {'place_id', 'score'} & self.get_deferred_fields():
+            self.__dict__.pop('_stored_score', None)
+            return
+        self._stored_score = (
+            self.__dict__.get('place_id'), self.__dict__.get('score')
+        )
 
     def __str__(self):
         return self.title
@@ -116,6 +327,15 @@ class Plan(models.Model):
     budget = models.DecimalField(max_digits=10, decimal_places=2)
     done = models.BooleanField(default=False)
     visits = models.ManyToManyField('Visit')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'id'], name='plan_user_id_idx'),
+            models.Index(
+                fields=['user', 'begins'], name='plan_user_begins_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -0,0 +1,45 @@
+import io
+
+from django.conf import settings
+
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+
+from core.renderers import JSONRenderer, MessagePackRenderer, msgpack, \
+    orjson
+
+
+class JSONParser(parsers.JSONParser):
+    """JSON parser decoding UTF-8 bodies with orjson when it is installed
+
+    Bodies orjson rejects are parsed again by DRF's parser, so invalid
+    JSON gets the same error message.
+    """
+    renderer_class = JSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or \
+                encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+
+        content = stream.read()
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return super().parse(
+                io.BytesIO(content), media_type, parser_context
+            )
+
+
+class MessagePackParser(parsers.BaseParser):
+    """Parser of MessagePack bodies, requires msgpack"""
+    media_type = 'application/msgpack'
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except ValueError as exc:
+            raise ParseError('MessagePack parse error - %s' % str(exc))
@@ -0,0 +1,127 @@
+import logging
+import os
+import sys
+import time
+from collections import namedtuple
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+
+logger = logging.getLogger('tbapp.queries')
+
+Query = namedtuple('Query', 'sql params duration origin')
+
+Repeated = namedtuple('Repeated', 'sql count parameter_sets origin')
+
+# Frames of the database plumbing and execute wrappers are skipped when
+# looking for the code that ran a query
+_CORE_DIR = os.path.dirname(os.path.abspath(__file__))
+_PLUMBING = tuple(
+    os.path.join(_CORE_DIR, name)
+    for name in ('db' + os.sep, 'metrics.py', 'queries.py', 'testing.py')
+)
+
+
+def origin():
+    """Return 'file:line in function' of the project code running a query"""
+    root = os.path.join(settings.BASE_DIR, '')
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(root) and \
+                not filename.startswith(_PLUMBING) and \
+                'site-packages' not in filename:
+            return (
+                f'{os.path.relpath(filename, root)}:{frame.f_lineno} '
+                f'in {frame.f_code.co_name}'
+            )
+        frame = frame.f_back
+
+    return '<unknown>'
+
+
+class QueryRecorder:
+    """Execute wrapper keeping the SQL, timing and origin of each query"""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(Query(
+                sql, params, time.perf_counter() - started, origin()
+            ))
+
+    @contextmanager
+    def record(self):
+        """Record the queries run on every connection within the block"""
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self))
+            yield self
+
+    def slow(self, seconds):
+        """Return the queries that took at least seconds"""
+        return [query for query in self.queries if query.duration >= seconds]
+
+    def repeated(self, times):
+        """Return the SQL statements run at least times
+
+        Statements are compared without their parameters, so the query
+        run once per row of an N+1 pattern is reported as one statement.
+        """
+        groups = {}
+        for query in self.queries:
+            groups.setdefault(query.sql, []).append(query)
+
+        return [
+            Repeated(
+                sql, len(queries),
+                len({repr(query.params) for query in queries}),
+                queries[0].origin,
+            )
+            for sql, queries in groups.items() if len(queries) >= times
+        ]
+
+
+class QueryInspectorMiddleware:
+    """Log slow and repeated queries with the view and code running them
+
+    Opt-in through QUERY_INSPECTOR['ENABLED'], as finding the origin of
+    every query walks the stack.
+    """
+
+    def __init__(self, get_response):
+        options = getattr(settings, 'QUERY_INSPECTOR', {})
+        if not options.get('ENABLED'):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_seconds = options.get('SLOW_MS', 100) / 1000
+        self.repeated_times = options.get('REPEATED', 3)
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        with recorder.record():
+            response = self.get_response(request)
+
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else request.path
+        for query in recorder.slow(self.slow_seconds):
+            logger.warning(
+                'Slow query in %s took %.1f ms at %s: %s',
+                view, query.duration * 1000, query.origin, query.sql
+            )
+        for query in recorder.repeated(self.repeated_times):
+            logger.warning(
+                'Query in %s ran %d times with %d parameter sets at %s: %s',
+                view, query.count, query.parameter_sets, query.origin,
+                query.sql
+            )
+
+        return response
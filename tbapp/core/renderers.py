@@ -0,0 +1,67 @@
+from rest_framework import renderers
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    """JSON renderer encoding with orjson when it is installed
+
+    The output is the same bytes as DRF's renderer: values orjson does
+    not encode natively, such as Decimal, and dates and times, whose
+    format differs, are handed to DRF's encoder. Indented output, ASCII
+    only output and values orjson cannot encode, such as integers over
+    64 bits, go through the standard library.
+    """
+    encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or \
+                not self.compact or \
+                self.get_indent(accepted_media_type or '',
+                                renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            content = orjson.dumps(
+                data, default=self.encoder.default,
+                option=orjson.OPT_NON_STR_KEYS |
+                orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Escaped by DRF, as they end lines in JavaScript
+        return content.replace(
+            '\u2028'.encode(), b'\\u2028'
+        ).replace('\u2029'.encode(), b'\\u2029')
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    """Renderer of MessagePack, a binary equivalent of JSON
+
+    Values without a MessagePack type are encoded as in JSON, e.g. dates
+    as ISO 8601 strings, so clients decode the same data in both.
+    Requires msgpack.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        return msgpack.packb(
+            data, default=self.encoder.default, use_bin_type=True
+        )
@@ -0,0 +1,83 @@
+import heapq
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F, Q
+
+
+# Text search configuration of the PostgreSQL search vectors
+SEARCH_CONFIG = 'english'
+
+# Weights of the search vector labels, as used by ts_rank
+WEIGHTS = {'A': 1.0, 'B': 0.4, 'C': 0.2, 'D': 0.1}
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def tokenize(text):
+    """Return the lower-cased words of a text"""
+    return TOKEN_PATTERN.findall((text or '').casefold())
+
+
+def uses_search_vector(queryset):
+    """Return whether the queryset's database maintains search vectors"""
+    return connections[queryset.db].vendor == 'postgresql'
+
+
+def words_filter(tokens, fields):
+    """Return a Q matching the rows holding every token as a word of one
+    of the fields, for databases without full-text search"""
+    query = Q()
+    for token in tokens:
+        pattern = rf'\b{re.escape(token)}\b'
+        in_any_field = Q()
+        for name in fields:
+            in_any_field |= Q(**{f'{name}__iregex': pattern})
+        query &= in_any_field
+
+    return query
+
+
+def filter_search(queryset, text, fields):
+    """Filter the queryset's rows holding every word of text
+
+    Where the database has no full-text search the words are matched
+    by the database too, so only the rows of the queryset are read.
+    """
+    if uses_search_vector(queryset):
+        query = SearchQuery(text, config=SEARCH_CONFIG)
+        return queryset.filter(search_vector=query)
+
+    tokens = set(tokenize(text))
+    if not tokens:
+        return queryset.none()
+
+    return queryset.filter(words_filter(tokens, fields))
+
+
+def ranked_search(queryset, text, fields, limit):
+    """Return (rank, pk) of the best matching rows, best first"""
+    if uses_search_vector(queryset):
+        query = SearchQuery(text, config=SEARCH_CONFIG)
+        rows = queryset.filter(search_vector=query).annotate(
+            rank=SearchRank(F('search_vector'), query)
+        ).order_by('-rank', '-pk').values_list('rank', 'pk')
+        return list(rows[:limit])
+
+    # Each occurrence of a word counts its field's weight
+    tokens = set(tokenize(text))
+    names = list(fields)
+    rows = filter_search(queryset, text, fields).values_list('pk', *names)
+    ranking = []
+    for pk, *texts in rows.iterator():
+        rank = sum(
+            WEIGHTS[fields[name]]
+            for name, value in zip(names, texts)
+            for token in tokenize(value) if token in tokens
+        )
+        ranking.append((rank, pk))
+
+    return heapq.nsmallest(
+        limit, ranking, key=lambda row: (-row[0], -row[1])
+    )
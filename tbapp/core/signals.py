@@ -0,0 +1,81 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models.signals import m2m_changed, post_delete, \
+                                     post_save, pre_save
+from django.utils import timezone
+from django.dispatch import receiver
+
+from rest_framework.authtoken.models import Token
+
+from core.authentication import token_cache
+from core.models import Place, Plan, Visit
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """Stop accepting a token as soon as it is deleted"""
+    token_cache.invalidate(instance.key)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_tokens(sender, instance, **kwargs):
+    """Drop cached users on any change, e.g. deactivation or password"""
+    token_cache.invalidate_user(instance)
+
+
+@receiver(pre_save, sender=Visit)
+def load_stored_score(sender, instance, raw, **kwargs):
+    """Look up the stored score of visits not loaded from the database"""
+    if raw or instance._state.adding or hasattr(instance, '_stored_score'):
+        return
+    stored = sender.objects.filter(pk=instance.pk) \
+        .values_list('place_id', 'score').first()
+    instance._stored_score = stored or (None, None)
+
+
+@receiver(post_save, sender=Visit)
+def update_place_score(sender, instance, created, raw, **kwargs):
+    """Move the visit's score into its place's running totals"""
+    if raw:
+        return
+    old_place, old_score = (None, None) if created else \
+        getattr(instance, '_stored_score', (None, None))
+    new_place, new_score = instance.place_id, instance.score
+
+    if old_place == new_place and old_score is not None \
+            and new_score is not None:
+        if old_score != new_score:
+            Place.objects.filter(pk=new_place).add_scores(
+                Decimal(str(new_score)) - old_score, 0
+            )
+    else:
+        if old_score is not None:
+            Place.objects.filter(pk=old_place).add_scores(-old_score, -1)
+        if new_score is not None:
+            Place.objects.filter(pk=new_place).add_scores(new_score, 1)
+    instance.remember_score()
+
+
+@receiver(post_delete, sender=Visit)
+def remove_place_score(sender, instance, **kwargs):
+    """Take a deleted visit's score out of its place's running totals"""
+    place, score = getattr(
+        instance, '_stored_score', (instance.place_id, instance.score)
+    )
+    if score is not None:
+        Place.objects.filter(pk=place).add_scores(-score, -1)
+
+
+@receiver(m2m_changed, sender=Place.categories.through)
+@receiver(m2m_changed, sender=Plan.visits.through)
+def touch_related_change(sender, instance, action, reverse, model, pk_set,
+                         **kwargs):
+    """Bump updated_at of the objects whose M2M relations changed"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        type(instance).objects.filter(pk=instance.pk) \
+            .update(updated_at=timezone.now())
+    elif pk_set:
+        model.objects.filter(pk__in=pk_set).update(updated_at=timezone.now())
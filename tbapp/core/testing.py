@@ -0,0 +1,61 @@
+from contextlib import ExitStack, contextmanager
+
+from django.core.signals import request_finished, request_started
+from django.db import connections
+
+from core.queries import origin
+
+
+class QueryCountMixin:
+    """Test case helpers for asserting on database query counts"""
+
+    def assertNumQueriesConstant(self, num, func, grow, steps=3):
+        """Assert that func runs num queries however often grow is called
+
+        grow is called before each run of func so that every run sees a
+        larger data set; a query count that scales with the number of
+        rows (an N+1 pattern) fails the assertion.
+        """
+        for _ in range(steps):
+            grow()
+            with self.assertNumQueries(num):
+                func()
+
+    @contextmanager
+    def assertQueryBudget(self, budget):
+        """Fail when a request made within the block runs over budget
+        queries
+
+        The query over budget is not run and the failure lists the
+        queries of the request with the code that ran them.
+        """
+        queries = []
+        in_request = [False]
+
+        def started(**kwargs):
+            queries.clear()
+            in_request[0] = True
+
+        def finished(**kwargs):
+            in_request[0] = False
+
+        def check(execute, sql, params, many, context):
+            if in_request[0]:
+                queries.append(f'{origin()}: {sql}')
+                if len(queries) > budget:
+                    self.fail(
+                        f'Request ran more than {budget} queries:\n' +
+                        '\n'.join(queries)
+                    )
+            return execute(sql, params, many, context)
+
+        request_started.connect(started)
+        request_finished.connect(finished)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(check))
+                yield
+        finally:
+            request_started.disconnect(started)
+            request_finished.disconnect(finished)
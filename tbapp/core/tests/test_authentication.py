@@ -0,0 +1,200 @@
+import tempfile
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.authentication import TokenCache, token_cache
+from core.metrics import registry
+
+
+ME_URL = reverse('user:me')
+
+# A cache other processes could read, as the token cache requires
+SHARED_CACHES = dict(settings.CACHES, tokens={
+    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+    'LOCATION': tempfile.mkdtemp(prefix='tbapp-tokens-'),
+})
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class TokenCacheTests(TestCase):
+    """Test the token to user cache"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'test@anytestaddressmail.com',
+            'Test123'
+        )
+        self.cache = TokenCache(ttl=10, shared_alias='tokens')
+        self.cache.shared.clear()
+
+    def remember(self, cache, key):
+        cache.set(key, self.user, cache.version(key))
+
+    def test_entries_expire(self):
+        """Test local entries are not returned after their TTL"""
+        with patch('core.authentication.time.monotonic', return_value=0):
+            self.remember(self.cache, 'key')
+        self.cache.shared.delete(self.cache.key_prefix + 'key')
+        with patch('core.authentication.time.monotonic', return_value=5):
+            self.assertEqual(self.cache.get('key'), self.user)
+        with patch('core.authentication.time.monotonic', return_value=11):
+            self.assertIsNone(self.cache.get('key'))
+
+    def test_size_bounded(self):
+        """Test the least recently used entry is evicted"""
+        cache = TokenCache(max_size=2, shared_alias='tokens')
+        for key in 'abc':
+            self.remember(cache, key)
+            cache.get('a')
+
+        self.assertEqual(cache.stats()['size'], 2)
+        self.assertNotIn('b', cache._entries)
+
+    def test_new_instance_per_hit(self):
+        """Test hits do not share a user instance"""
+        self.remember(self.cache, 'key')
+
+        first, second = self.cache.get('key'), self.cache.get('key')
+
+        self.assertEqual(first, self.user)
+        self.assertIsNot(first, second)
+        self.assertEqual(second.email, self.user.email)
+
+    def test_shared_cache(self):
+        """Test entries and revocations reach other processes"""
+        writer = TokenCache(shared_alias='tokens')
+        reader = TokenCache(shared_alias='tokens')
+        self.remember(writer, 'key')
+
+        self.assertEqual(reader.get('key'), self.user)
+        writer.invalidate('key')
+        self.assertIsNone(reader.get('key'))
+
+    def test_revoked_during_lookup(self):
+        """Test a revocation between the lookup and set is not lost"""
+        version = self.cache.version('key')
+        self.cache.invalidate('key')
+        self.cache.set('key', self.user, version)
+
+        self.assertIsNone(self.cache.get('key'))
+
+    def test_local_cache_without_shared_cache(self):
+        """Test entries are cached in process without a shared cache"""
+        cache = TokenCache(ttl=10, shared_alias='default')
+        with patch('core.authentication.time.monotonic', return_value=0):
+            cache.set('key', self.user, cache.version('key'))
+            self.assertEqual(cache.get('key'), self.user)
+        cache.invalidate('key')
+
+        self.assertIsNone(cache.get('key'))
+
+    def test_password_not_cached(self):
+        """Test the password hash is not kept in the shared cache"""
+        self.remember(self.cache, 'key')
+
+        entry = self.cache.shared.get(self.cache.key_prefix + 'key')
+
+        names = [name for name, _ in entry[-1]]
+        self.assertIn('email', names)
+        self.assertNotIn('password', names)
+        self.assertNotIn(self.user.password, [v for _, v in entry[-1]])
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class CachedTokenAuthenticationTests(TestCase):
+    """Test authenticating API requests with cached tokens"""
+
+    def setUp(self):
+        patcher = patch.object(token_cache, 'shared_alias', 'tokens')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        token_cache.clear()
+        token_cache.shared.clear()
+        self.user = get_user_model().objects.create_user(
+            'test@anytestaddressmail.com',
+            'Test123'
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_lookup_cached(self):
+        """Test the second request does not query the token"""
+        self.client.get(ME_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['email'], self.user.email)
+        self.assertEqual(token_cache.stats()['hit_ratio'], 0.5)
+
+    def test_lookup_cached_without_shared_cache(self):
+        """Test tokens are cached in process by default"""
+        with patch.object(token_cache, 'shared_alias', None):
+            self.client.get(ME_URL)
+
+            with self.assertNumQueries(0):
+                res = self.client.get(ME_URL)
+            self.user.is_active = False
+            self.user.save()
+            rejected = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(rejected.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_token_rejected(self):
+        """Test a deleted token stops authenticating"""
+        self.client.get(ME_URL)
+        self.token.delete()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_rejected(self):
+        """Test a deactivated user stops authenticating"""
+        self.client.get(ME_URL)
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_change_invalidates(self):
+        """Test changing the password drops the cached user"""
+        self.client.get(ME_URL)
+        self.client.patch(ME_URL, {'password': 'NewPass123'})
+
+        self.assertIsNone(token_cache.get(self.token.key))
+
+    def test_revoked_in_other_process(self):
+        """Test a user changed by another process stops authenticating"""
+        self.client.get(ME_URL)
+        other = TokenCache(shared_alias='tokens')
+        with patch('core.signals.token_cache', other):
+            self.user.is_active = False
+            self.user.save()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_stats_exported(self):
+        """Test the hit and miss counts are in the metrics output"""
+        self.client.get(ME_URL)
+        self.client.get(ME_URL)
+
+        output = registry.render()
+
+        self.assertIn('tbapp_token_cache_hits_total 1.0', output)
+        self.assertIn('tbapp_token_cache_misses_total 1.0', output)
@@ -1,9 +1,18 @@
+import random
+from io import StringIO
 from unittest.mock import patch
 
+from django.contrib.auth import get_user_model
 from django.core.management import call_command
 from django.db.utils import OperationalError
 from django.test import TestCase
 
+from core.management.commands.benchmark_geo import measure
+from core.management.commands.explain_queries import full_scans
+from core.models import Place, Visit, Plan
+
+from travel.seeding import seed
+
 
 class CommandTests(TestCase):
 
@@ -21,3 +30,63 @@ class CommandTests(TestCase):
             gi.side_effect = [OperationalError] * 5 + [True]
             call_command('wait_for_db')
             self.assertEqual(gi.call_count, 6)
+
+    def test_recompute_scores(self):
+        """Test the recompute_scores command rebuilds place averages"""
+        user = get_user_model().objects.create_user(
+            'test@anytestaddressmail.com',
+            'Test123'
+        )
+        place = Place.objects.create(user=user, name='Louvre')
+        Visit.objects.create(user=user, place=place, score=4)
+        Place.objects.update(avg_score=None)
+
+        call_command('recompute_scores', stdout=StringIO())
+
+        place.refresh_from_db()
+        self.assertEqual(place.avg_score, 4)
+
+    def test_explain_queries(self):
+        """Test explain_queries reports indexed access paths"""
+        user = get_user_model().objects.create_user(
+            'test@anytestaddressmail.com',
+            'Test123'
+        )
+        place = Place.objects.create(user=user, name='Louvre')
+        visit = Visit.objects.create(user=user, place=place)
+        Plan.objects.create(
+            user=user, name='Plan', begins='2020-01-01', ends='2020-01-05',
+            budget=300
+        ).visits.add(visit)
+        out = StringIO()
+
+        call_command('explain_queries', '--repeat', '1', stdout=out)
+
+        lines = out.getvalue().splitlines()
+        by_place = [line for line in lines if 'visits by place' in line]
+        self.assertIn('indexed', by_place[0])
+
+    def test_full_scans(self):
+        """Test full table scans are found in query plans"""
+        self.assertEqual(
+            full_scans('Seq Scan on core_visit  (cost=0.00..1.01 rows=1)'),
+            ['core_visit']
+        )
+        self.assertEqual(full_scans('2 0 0 SCAN core_place'), ['core_place'])
+        self.assertEqual(
+            full_scans('SEARCH core_visit USING INDEX visit_user_place_idx'),
+            []
+        )
+        self.assertEqual(
+            full_scans('SCAN core_category USING COVERING INDEX x'), []
+        )
+
+    def test_benchmark_geo(self):
+        """Test the indexed radius query finds the places a scan finds"""
+        list(seed(3, 200, 0, 0, seed=0))
+
+        result = measure(5, 2000, random.Random(0))
+
+        self.assertEqual(result['mismatches'], [])
+        self.assertGreaterEqual(result['matches'], 5)
+        self.assertGreater(result['grid_seconds'], 0)
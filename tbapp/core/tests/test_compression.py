@@ -0,0 +1,100 @@
+import gzip
+import json
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, SimpleTestCase, TestCase, \
+    override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from core import compression
+from core.compression import brotli, negotiate
+from core.models import Place
+
+from travel.cache import response_cache
+
+
+PLACES_URL = reverse('travel:place-list')
+EXPORT_URL = reverse('travel:export')
+
+
+def accepting(value):
+    return RequestFactory().get('/', HTTP_ACCEPT_ENCODING=value)
+
+
+@mock.patch.object(compression, 'brotli', None)
+class NegotiateTests(SimpleTestCase):
+    """Test the content coding picked for a request"""
+
+    def test_gzip(self):
+        """Test gzip is picked when accepted"""
+        self.assertEqual(negotiate(accepting('deflate, gzip')), 'gzip')
+        self.assertEqual(negotiate(accepting('*')), 'gzip')
+
+    def test_refused(self):
+        """Test no coding is picked when none is accepted"""
+        self.assertIsNone(negotiate(accepting('')))
+        self.assertIsNone(negotiate(accepting('gzip;q=0, deflate')))
+        self.assertIsNone(negotiate(accepting('*, gzip;q=0')))
+
+    @skipUnless(brotli, 'brotli is not installed')
+    def test_brotli_preferred(self):
+        """Test brotli is picked over gzip when installed"""
+        with mock.patch.object(compression, 'brotli', brotli):
+            self.assertEqual(negotiate(accepting('gzip, br')), 'br')
+
+
+@mock.patch.object(compression, 'brotli', None)
+@override_settings(COMPRESSION={'MIN_SIZE': 200})
+class CompressionApiTests(TestCase):
+    """Test responses are compressed over the size threshold"""
+
+    def setUp(self):
+        response_cache.clear()
+        self.user = get_user_model().objects.create_user(
+            'test@anytestadressmail.com',
+            'Test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_large_list_compressed(self):
+        """Test a list over the threshold is sent gzipped"""
+        for number in range(20):
+            Place.objects.create(user=self.user, name=f'Place {number}')
+
+        res = self.client.get(PLACES_URL, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(res['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', res['Vary'])
+        data = json.loads(gzip.decompress(res.content))
+        self.assertEqual(len(data['results']), 20)
+
+    def test_small_response_left(self):
+        """Test a response under the threshold is sent as it is"""
+        res = self.client.get(PLACES_URL, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertFalse(res.has_header('Content-Encoding'))
+        self.assertEqual(res.json()['results'], [])
+
+    def test_not_accepted(self):
+        """Test clients not accepting gzip get the plain body"""
+        for number in range(20):
+            Place.objects.create(user=self.user, name=f'Place {number}')
+
+        res = self.client.get(PLACES_URL)
+
+        self.assertFalse(res.has_header('Content-Encoding'))
+        self.assertEqual(len(res.json()['results']), 20)
+
+    def test_stream_compressed(self):
+        """Test streamed exports are compressed chunk by chunk"""
+        Place.objects.create(user=self.user, name='Louvre')
+
+        res = self.client.get(EXPORT_URL, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(res['Content-Encoding'], 'gzip')
+        content = gzip.decompress(b''.join(res.streaming_content))
+        self.assertIn(b'Louvre', content)
@@ -0,0 +1,172 @@
+import os
+import tempfile
+import threading
+import time
+from io import StringIO
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db.backends.sqlite3 import base
+from django.test import SimpleTestCase
+
+from core.db import pool as pools
+from core.db.mixins import HealthCheckMixin, PoolMixin
+from core.db.pool import ConnectionPool, PoolTimeout, write_stats
+
+
+class FakeConnection:
+
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class DatabaseWrapper(HealthCheckMixin, PoolMixin, base.DatabaseWrapper):
+    """SQLite wrapper with the mixins of the PostgreSQL backend"""
+
+
+def make_wrapper(name, **params):
+    """Return a database wrapper of an SQLite file"""
+    settings_dict = {
+        'ENGINE': 'django.db.backends.sqlite3', 'NAME': name,
+        'USER': '', 'PASSWORD': '', 'HOST': '', 'PORT': '',
+        'ATOMIC_REQUESTS': False, 'AUTOCOMMIT': True, 'CONN_MAX_AGE': 0,
+        'OPTIONS': {}, 'TIME_ZONE': None, 'TEST': {},
+    }
+    settings_dict.update(params)
+
+    return DatabaseWrapper(settings_dict, alias='pool-test')
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    """Test the in-process connection pool"""
+
+    def test_connection_reused(self):
+        """Test a returned connection is handed out again"""
+        pool = ConnectionPool(max_size=2)
+
+        raw = pool.checkout(FakeConnection)
+        pool.checkin(raw)
+
+        self.assertIs(pool.checkout(FakeConnection), raw)
+        self.assertEqual(pool.stats()['created'], 1)
+        self.assertEqual(pool.stats()['checkouts'], 2)
+
+    def test_full_pool_times_out(self):
+        """Test checking out of a full pool fails after the timeout"""
+        pool = ConnectionPool(max_size=1, timeout=0.05)
+        pool.checkout(FakeConnection)
+
+        with self.assertRaises(PoolTimeout):
+            pool.checkout(FakeConnection)
+        self.assertEqual(pool.stats()['timeouts'], 1)
+        self.assertEqual(pool.stats()['saturation'], 1.0)
+
+    def test_waiter_gets_returned_connection(self):
+        """Test a waiting thread gets the next returned connection"""
+        pool = ConnectionPool(max_size=1, timeout=5)
+        raw = pool.checkout(FakeConnection)
+        got = []
+        waiter = threading.Thread(
+            target=lambda: got.append(pool.checkout(FakeConnection))
+        )
+        waiter.start()
+        time.sleep(0.05)
+
+        pool.checkin(raw)
+        waiter.join()
+
+        self.assertIs(got[0], raw)
+        self.assertEqual(pool.stats()['waits'], 1)
+        self.assertGreater(pool.stats()['max_wait_ms'], 0)
+
+    def test_stale_connections_replaced(self):
+        """Test expired and broken connections are closed and replaced"""
+        pool = ConnectionPool(max_idle=0, check_after=0)
+        expired = pool.checkout(FakeConnection)
+        pool.checkin(expired)
+        time.sleep(0.01)
+        self.assertIsNot(pool.checkout(FakeConnection), expired)
+        self.assertTrue(expired.closed)
+
+        pool = ConnectionPool(check_after=0, check=lambda raw: False)
+        broken = pool.checkout(FakeConnection)
+        pool.checkin(broken)
+        self.assertIsNot(pool.checkout(FakeConnection), broken)
+        self.assertTrue(broken.closed)
+
+    def test_discarded_connection_closed(self):
+        """Test a discarded connection frees its slot"""
+        pool = ConnectionPool(max_size=1, timeout=0.05)
+        raw = pool.checkout(FakeConnection)
+
+        pool.checkin(raw, discard=True)
+
+        self.assertTrue(raw.closed)
+        self.assertIsNot(pool.checkout(FakeConnection), raw)
+
+
+class PooledBackendTests(SimpleTestCase):
+    """Test database wrappers borrowing from the pool"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.name = os.path.join(self.tmp.name, 'db.sqlite3')
+        self.addCleanup(pools._pools.clear)
+
+    def test_closed_connection_returns_to_pool(self):
+        """Test closing a wrapper's connection gives it to the next one"""
+        first = make_wrapper(self.name, POOL={'MAX_SIZE': 2})
+        first.ensure_connection()
+        raw = first.connection
+        first.close()
+
+        second = make_wrapper(self.name, POOL={'MAX_SIZE': 2})
+        second.ensure_connection()
+
+        self.assertIs(second.connection, raw)
+        self.assertEqual(second.pool.stats()['created'], 1)
+        second.close()
+
+    def test_connection_in_transaction_discarded(self):
+        """Test a connection closed inside a transaction is not reused"""
+        wrapper = make_wrapper(self.name, POOL={'MAX_SIZE': 2})
+        wrapper.ensure_connection()
+        wrapper.in_atomic_block = True
+
+        wrapper.close()
+
+        self.assertEqual(wrapper.pool.stats()['connections'], 0)
+
+    def test_health_check_replaces_dead_connection(self):
+        """Test a kept connection failing its check is reopened"""
+        wrapper = make_wrapper(
+            self.name, CONN_MAX_AGE=None, CONN_HEALTH_CHECKS=True
+        )
+        wrapper.ensure_connection()
+        raw = wrapper.connection
+        wrapper.close_if_unusable_or_obsolete()
+
+        with patch.object(wrapper, 'is_usable', return_value=False):
+            wrapper.ensure_connection()
+
+        self.assertIsNot(wrapper.connection, raw)
+        wrapper.close()
+
+    def test_pool_stats_command(self):
+        """Test pool_stats prints the published stats"""
+        pool = ConnectionPool(alias='default', max_size=1)
+        pool.checkout(FakeConnection)
+        write_stats(self.tmp.name, pool.stats())
+        out = StringIO()
+
+        with patch.dict(settings.DATABASES['default'],
+                        {'POOL': {'STATS_DIR': self.tmp.name}}):
+            call_command('pool_stats', stdout=out)
+
+        self.assertIn(str(os.getpid()), out.getvalue())
+        self.assertIn('saturated', out.getvalue())
@@ -0,0 +1,44 @@
+from django.test import SimpleTestCase
+
+from core import geo
+
+
+class GeoTests(SimpleTestCase):
+    """Test the grid and distance helpers"""
+
+    def test_cells_of_a_row_are_consecutive(self):
+        """Test neighbouring cells east-west have consecutive numbers"""
+        cell = geo.cell_for(48.85, 2.35)
+        east = geo.cell_for(48.85, 2.35 + geo.CELL_DEGREES)
+
+        self.assertEqual(east, cell + 1)
+        self.assertIsNone(geo.cell_for(None, 2.35))
+
+    def test_cell_ranges_split_at_antimeridian(self):
+        """Test a box crossing longitude 180 gets two ranges per row"""
+        ranges = geo.cell_ranges(10, 179.95, 10.05, -179.95)
+
+        self.assertEqual(len(ranges), 2)
+        first, last = ranges[0]
+        self.assertTrue(first <= geo.cell_for(10, 179.99) <= last)
+        self.assertEqual(ranges[1][0], geo.cell_for(10, -180))
+
+    def test_cell_ranges_coarse_for_tall_boxes(self):
+        """Test a box spanning many rows is covered by one range"""
+        ranges = geo.cell_ranges(-60, 0, 60, 10)
+
+        self.assertEqual(len(ranges), 1)
+        self.assertLessEqual(ranges[0][0], geo.cell_for(-60, 0))
+        self.assertGreaterEqual(ranges[0][1], geo.cell_for(60, 10))
+
+    def test_bounding_box_contains_circle(self):
+        """Test the box around a circle holds points on its edge"""
+        south, west, north, east = geo.bounding_box(60, 10, 50)
+
+        for bearing_point in ((60.449, 10), (59.551, 10), (60, 10.898),
+                              (60, 9.102)):
+            self.assertLessEqual(
+                geo.haversine(60, 10, *bearing_point), 50.1
+            )
+            self.assertTrue(south <= bearing_point[0] <= north)
+            self.assertTrue(west <= bearing_point[1] <= east)
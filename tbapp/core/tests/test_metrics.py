@@ -0,0 +1,92 @@
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from core.metrics import Histogram, registry
+from core.models import Place
+
+
+METRICS_URL = reverse('metrics')
+PLACES_URL = reverse('travel:place-list')
+
+
+class HistogramTests(SimpleTestCase):
+    """Test the quantile estimates of histograms"""
+
+    def test_quantiles(self):
+        """Test quantiles are estimated within a few percent"""
+        histogram = Histogram(1e-3, 1e4)
+        for value in range(1, 1001):
+            histogram.observe(value)
+
+        self.assertAlmostEqual(histogram.quantile(0.5), 500, delta=25)
+        self.assertAlmostEqual(histogram.quantile(0.95), 950, delta=48)
+        self.assertAlmostEqual(histogram.quantile(0.99), 990, delta=50)
+        self.assertEqual(histogram.count, 1000)
+
+    def test_quantile_clamped_to_observations(self):
+        """Test a single observation is reported exactly"""
+        histogram = Histogram(1, 100)
+        histogram.observe(0)
+
+        self.assertEqual(histogram.quantile(0.99), 0)
+
+
+class PerformanceMiddlewareTests(TestCase):
+    """Test requests are measured per view and exposed"""
+
+    def setUp(self):
+        registry.clear()
+        self.user = get_user_model().objects.create_user(
+            'test@anytestadressmail.com',
+            'Test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_request_recorded_under_view_name(self):
+        """Test a list request records queries, timings and size"""
+        Place.objects.create(user=self.user, name='Louvre')
+
+        res = self.client.get(PLACES_URL)
+
+        queries = registry.summary('travel:place-list', 'db_queries')
+        size = registry.summary('travel:place-list', 'response_size_bytes')
+        serializer = registry.summary(
+            'travel:place-list', 'serializer_duration_seconds'
+        )
+        self.assertEqual(queries.count, 1)
+        self.assertGreater(queries.max, 0)
+        self.assertEqual(size.max, len(res.content))
+        self.assertGreater(serializer.max, 0)
+
+    def test_metrics_exposed(self):
+        """Test the scrape endpoint returns Prometheus text"""
+        self.client.get(PLACES_URL)
+
+        res = self.client.get(METRICS_URL)
+
+        body = res.content.decode()
+        self.assertEqual(res['Content-Type'], 'text/plain; version=0.0.4')
+        self.assertIn(
+            'tbapp_requests_total{view="travel:place-list",status="2xx"} 1',
+            body
+        )
+        self.assertIn(
+            'tbapp_request_duration_seconds{view="travel:place-list",'
+            'quantile="0.99"}', body
+        )
+        self.assertIn('# TYPE tbapp_db_queries summary', body)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_metrics_token(self):
+        """Test the scrape endpoint requires the configured token"""
+        denied = self.client.get(METRICS_URL)
+        allowed = self.client.get(
+            METRICS_URL, HTTP_AUTHORIZATION='Bearer secret'
+        )
+
+        self.assertEqual(denied.status_code, 403)
+        self.assertEqual(allowed.status_code, 200)
@@ -1,6 +1,10 @@
+from decimal import Decimal
+
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 
+from core.models import Place, Visit
+
 
 class ModelTests(TestCase):
 
@@ -37,3 +41,84 @@ class ModelTests(TestCase):
 
         self.assertTrue(user.is_superuser)
         self.assertTrue(user.is_staff)
+
+
+class PlaceScoreTests(TestCase):
+    """Test the place score totals maintained from visits"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'test@anytestaddressmail.com',
+            'Test123'
+        )
+        self.place = Place.objects.create(user=self.user, name='Louvre')
+
+    def visit(self, score, place=None):
+        return Visit.objects.create(
+            user=self.user, place=place or self.place, score=score
+        )
+
+    def assertScore(self, place, total, count, average):
+        place.refresh_from_db()
+        self.assertEqual(place.score_sum, Decimal(total))
+        self.assertEqual(place.score_count, count)
+        self.assertEqual(
+            place.avg_score, None if average is None else Decimal(average)
+        )
+
+    def test_score_added_on_create(self):
+        """Test creating scored visits updates the average"""
+        self.visit(4.5)
+        self.visit(3)
+        Visit.objects.create(user=self.user, place=self.place)
+
+        self.assertScore(self.place, '7.5', 2, '3.8')
+
+    def test_score_changed_on_update(self):
+        """Test updating a visit score updates the average"""
+        visit = self.visit(4)
+        self.visit(2)
+
+        visit = Visit.objects.get(pk=visit.pk)
+        visit.score = 5
+        visit.save()
+
+        self.assertScore(self.place, '7', 2, '3.5')
+
+    def test_score_kept_on_deferred_save(self):
+        """Test saving a visit loaded without its score keeps the totals"""
+        visit = self.visit(4)
+
+        visit = Visit.objects.only('title').get(pk=visit.pk)
+        visit.title = 'Renamed'
+        visit.save()
+
+        self.assertScore(self.place, '4', 1, '4.0')
+
+    def test_score_moved_between_places(self):
+        """Test moving a visit moves its score to the new place"""
+        other = Place.objects.create(user=self.user, name='Prado')
+        visit = self.visit(4)
+
+        visit.place = other
+        visit.save()
+
+        self.assertScore(self.place, '0', 0, None)
+        self.assertScore(other, '4', 1, '4.0')
+
+    def test_score_removed_on_delete(self):
+        """Test deleting a visit takes its score out"""
+        self.visit(4)
+        self.visit(2).delete()
+
+        self.assertScore(self.place, '4', 1, '4.0')
+
+    def test_recompute_scores(self):
+        """Test recomputing rebuilds drifted totals"""
+        self.visit(4)
+        self.visit(3)
+        Place.objects.update(score_sum=0, score_count=0, avg_score=None)
+
+        Place.objects.recompute_scores()
+
+        self.assertScore(self.place, '7', 2, '3.5')
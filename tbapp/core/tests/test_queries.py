@@ -0,0 +1,104 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from core.models import Place
+from core.queries import QueryRecorder
+from core.testing import QueryCountMixin
+
+
+PLACES_URL = reverse('travel:place-list')
+PLACES_BULK_URL = reverse('travel:place-bulk')
+
+INSPECT = {'ENABLED': True, 'SLOW_MS': 10000, 'REPEATED': 3}
+
+
+class QueryRecorderTests(TestCase):
+    """Test slow and repeated queries are found"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'test@anytestadressmail.com',
+            'Test123'
+        )
+
+    def test_repeated_statement_found(self):
+        """Test a query run per row is reported once with its origin"""
+        for name in ('Louvre', 'Orsay', 'Rodin'):
+            Place.objects.create(user=self.user, name=name)
+        recorder = QueryRecorder()
+
+        with recorder.record():
+            for place in Place.objects.all():
+                list(place.categories.all())
+
+        repeated, = recorder.repeated(3)
+        self.assertIn('core_category', repeated.sql)
+        self.assertEqual(repeated.count, 3)
+        self.assertEqual(repeated.parameter_sets, 3)
+        self.assertTrue(
+            repeated.origin.startswith('core/tests/test_queries.py:')
+        )
+        self.assertEqual(len(recorder.slow(0)), 4)
+        self.assertEqual(recorder.slow(10000), [])
+
+
+class QueryInspectorMiddlewareTests(QueryCountMixin, TestCase):
+    """Test the opt-in logging of slow and repeated queries"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'test@anytestadressmail.com',
+            'Test123'
+        )
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    def test_disabled_by_default(self):
+        """Test nothing is logged unless the inspector is enabled"""
+        with self.assertRaises(AssertionError):
+            with self.assertLogs('tbapp.queries'):
+                self.client_for(self.user).get(PLACES_URL)
+
+    @override_settings(QUERY_INSPECTOR=INSPECT)
+    def test_repeated_queries_logged(self):
+        """Test statements run per item of a request are logged"""
+        payload = [
+            {'name': name, 'categories': []}
+            for name in ('Louvre', 'Orsay', 'Rodin')
+        ]
+
+        with self.assertLogs('tbapp.queries', 'WARNING') as logs:
+            with self.assertQueryBudget(10):
+                self.client_for(self.user).post(
+                    PLACES_BULK_URL, payload, format='json'
+                )
+
+        self.assertIn(
+            'Query in travel:place-bulk ran 3 times with 3 parameter sets '
+            'at core/models.py:', logs.output[0]
+        )
+
+    @override_settings(QUERY_INSPECTOR=dict(INSPECT, SLOW_MS=0))
+    def test_slow_queries_logged(self):
+        """Test queries over the threshold are logged with their view"""
+        with self.assertLogs('tbapp.queries', 'WARNING') as logs:
+            self.client_for(self.user).get(PLACES_URL)
+
+        self.assertIn('Slow query in travel:place-list', logs.output[0])
+
+    def test_query_budget(self):
+        """Test a request over its query budget fails the test"""
+        client = self.client_for(self.user)
+        with self.assertQueryBudget(3):
+            client.get(PLACES_URL)
+
+        with self.assertRaisesMessage(AssertionError, 'more than 0 queries'):
+            with self.assertQueryBudget(0):
+                # Another page size than the cached list's
+                client.get(PLACES_URL, {'page_size': 1})
@@ -0,0 +1,149 @@
+import datetime
+import io
+from decimal import Decimal
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import parsers, renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.test import APIClient
+
+from core import renderers as core_renderers
+from core.models import Category, Place
+from core.parsers import JSONParser, MessagePackParser
+from core.renderers import JSONRenderer, MessagePackRenderer, msgpack
+
+
+PLACES_URL = reverse('travel:place-list')
+
+DATA = {
+    'latitude': Decimal('48.860600'),
+    'score': Decimal('4.5'),
+    'begins': datetime.date(2021, 1, 1),
+    'updated_at': datetime.datetime(
+        2021, 1, 1, 12, 30, 15, 123456, tzinfo=timezone.utc
+    ),
+    'time': datetime.time(9, 30),
+    'name': 'Café Paris',
+    1: [None, True, 1.5, 'x'],
+}
+
+
+class JSONRendererTests(SimpleTestCase):
+    """Test the JSON renderer matches DRF's output"""
+
+    def test_same_bytes(self):
+        """Test decimals, dates, unicode and int keys render as DRF"""
+        self.assertEqual(
+            JSONRenderer().render(DATA), renderers.JSONRenderer().render(DATA)
+        )
+
+    def test_large_integer(self):
+        """Test integers orjson cannot encode fall back to the stdlib"""
+        data = {'id': 2 ** 70}
+
+        self.assertEqual(JSONRenderer().render(data), b'{"id":%d}' % 2 ** 70)
+
+    def test_indent(self):
+        """Test indented output is left to DRF"""
+        media_type = 'application/json; indent=2'
+
+        self.assertEqual(
+            JSONRenderer().render(DATA, media_type),
+            renderers.JSONRenderer().render(DATA, media_type),
+        )
+
+    def test_without_orjson(self):
+        """Test the stdlib is used when orjson is not installed"""
+        with mock.patch.object(core_renderers, 'orjson', None):
+            content = JSONRenderer().render(DATA)
+
+        self.assertEqual(content, renderers.JSONRenderer().render(DATA))
+
+
+class JSONParserTests(SimpleTestCase):
+    """Test the JSON parser matches DRF's"""
+
+    def test_same_data(self):
+        """Test a body parses to the same data as with DRF"""
+        content = renderers.JSONRenderer().render(DATA)
+
+        self.assertEqual(
+            JSONParser().parse(io.BytesIO(content)),
+            parsers.JSONParser().parse(io.BytesIO(content)),
+        )
+
+    def test_invalid_json(self):
+        """Test invalid JSON gets DRF's error message"""
+        with self.assertRaises(ParseError) as expected:
+            parsers.JSONParser().parse(io.BytesIO(b'{"name": '))
+        with self.assertRaises(ParseError) as error:
+            JSONParser().parse(io.BytesIO(b'{"name": '))
+
+        self.assertEqual(str(error.exception), str(expected.exception))
+
+    def test_other_encoding(self):
+        """Test bodies in another charset are decoded by DRF"""
+        content = '{"name": "Café"}'.encode('latin-1')
+
+        data = JSONParser().parse(
+            io.BytesIO(content), parser_context={'encoding': 'latin-1'}
+        )
+
+        self.assertEqual(data, {'name': 'Café'})
+
+
+@skipUnless(msgpack, 'msgpack is not installed')
+class MessagePackTests(SimpleTestCase):
+    """Test the MessagePack renderer and parser"""
+
+    def test_round_trip(self):
+        """Test data decodes to what the JSON renderer encodes"""
+        data = dict(DATA, items=DATA[1])
+        del data[1]
+        content = MessagePackRenderer().render(data)
+
+        self.assertEqual(
+            MessagePackParser().parse(io.BytesIO(content)),
+            JSONParser().parse(io.BytesIO(JSONRenderer().render(data))),
+        )
+
+    def test_invalid_body(self):
+        """Test truncated bodies are parse errors"""
+        content = MessagePackRenderer().render({'name': 'Louvre'})
+
+        with self.assertRaises(ParseError):
+            MessagePackParser().parse(io.BytesIO(content[:-2]))
+
+
+class JSONApiTests(TestCase):
+    """Test the API reads and writes JSON through the renderer and parser"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'test@anytestadressmail.com',
+            'Test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_round_trip(self):
+        """Test a created place is read back with its decimals"""
+        category = Category.objects.create(name='Cafe')
+        payload = {
+            'name': 'Café de Flore', 'categories': [category.id],
+            'latitude': '48.854000', 'longitude': '2.332600',
+        }
+        res = self.client.post(PLACES_URL, payload, format='json')
+        self.assertEqual(res.status_code, 201)
+
+        res = self.client.get(PLACES_URL)
+
+        item = res.json()['results'][0]
+        self.assertEqual(item['name'], 'Café de Flore')
+        self.assertEqual(Decimal(item['latitude']), Decimal('48.854'))
+        self.assertEqual(Place.objects.get().latitude, Decimal('48.854000'))
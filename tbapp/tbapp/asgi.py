@@ -2,6 +2,7 @@
 ASGI config for tbapp project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Reads of the travel resources are served concurrently off a thread pool.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/
@@ -9,8 +10,9 @@ https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
-
+# Set before the import below, which may read settings
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tbapp.settings')
 
+from travel.asgi import get_asgi_application  # noqa: E402
+
 application = get_asgi_application()
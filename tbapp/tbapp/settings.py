@@ -10,7 +10,9 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.0/ref/settings/
 """
 
+import importlib.util
 import os
+import tempfile
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -45,6 +47,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.metrics.PerformanceMiddleware',
+    'core.queries.QueryInspectorMiddleware',
+    'core.compression.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -74,20 +79,90 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'tbapp.wsgi.application'
 
+# Bearer token required to scrape /metrics, empty to allow anyone
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+# Log queries slower than SLOW_MS and statements run REPEATED times or
+# more within one request, with the view and code running them
+QUERY_INSPECTOR = {
+    'ENABLED': os.environ.get('QUERY_INSPECTOR', '0') == '1',
+    'SLOW_MS': float(os.environ.get('QUERY_INSPECTOR_SLOW_MS', 100)),
+    'REPEATED': int(os.environ.get('QUERY_INSPECTOR_REPEATED', 3)),
+}
+
+# Responses of MIN_SIZE bytes or more are compressed with brotli, when
+# installed, or gzip for clients accepting it
+COMPRESSION = {
+    'MIN_SIZE': int(os.environ.get('COMPRESSION_MIN_SIZE', 1024)),
+    'GZIP_LEVEL': int(os.environ.get('COMPRESSION_GZIP_LEVEL', 6)),
+    'BROTLI_QUALITY': int(os.environ.get('COMPRESSION_BROTLI_QUALITY', 5)),
+}
+
+# Threads serving travel API reads under ASGI
+ASYNC_READ_THREADS = int(os.environ.get('ASYNC_READ_THREADS', 8))
+
 
 # Database
 # https://docs.djangoproject.com/en/3.0/ref/settings/#databases
 
+# Connections borrowed from an in-process pool, 0 to disable the pool
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 0))
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'core.db.backends.postgresql',
         'HOST': os.environ.get('DB_HOST'),
         'NAME': os.environ.get('DB_NAME'),
         'USER': os.environ.get('DB_USER'),
         'PASSWORD': os.environ.get('DB_PASS'),
+        # Seconds a connection is kept for later requests; the pool
+        # takes connections back at the end of each request instead
+        'CONN_MAX_AGE': 0 if DB_POOL_SIZE else int(
+            os.environ.get('DB_CONN_MAX_AGE', 60)
+        ),
+        # Check a kept connection still works before a request uses it
+        'CONN_HEALTH_CHECKS': os.environ.get(
+            'DB_CONN_HEALTH_CHECKS', '1'
+        ) == '1',
+        'POOL': {
+            'MAX_SIZE': DB_POOL_SIZE,
+            # Seconds to wait for a free connection of a full pool
+            'TIMEOUT': float(os.environ.get('DB_POOL_TIMEOUT', 30)),
+            'MAX_IDLE': float(os.environ.get('DB_POOL_MAX_IDLE', 300)),
+            'MAX_LIFETIME': float(
+                os.environ.get('DB_POOL_MAX_LIFETIME', 3600)
+            ),
+            # Idle seconds after which a connection is checked on reuse
+            'CHECK_AFTER': float(os.environ.get('DB_POOL_CHECK_AFTER', 5)),
+            # Directory where each process publishes its pool_stats
+            'STATS_DIR': os.environ.get(
+                'DB_POOL_STATS_DIR',
+                os.path.join(tempfile.gettempdir(), 'tbapp-db-pool')
+            ),
+        },
     }
 }
 
+# Read replicas, as comma separated hosts each holding a copy of the
+# default database
+DATABASE_REPLICAS = []
+for index, host in enumerate(
+        filter(None, os.environ.get('DB_REPLICA_HOSTS', '').split(',')), 1):
+    DATABASES[f'replica{index}'] = dict(
+        DATABASES['default'], HOST=host, TEST={'MIRROR': 'default'}
+    )
+    DATABASE_REPLICAS.append(f'replica{index}')
+
+DATABASE_ROUTERS = ['core.db.routers.ReplicaRouter']
+
+# Seconds a user reads from the primary after writing, longer than the
+# replication lag
+READ_YOUR_WRITES_SECONDS = int(os.environ.get('DB_READ_YOUR_WRITES', 10))
+
+# Cache holding those pins; it must name an entry of CACHES shared between
+# processes, e.g. memcached, otherwise every read goes to the primary
+READ_YOUR_WRITES_CACHE = os.environ.get('DB_READ_YOUR_WRITES_CACHE') or None
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.0/ref/settings/#auth-password-validators
@@ -128,3 +203,82 @@ USE_TZ = True
 STATIC_URL = '/static/'
 
 AUTH_USER_MODEL = 'core.User'
+
+
+# Django REST framework
+# https://www.django-rest-framework.org/api-guide/settings/
+
+REST_FRAMEWORK = {
+    'DEFAULT_PAGINATION_CLASS': 'travel.pagination.TravelCursorPagination',
+    'PAGE_SIZE': int(os.environ.get('API_PAGE_SIZE', 100)),
+    # JSON is encoded and decoded with orjson when it is installed
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'TEST_REQUEST_RENDERER_CLASSES': [
+        'rest_framework.renderers.MultiPartRenderer',
+        'core.renderers.JSONRenderer',
+    ],
+}
+
+# MessagePack is negotiated with clients when msgpack is installed
+if importlib.util.find_spec('msgpack'):
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'].append(
+        'core.renderers.MessagePackRenderer'
+    )
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'].append(
+        'core.parsers.MessagePackParser'
+    )
+    REST_FRAMEWORK['TEST_REQUEST_RENDERER_CLASSES'].append(
+        'core.renderers.MessagePackRenderer'
+    )
+
+TRAVEL_MAX_PAGE_SIZE = int(os.environ.get('API_MAX_PAGE_SIZE', 1000))
+
+TRAVEL_MAX_BULK_SIZE = int(os.environ.get('API_MAX_BULK_SIZE', 1000))
+
+# Render list pages from values() rows when the serializer allows
+TRAVEL_FAST_LISTS = os.environ.get('API_FAST_LISTS', '1') == '1'
+
+# Radius in km of place near= queries that do not give one
+TRAVEL_NEAR_RADIUS_KM = float(os.environ.get('API_NEAR_RADIUS_KM', 10))
+
+# Cache
+# https://docs.djangoproject.com/en/3.0/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', 10000)),
+        },
+    },
+}
+
+# List responses cached per user by travel.cache; ALIAS must name an entry
+# of CACHES shared between processes, e.g. memcached, for writes to reach
+# every process, otherwise nothing is cached
+TRAVEL_RESPONSE_CACHE = {
+    'ALIAS': os.environ.get('RESPONSE_CACHE_SHARED') or None,
+    'TIMEOUT': int(os.environ.get('RESPONSE_CACHE_TIMEOUT', 300)),
+}
+
+# Cache holding the version of the in-process category cache; it must
+# name an entry of CACHES shared between processes, e.g. memcached,
+# otherwise every lookup checks the category table for changes instead
+CATEGORY_CACHE_ALIAS = os.environ.get('CATEGORY_CACHE_SHARED') or None
+
+# Token to user lookups cached in process by core.authentication for up
+# to TTL seconds; SHARED_CACHE may name an entry of CACHES shared between
+# processes, e.g. memcached, for revocations to reach every process at once
+TOKEN_AUTH_CACHE = {
+    'MAX_SIZE': int(os.environ.get('TOKEN_CACHE_SIZE', 10000)),
+    'TTL': int(os.environ.get('TOKEN_CACHE_TTL', 300)),
+    'SHARED_CACHE': os.environ.get('TOKEN_CACHE_SHARED') or None,
+}
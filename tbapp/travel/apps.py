@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class TravelConfig(AppConfig):
     name = 'travel'
+
+    def ready(self):
+        from travel import signals  # noqa: F401
@@ -0,0 +1,84 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.exceptions import RequestAborted
+from django.core.signals import request_started
+from django.db import close_old_connections
+from django.urls import Resolver404, resolve, set_script_prefix
+
+
+# Views whose GET and HEAD requests are served off the thread pool
+ASYNC_READ_VIEWS = {
+    'travel:place-list', 'travel:place-detail',
+    'travel:visit-list', 'travel:visit-detail',
+    'travel:plan-list', 'travel:plan-detail',
+}
+
+
+class TravelASGIHandler(ASGIHandler):
+    """ASGI handler serving travel API reads concurrently
+
+    Django 3.0 has no async views, and the stock handler runs every
+    request on the one thread of the thread-sensitive executor, one
+    at a time per process. Reads of places, visits and plans instead
+    run on a bounded pool of threads, each with its own database
+    connection, and their responses are sent from the event loop, so a
+    slow client holds no thread while it reads.
+    """
+
+    def __init__(self, max_threads=None):
+        super().__init__()
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_threads or settings.ASYNC_READ_THREADS,
+            thread_name_prefix='travel-read',
+        )
+
+    def is_async_read(self, scope):
+        """Return whether the request is a read of a travel resource"""
+        if scope['type'] != 'http' or scope['method'] not in ('GET', 'HEAD'):
+            return False
+        try:
+            match = resolve(scope['path'])
+        except Resolver404:
+            return False
+
+        return match.view_name in ASYNC_READ_VIEWS
+
+    def serve(self, request):
+        """Run the request in a pool thread and release its connection"""
+        request_started.send(sender=self.__class__, scope=request.scope)
+        try:
+            return self.get_response(request)
+        finally:
+            close_old_connections()
+
+    async def __call__(self, scope, receive, send):
+        if not self.is_async_read(scope):
+            return await super().__call__(scope, receive, send)
+
+        try:
+            body_file = await self.read_body(receive)
+        except RequestAborted:
+            return
+        set_script_prefix(self.get_script_prefix(scope))
+        request, error_response = self.create_request(scope, body_file)
+        if request is None:
+            await self.send_response(error_response, send)
+            return
+
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(
+            self.executor, self.serve, request
+        )
+        response._handler_class = self.__class__
+        await self.send_response(response, send)
+
+
+def get_asgi_application():
+    """Set up Django and return the travel ASGI handler"""
+    django.setup(set_prefix=False)
+
+    return TravelASGIHandler()
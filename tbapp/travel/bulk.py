@@ -0,0 +1,282 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.fields import empty
+from rest_framework.response import Response
+
+from travel.cache import response_cache
+from travel.prefetch import optimize_queryset
+
+
+def _relation_fields(serializer):
+    """Yield (name, relation, many) for the writable related fields"""
+    for name, field in serializer.fields.items():
+        if field.read_only:
+            continue
+        if isinstance(field, serializers.ManyRelatedField):
+            yield name, field.child_relation, True
+        elif isinstance(field, serializers.RelatedField):
+            yield name, field, False
+
+
+def _insert(objs):
+    """Insert objects in one statement when the backend returns their ids"""
+    if not objs:
+        return objs
+    model = type(objs[0])
+    if connection.features.can_return_rows_from_bulk_insert:
+        return model.objects.bulk_create(objs)
+    for obj in objs:
+        obj.save(force_insert=True)
+
+    return objs
+
+
+class BulkMixin:
+    """Create, update and delete lists of objects in a single request
+
+    POST, PATCH and DELETE on the collection's bulk/ route take a JSON
+    list. Related ids of all items are resolved with one query per
+    related model, rows are written with bulk queries inside a single
+    transaction and nothing is written unless every item is valid, in
+    which case a list of per-item errors is returned.
+    """
+
+    def _bulk_items(self, request):
+        """Return the request body as a list or raise a validation error"""
+        items = request.data
+        if not isinstance(items, list):
+            raise serializers.ValidationError(
+                {'non_field_errors': ['Expected a list of items.']}
+            )
+        max_size = getattr(settings, 'TRAVEL_MAX_BULK_SIZE', 1000)
+        if len(items) > max_size:
+            raise serializers.ValidationError({'non_field_errors': [
+                f'Ensure this list has no more than {max_size} items.'
+            ]})
+
+        return items
+
+    def _scope(self, queryset):
+        """Limit a related queryset to the user's objects if owned"""
+        if any(f.name == 'user' for f in queryset.model._meta.fields):
+            return queryset.filter(user=self.request.user)
+
+        return queryset
+
+    def _preload(self, items):
+        """Load every object referenced by the items, one query per model"""
+        serializer = self.get_serializer()
+        wanted = {}
+        for name, relation, many in _relation_fields(serializer):
+            if not getattr(relation, 'preloaded_from_context', True):
+                continue
+            queryset = relation.get_queryset()
+            model = queryset.model
+            ids = wanted.setdefault(model, (queryset, set()))[1]
+            for item in items:
+                if not isinstance(item, dict) or item.get(name) is None:
+                    continue
+                values = item[name] if many else [item[name]]
+                if not isinstance(values, list):
+                    continue
+                for value in values:
+                    try:
+                        ids.add(model._meta.pk.to_python(value))
+                    except (TypeError, DjangoValidationError):
+                        pass
+
+        return {
+            model: self._scope(queryset).in_bulk(ids) if ids else {}
+            for model, (queryset, ids) in wanted.items()
+        }
+
+    def _validate_items(self, items, instances=None, ids=None):
+        """Validate every item and return (serializers, errors)
+
+        With instances, a {pk: object} mapping, each item updates the
+        object whose pk is at the same position in ids.
+        """
+        context = self.get_serializer_context()
+        context['preloaded'] = self._preload(items)
+        serializer_class = self.get_serializer_class()
+
+        validated, errors = [], []
+        for index, item in enumerate(items):
+            if instances is None:
+                serializer = serializer_class(data=item, context=context)
+            else:
+                instance = instances.get(ids[index])
+                if instance is None:
+                    validated.append(None)
+                    errors.append({'id': ['Not found.']})
+                    continue
+                serializer = serializer_class(
+                    instance, data=item, partial=True, context=context
+                )
+            serializer.is_valid()
+            validated.append(serializer)
+            errors.append(serializer.errors)
+
+        return validated, errors
+
+    def _split_many(self, validated_data, model):
+        """Pop the many-to-many values off validated data"""
+        many = {}
+        for field in model._meta.many_to_many:
+            if field.name in validated_data:
+                many[field.name] = validated_data.pop(field.name)
+
+        return many
+
+    def _set_many(self, model, objs, many_values, replace=True):
+        """Set M2M rows of the objects with one insert per field"""
+        for field in model._meta.many_to_many:
+            rows = [
+                (obj.pk, related.pk)
+                for obj, values in zip(objs, many_values)
+                if field.name in values
+                for related in values[field.name]
+            ]
+            changed = [
+                obj.pk for obj, values in zip(objs, many_values)
+                if field.name in values
+            ]
+            if not changed:
+                continue
+            through = field.remote_field.through
+            source = field.m2m_field_name() + '_id'
+            target = field.m2m_reverse_field_name() + '_id'
+            if replace:
+                through.objects.filter(**{source + '__in': changed}).delete()
+            through.objects.bulk_create([
+                through(**{source: obj_id, target: related_id})
+                for obj_id, related_id in rows
+            ])
+
+    def _bulk_response(self, ids, status_code):
+        """Return the representation of the objects with the given ids"""
+        serializer = self.get_serializer()
+        queryset = optimize_queryset(
+            self.get_queryset().filter(id__in=ids).order_by('id'), serializer
+        )
+        serializer = self.get_serializer(queryset, many=True)
+
+        return Response(serializer.data, status=status_code)
+
+    def prepare_bulk_write(self, objs):
+        """Hook called before objects are written, returning the names
+        of any extra fields it set"""
+        return ()
+
+    def perform_bulk_write(self, objs):
+        """Hook called in the transaction once objects are written"""
+
+    def bulk_create(self, request):
+        """Create all items of the list"""
+        items = self._bulk_items(request)
+        validated, errors = self._validate_items(items)
+        if any(errors):
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        model = self.get_queryset().model
+        objs, many_values = [], []
+        for serializer in validated:
+            data = dict(serializer.validated_data)
+            many_values.append(self._split_many(data, model))
+            objs.append(model(user=request.user, **data))
+        self.prepare_bulk_write(objs)
+        with transaction.atomic():
+            _insert(objs)
+            self._set_many(model, objs, many_values, replace=False)
+            self.perform_bulk_write(objs)
+        response_cache.invalidate(model, request.user.pk)
+
+        return self._bulk_response(
+            [obj.pk for obj in objs], status.HTTP_201_CREATED
+        )
+
+    def bulk_update(self, request):
+        """Partially update all items of the list, identified by id"""
+        items = self._bulk_items(request)
+        ids, errors = self._bulk_ids([
+            item.get('id', empty) if isinstance(item, dict) else empty
+            for item in items
+        ])
+        if any(errors):
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        instances = self.get_queryset().in_bulk(ids)
+        validated, errors = self._validate_items(items, instances, ids)
+        if any(errors):
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        model = self.get_queryset().model
+        objs, many_values, fields = [], [], {'updated_at'}
+        now = timezone.now()
+        for serializer in validated:
+            data = dict(serializer.validated_data)
+            many_values.append(self._split_many(data, model))
+            data['updated_at'] = now
+            for name, value in data.items():
+                setattr(serializer.instance, name, value)
+                fields.add(name)
+            objs.append(serializer.instance)
+        fields.update(self.prepare_bulk_write(objs))
+        with transaction.atomic():
+            model.objects.bulk_update(objs, sorted(fields))
+            self._set_many(model, objs, many_values)
+            self.perform_bulk_write(objs)
+        response_cache.invalidate(model, request.user.pk)
+
+        return self._bulk_response(
+            [obj.pk for obj in objs], status.HTTP_200_OK
+        )
+
+    def _bulk_ids(self, items):
+        """Return (ids, errors) of a list of ids, None for invalid ones"""
+        field = serializers.IntegerField(min_value=1)
+        ids, errors = [], []
+        for item in items:
+            try:
+                ids.append(field.run_validation(item))
+                errors.append({})
+            except serializers.ValidationError as exc:
+                ids.append(None)
+                errors.append({'id': exc.detail})
+
+        return ids, errors
+
+    def bulk_destroy(self, request):
+        """Delete all objects whose ids are in the list"""
+        ids, errors = self._bulk_ids(self._bulk_items(request))
+        if any(errors):
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = self.get_queryset()
+        found = set(
+            queryset.filter(id__in=ids).values_list('id', flat=True)
+        )
+        errors = [{} if i in found else {'id': ['Not found.']} for i in ids]
+        if any(errors):
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            queryset.filter(id__in=found).delete()
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=False, methods=['post', 'patch', 'delete'],
+            url_path='bulk')
+    def bulk(self, request):
+        """Dispatch the bulk request on its method"""
+        if request.method == 'POST':
+            return self.bulk_create(request)
+        if request.method == 'PATCH':
+            return self.bulk_update(request)
+
+        return self.bulk_destroy(request)
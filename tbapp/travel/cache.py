@@ -0,0 +1,241 @@
+import hashlib
+import threading
+import time
+from collections import namedtuple
+from functools import partial
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+from rest_framework import serializers
+from rest_framework.renderers import BrowsableAPIRenderer
+
+from core.caches import shared_cache
+from core.compression import compress_response, negotiate
+from core.metrics import registry
+from core.models import Category, Place, Visit, Plan
+
+from travel.conditional import normalize_params
+
+
+# Cached responses that change when objects of a model change
+DEPENDENT_SCOPES = {
+    Category: ('category',),
+    Place: ('place',),
+    Visit: ('visit', 'place', 'plan'),
+    Plan: ('plan',),
+}
+
+# Scope of the cached responses rendering objects of a model
+MODEL_SCOPES = {
+    Category: 'category',
+    Place: 'place',
+    Visit: 'visit',
+    Plan: 'plan',
+}
+
+# Scopes shared by every user
+GLOBAL_SCOPES = ('category',)
+
+# Rendered, and possibly compressed, body of a cached response with its
+# validators
+CachedBody = namedtuple(
+    'CachedBody', 'content content_type encoding etag last_modified'
+)
+
+
+class ResponseCache:
+    """Versioned cache of serialized responses
+
+    Every entry key embeds the current version of the scopes it depends
+    on, e.g. the places of one user; bumping a version on writes makes
+    all entries of that scope unreachable and the backend's LRU eviction
+    drops them in time. Versions must be seen by every process, so
+    nothing is cached unless alias names a backend they share.
+    """
+    version_prefix = 'travel-version:'
+    key_prefix = 'travel-response:'
+
+    def __init__(self, alias=None, timeout=300):
+        self.alias = alias
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_settings(cls):
+        """Return a cache configured by settings.TRAVEL_RESPONSE_CACHE"""
+        options = getattr(settings, 'TRAVEL_RESPONSE_CACHE', {})
+        return cls(
+            alias=options.get('ALIAS'),
+            timeout=options.get('TIMEOUT', 300),
+        )
+
+    @property
+    def cache(self):
+        """Return the shared backend, None when responses are not cached"""
+        return shared_cache(self.alias)
+
+    def clear(self):
+        """Drop every cached response and version"""
+        if self.cache is not None:
+            self.cache.clear()
+
+    def _version_key(self, scope, user_id):
+        if scope in GLOBAL_SCOPES:
+            return f'{self.version_prefix}{scope}'
+        return f'{self.version_prefix}{scope}:{user_id}'
+
+    def versions(self, scopes, user_id):
+        """Return the current versions of scopes in one cache round trip"""
+        keys = [self._version_key(scope, user_id) for scope in scopes]
+        found = self.cache.get_many(keys)
+        for key in keys:
+            if key not in found:
+                # Start unseen or evicted scopes from a fresh value so
+                # that entries of an evicted version are never reused
+                self.cache.add(key, time.time_ns(), None)
+                found[key] = self.cache.get(key)
+
+        return [found[key] for key in keys]
+
+    def bump(self, scope, user_id=None):
+        """Invalidate every entry depending on a scope"""
+        cache = self.cache
+        if cache is None:
+            return
+        key = self._version_key(scope, user_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), None)
+
+    def invalidate(self, model, user_id):
+        """Invalidate the entries affected by changes to a model's rows"""
+        for scope in DEPENDENT_SCOPES.get(model, ()):
+            self.bump(scope, user_id)
+
+    def make_key(self, *parts):
+        digest = hashlib.md5(':'.join(map(str, parts)).encode()).hexdigest()
+        return self.key_prefix + digest
+
+    def get(self, key):
+        value = self.cache.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        return value
+
+    def set(self, key, value):
+        self.cache.set(key, value, self.timeout)
+
+    def stats(self):
+        """Return the hit and miss counts of this process"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+        }
+
+
+response_cache = ResponseCache.from_settings()
+
+
+def nested_scopes(serializer):
+    """Return the scopes of the objects a serializer nests, such as the
+    relations named by expand="""
+    scopes = set()
+    for field in serializer.fields.values():
+        if not isinstance(field, serializers.BaseSerializer):
+            continue
+        nested = field.child \
+            if isinstance(field, serializers.ListSerializer) else field
+        model = getattr(getattr(nested, 'Meta', None), 'model', None)
+        if model in MODEL_SCOPES:
+            scopes.add(MODEL_SCOPES[model])
+        scopes |= nested_scopes(nested)
+
+    return scopes
+
+
+@registry.collector
+def response_cache_metrics():
+    stats = response_cache.stats()
+    return [
+        ('response_cache_hits_total', 'counter',
+         'List responses served from the response cache', stats['hits']),
+        ('response_cache_misses_total', 'counter',
+         'List responses rendered for the response cache', stats['misses']),
+    ]
+
+
+class CachedListMixin:
+    """Serve list responses from the per-user response cache
+
+    Keys hold the versions of cache_scopes and of the scopes of nested
+    objects, e.g. expanded ones, so a hit runs no query.
+    Entries hold the rendered body compressed with the coding negotiated
+    with the client, so rendering and compression are paid once per
+    cache fill, and the ETag and Last-Modified of the response. A
+    conditional request, which computes the ETag anyway, skips an entry
+    whose ETag differs, should a signal have been missed.
+    """
+    cache_scopes = ()
+
+    def get_cache_key(self):
+        """Return the cache key of the current list request"""
+        request = self.request
+        user_id = request.user.pk
+        scopes = sorted(
+            set(self.cache_scopes) | nested_scopes(self.get_serializer())
+        )
+        return response_cache.make_key(
+            self.basename, self.action, user_id, scopes,
+            response_cache.versions(scopes, user_id),
+            request.accepted_media_type,
+            negotiate(request), normalize_params(request.query_params),
+        )
+
+    def store_body(self, key, response):
+        """Compress a rendered response and cache its body"""
+        encoding = negotiate(self.request)
+        compress_response(response, encoding)
+        response_cache.set(key, CachedBody(
+            response.content, response['Content-Type'],
+            response.get('Content-Encoding'), response.get('ETag'),
+            response.get('Last-Modified'),
+        ))
+
+    def list(self, request, *args, **kwargs):
+        # The browsable API renders forms for the current request
+        if response_cache.cache is None or \
+                isinstance(request.accepted_renderer, BrowsableAPIRenderer):
+            return super().list(request, *args, **kwargs)
+
+        key = self.get_cache_key()
+        body = response_cache.get(key)
+        etag = getattr(self, 'etag', None)
+        if body is not None and etag in (None, body.etag):
+            response = HttpResponse(
+                body.content, content_type=body.content_type
+            )
+            if body.encoding:
+                response['Content-Encoding'] = body.encoding
+                patch_vary_headers(response, ('Accept-Encoding',))
+            for header, value in (('ETag', body.etag),
+                                  ('Last-Modified', body.last_modified)):
+                if value:
+                    response[header] = value
+            return response
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            response.add_post_render_callback(partial(self.store_body, key))
+
+        return response
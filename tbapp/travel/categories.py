@@ -0,0 +1,141 @@
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max
+
+from rest_framework.response import Response
+
+from core.caches import shared_cache
+from core.models import Category
+
+from travel.conditional import normalize_params
+
+
+Snapshot = namedtuple('Snapshot', 'version categories last_modified')
+
+
+class CategoryCache:
+    """In-process copy of the category table with a shared version
+
+    The version lives in a Django cache shared by the workers. Writes
+    drop the local copy at once and bump the version when their
+    transaction commits, so every worker reloads on its next lookup
+    without a restart. Without a shared cache the version is read from
+    the table itself, its row count, highest id and latest change, at
+    the cost of one aggregate query per lookup. Rendered list responses
+    are kept per version.
+    """
+    version_key = 'category-cache:version'
+    max_responses = 128
+
+    def __init__(self, alias=None):
+        self.alias = alias
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._responses = {}
+
+    @classmethod
+    def from_settings(cls):
+        """Return a cache using settings.CATEGORY_CACHE_ALIAS"""
+        return cls(alias=getattr(settings, 'CATEGORY_CACHE_ALIAS', None))
+
+    @property
+    def shared(self):
+        return shared_cache(self.alias)
+
+    def current_version(self):
+        """Return the shared version, starting it if missing"""
+        cache = self.shared
+        if cache is None:
+            return tuple(Category.objects.aggregate(
+                count=Count('pk'), last_id=Max('pk'),
+                modified=Max('updated_at'),
+            ).values())
+
+        version = cache.get(self.version_key)
+        if version is None:
+            cache.add(self.version_key, time.time_ns(), None)
+            version = cache.get(self.version_key)
+
+        return version
+
+    def snapshot(self):
+        """Return the categories of the current version, reloading them
+        when another worker or this one changed the table"""
+        version = self.current_version()
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+
+        categories = {
+            category.pk: category
+            for category in Category.objects.order_by('-name')
+        }
+        modified = [c.updated_at for c in categories.values()]
+        snapshot = Snapshot(version, categories, max(modified, default=None))
+        with self._lock:
+            self._snapshot = snapshot
+            self._responses = {}
+
+        return snapshot
+
+    def get_response(self, version, key):
+        """Return the rendered data of a list request, if cached"""
+        with self._lock:
+            return self._responses.get((version, key))
+
+    def set_response(self, version, key, data):
+        """Keep the rendered data of a list request of a version"""
+        with self._lock:
+            if self._snapshot is None or self._snapshot.version != version:
+                return
+            if len(self._responses) >= self.max_responses:
+                self._responses.clear()
+            self._responses[(version, key)] = data
+
+    def bump(self):
+        """Move every worker to a new version"""
+        cache = self.shared
+        if cache is None:
+            return
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            cache.add(self.version_key, time.time_ns(), None)
+
+    def invalidate(self):
+        """Drop the local copy now and bump the version on commit"""
+        self.clear()
+        transaction.on_commit(self.bump)
+
+    def clear(self):
+        """Drop the local copy and rendered responses"""
+        with self._lock:
+            self._snapshot = None
+            self._responses = {}
+
+
+category_cache = CategoryCache.from_settings()
+
+
+class CachedCategoryListMixin:
+    """Serve the category list from the in-process category cache"""
+
+    def list(self, request, *args, **kwargs):
+        version = category_cache.snapshot().version
+        key = (
+            request.accepted_media_type,
+            tuple(normalize_params(request.query_params)),
+        )
+        data = category_cache.get_response(version, key)
+        if data is not None:
+            return Response(data)
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            category_cache.set_response(version, key, response.data)
+
+        return response
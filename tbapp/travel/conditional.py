@@ -0,0 +1,240 @@
+import hashlib
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Count, Max
+from django.utils.http import http_date, parse_etags, \
+                             parse_http_date_safe, quote_etag
+
+from rest_framework import serializers, status
+from rest_framework.response import Response
+
+
+def normalize_params(query_params):
+    """Return query parameters in a canonical, hashable order"""
+    params = []
+    for key, values in sorted(query_params.lists()):
+        for value in sorted(values):
+            parts = value.split(',')
+            if all(part.strip().isdigit() for part in parts):
+                ids = sorted({int(part) for part in parts})
+                value = ','.join(map(str, ids))
+            params.append((key, value))
+
+    return params
+
+
+def modified_lookups(model, serializer, prefix=''):
+    """Return the updated_at lookups of every object a serializer renders"""
+    lookups = [prefix + 'updated_at']
+    for field in serializer.fields.values():
+        if not isinstance(field, serializers.BaseSerializer):
+            continue
+        nested = field.child \
+            if isinstance(field, serializers.ListSerializer) else field
+        source = field.source.split('.')[0]
+        try:
+            related_model = model._meta.get_field(source).related_model
+        except FieldDoesNotExist:
+            continue
+        lookups.extend(modified_lookups(
+            related_model, nested, prefix=f'{prefix}{source}__'
+        ))
+
+    return lookups
+
+
+def strip_weak(etag):
+    """Return an ETag without its weakness indicator"""
+    return etag[2:] if etag.startswith('W/') else etag
+
+
+def modified_values(obj, path):
+    """Return the values at a lookup path of a loaded object, following
+    loaded relations, or None when a value is not loaded"""
+    if obj is None:
+        return []
+    if isinstance(obj, dict):
+        return [obj[path[0]]] if len(path) == 1 and path[0] in obj else None
+    name = path[0]
+    if len(path) == 1:
+        if name in obj.get_deferred_fields():
+            return None
+        return [getattr(obj, name)]
+
+    field = obj._meta.get_field(name)
+    if field.many_to_many or field.one_to_many:
+        cache = getattr(obj, '_prefetched_objects_cache', {})
+        related = cache.get(field.get_cache_name() if field.one_to_many
+                            else name)
+        if related is None:
+            return None
+    else:
+        if not field.is_cached(obj):
+            return None
+        related = [getattr(obj, name)]
+    values = []
+    for item in related:
+        found = modified_values(item, path[1:])
+        if found is None:
+            return None
+        values.extend(found)
+
+    return values
+
+
+class ConditionalMixin:
+    """Answer conditional list and retrieve requests without serializing
+
+    The fingerprint of a response is the ids of the objects it holds and
+    the latest updated_at of everything it renders. It is read with one
+    query over the same index range as the page, without loading or
+    serializing objects; it yields the ETag and Last-Modified validators
+    and a matching If-None-Match or If-Modified-Since gets a 304.
+    Requests without validators skip that query: their fingerprint is
+    taken from the objects the response loaded.
+    """
+    loaded = None
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        self.loaded = page
+        return page
+
+    def get_object(self):
+        obj = super().get_object()
+        self.loaded = [obj]
+        return obj
+
+    def has_validators(self):
+        """Return whether the request is conditional"""
+        meta = self.request.META
+        return 'HTTP_IF_NONE_MATCH' in meta or \
+            'HTTP_IF_MODIFIED_SINCE' in meta
+
+    def get_loaded_fingerprint(self):
+        """Return (last_modified, ids) of the objects the response
+        loaded, None when some of the values were not loaded"""
+        if self.loaded is None:
+            return None
+        model = self.get_queryset().model
+        lookups = [
+            lookup.split('__')
+            for lookup in modified_lookups(model, self.get_serializer())
+        ]
+        modified, ids = [], []
+        for obj in self.loaded:
+            for path in lookups:
+                values = modified_values(obj, path)
+                if values is None:
+                    return None
+                modified.extend(v for v in values if v is not None)
+            ids.append(obj[model._meta.pk.attname]
+                       if isinstance(obj, dict) else obj.pk)
+
+        return (max(modified) if modified else None), ids
+
+    def get_fingerprint(self):
+        """Return (last_modified, ids) of the objects in the response"""
+        queryset = self.filter_queryset(self.get_queryset()) \
+            .prefetch_related(None)
+        lookups = modified_lookups(queryset.model, self.get_serializer())
+        aggregates = {
+            f'modified_{i}': Max(lookup) for i, lookup in enumerate(lookups)
+        }
+
+        if self.action == 'retrieve':
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+            rows = list(queryset.values('pk').annotate(**aggregates))
+        elif self.pagination_class is not None:
+            paginator = self.pagination_class()
+            ordering = [field.lstrip('-') for field in
+                        paginator.get_ordering(self.request, queryset, self)]
+            rows = paginator.paginate_queryset(
+                queryset.values('pk', *ordering).annotate(**aggregates),
+                self.request, view=self
+            )
+        else:
+            rows = [queryset.aggregate(
+                pk=Count('pk', distinct=True), **aggregates
+            )]
+
+        modified = [
+            value for row in rows for name, value in row.items()
+            if name.startswith('modified_') and value is not None
+        ]
+
+        return (max(modified) if modified else None), \
+            [row['pk'] for row in rows]
+
+    def get_etag(self, last_modified, ids):
+        """Return the ETag of the response for the given fingerprint"""
+        request = self.request
+        key = ':'.join(str(part) for part in (
+            request.user.pk, self.action, request.accepted_media_type,
+            normalize_params(request.query_params), self.kwargs,
+            last_modified.isoformat() if last_modified else '', ids,
+        ))
+
+        return 'W/' + quote_etag(hashlib.md5(key.encode()).hexdigest())
+
+    def is_not_modified(self, etag, last_modified):
+        """Check the request's validators against the current ones"""
+        if_none_match = self.request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            etags = [strip_weak(tag) for tag in parse_etags(if_none_match)]
+            return '*' in etags or strip_weak(etag) in etags
+
+        # Deletions do not move the latest updated_at, so only a single
+        # object can be validated by date
+        if self.action != 'retrieve':
+            return False
+        if_modified_since = parse_http_date_safe(
+            self.request.META.get('HTTP_IF_MODIFIED_SINCE', '')
+        )
+        return bool(
+            if_modified_since and last_modified and
+            int(last_modified.timestamp()) <= if_modified_since
+        )
+
+    def set_validators(self, response, last_modified, ids):
+        """Add the ETag and Last-Modified of a fingerprint to a response"""
+        response['ETag'] = self.get_etag(last_modified, ids)
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        """Run handler unless the client's copy is still current"""
+        if not self.has_validators():
+            response = handler(request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK and \
+                    not response.has_header('ETag'):
+                fingerprint = self.get_loaded_fingerprint() or \
+                    self.get_fingerprint()
+                self.set_validators(response, *fingerprint)
+            return response
+
+        last_modified, ids = self.get_fingerprint()
+        if self.action == 'retrieve' and not ids:
+            return handler(request, *args, **kwargs)
+
+        self.etag = self.get_etag(last_modified, ids)
+        if self.is_not_modified(self.etag, last_modified):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = handler(request, *args, **kwargs)
+        self.set_validators(response, last_modified, ids)
+
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
@@ -0,0 +1,136 @@
+import csv
+
+from rest_framework import serializers as drf_serializers
+from rest_framework.utils.encoders import JSONEncoder
+
+from core.models import Place, Visit, Plan
+
+from travel import serializers
+
+
+RESOURCES = {
+    'places': (Place, serializers.PlaceSerializer),
+    'visits': (Visit, serializers.VisitSerializer),
+    'plans': (Plan, serializers.PlanSerializer),
+}
+
+FORMATS = ('ndjson', 'csv')
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """File-like object returning what is written, for csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+def _chunked(iterator, size):
+    """Yield lists of up to size items from the iterator"""
+    chunk = []
+    for item in iterator:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _related_ids(model, name, ids):
+    """Return a mapping of object id to related ids for an M2M field"""
+    m2m_field = model._meta.get_field(name)
+    through = m2m_field.remote_field.through
+    source = m2m_field.m2m_field_name() + '_id'
+    target = m2m_field.m2m_reverse_field_name() + '_id'
+
+    related = {obj_id: [] for obj_id in ids}
+    rows = through.objects.filter(**{source + '__in': ids}) \
+        .order_by(source, target).values_list(source, target)
+    for obj_id, related_id in rows:
+        related[obj_id].append(related_id)
+
+    return related
+
+
+def get_columns(resource):
+    """Return the exported column names of a resource"""
+    return list(RESOURCES[resource][1]().fields)
+
+
+def iter_records(user, resource, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield the user's objects of a resource as API representations
+
+    Rows are read with a server-side cursor and related ids are fetched
+    with one query per chunk, so memory use does not grow with the
+    number of objects.
+    """
+    model, serializer_class = RESOURCES[resource]
+    fields = serializer_class().fields
+    many = [
+        name for name, field in fields.items()
+        if isinstance(field, drf_serializers.ManyRelatedField)
+    ]
+    columns = [name for name in fields if name not in many]
+
+    rows = model.objects.filter(user=user).order_by('id').values(*columns)
+    for chunk in _chunked(rows.iterator(chunk_size=chunk_size), chunk_size):
+        ids = [row['id'] for row in chunk]
+        related = {name: _related_ids(model, name, ids) for name in many}
+        for row in chunk:
+            record = {}
+            for name, field in fields.items():
+                if name in related:
+                    record[name] = related[name][row['id']]
+                    continue
+                value = row[name]
+                if value is not None and \
+                        not isinstance(field, drf_serializers.RelatedField):
+                    value = field.to_representation(value)
+                record[name] = value
+            yield record
+
+
+def iter_ndjson(user, resources, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield newline delimited JSON lines tagged with their resource"""
+    encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    for resource in resources:
+        for record in iter_records(user, resource, chunk_size):
+            line = {'type': resource}
+            line.update(record)
+            yield encoder.encode(line) + '\n'
+
+
+def iter_csv(user, resource, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield CSV lines for a resource, starting with a header row"""
+    columns = get_columns(resource)
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    for record in iter_records(user, resource, chunk_size):
+        yield writer.writerow([
+            ' '.join(map(str, value)) if isinstance(value, list) else value
+            for value in (record[name] for name in columns)
+        ])
+
+
+def iter_export(user, output, resources, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield the export of the given resources in the given format"""
+    if output == 'csv':
+        if len(resources) != 1:
+            raise ValueError('CSV export takes exactly one resource')
+        return iter_csv(user, resources[0], chunk_size)
+
+    return iter_ndjson(user, resources, chunk_size)
+
+
+def parse_resources(value):
+    """Return the list of resources named in a comma separated string"""
+    if not value:
+        return list(RESOURCES)
+    resources = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in resources if name not in RESOURCES]
+    if unknown:
+        raise ValueError(f'Unknown resource: {", ".join(unknown)}')
+
+    return resources
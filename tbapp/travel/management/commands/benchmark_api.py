@@ -0,0 +1,316 @@
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import (
+    setup_databases, setup_test_environment, teardown_databases,
+    teardown_test_environment,
+)
+from django.urls import reverse
+
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.models import Category, Place, Plan, Visit
+
+from travel import seeding
+
+
+# Changes smaller than this, in percent, are reported as noise
+DEFAULT_THRESHOLD = 10
+
+
+def seed(users, places, visits, plans, rng):
+    """Create users with places, visits and plans, returning the users
+
+    Every user gets places places, visits visits per place and plans
+    plans, and a token to authenticate with.
+    """
+    for _ in seeding.seed(
+        users, places, visits, plans, seed=rng.getrandbits(32)
+    ):
+        pass
+    owners = list(
+        get_user_model().objects.filter(
+            email__endswith='@seed.travelbook.test'
+        ).order_by('id')
+    )
+    Token.objects.bulk_create([
+        Token(user=user, key=f'{rng.getrandbits(160):040x}')
+        for user in owners
+    ])
+
+    return owners
+
+
+def cases(user):
+    """Return {name: (method, path, payload)} of a user's requests"""
+    place = Place.objects.filter(user=user).order_by('id').first()
+    visit = Visit.objects.filter(user=user).order_by('id').first()
+    plan = Plan.objects.filter(user=user).order_by('id').first()
+    category = Category.objects.order_by('id').first()
+    resources = (
+        ('places', 'travel:place', place, {
+            'name': 'New place', 'categories': [category.id],
+            'latitude': '48.860600', 'longitude': '2.337600',
+        }, '?search=place'),
+        ('visits', 'travel:visit', visit, {
+            'title': 'New visit', 'place': place.id, 'score': '4.5',
+        }, f'?places={place.id}'),
+        ('plans', 'travel:plan', plan, {
+            'name': 'New plan', 'begins': '2021-01-01',
+            'ends': '2021-01-05', 'budget': '500.00',
+            'visits': [visit.id],
+        }, f'?visits={visit.id}'),
+    )
+    requests = {}
+    for name, route, obj, payload, query in resources:
+        url = reverse(f'{route}-list')
+        detail = reverse(f'{route}-detail', args=[obj.id])
+        requests.update({
+            f'{name} list': ('get', url, None),
+            f'{name} retrieve': ('get', detail, None),
+            f'{name} filter': ('get', url + query, None),
+            f'{name} create': ('post', url, payload),
+        })
+    url = reverse('travel:category-list')
+    requests.update({
+        'categories list': ('get', url, None),
+        'categories create': ('post', url, {'name': 'New category {n}'}),
+    })
+
+    return requests
+
+
+def clear_caches():
+    for alias in settings.CACHES:
+        caches[alias].clear()
+
+
+def measure(requests, count, allocations):
+    """Send count of the (client, method, path, payload) requests round
+    robin, so that users take turns as they would in production
+
+    Returns requests per second, queries per request and the peak
+    memory allocated by a request in KiB.
+    """
+    queries = [0]
+
+    def counted(execute, sql, params, many, context):
+        queries[0] += 1
+        return execute(sql, params, many, context)
+
+    def send(index):
+        client, method, path, payload = requests[index % len(requests)]
+        data = payload
+        if data and '{n}' in data.get('name', ''):
+            data = dict(data, name=data['name'].format(n=index))
+        response = getattr(client, method)(path, data, format='json')
+        if response.status_code >= 400:
+            raise CommandError(
+                f'{method.upper()} {path} answered {response.status_code}'
+            )
+
+    clear_caches()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(counted))
+        started = time.perf_counter()
+        for index in range(count):
+            send(index)
+        elapsed = time.perf_counter() - started
+
+    # Tracing restarts for each request, as reset_peak() needs Python 3.9
+    peaks = []
+    for index in range(count, count + allocations):
+        tracemalloc.start()
+        try:
+            send(index)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'requests_per_second': count / elapsed,
+        'queries_per_request': queries[0] / count,
+        'peak_kib_per_request': max(peaks, default=0) / 1024,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Return (lines, regressions) comparing results to a baseline"""
+    lines, regressions = [], []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        speed = 100 * (
+            current['requests_per_second'] /
+            previous['requests_per_second'] - 1
+        )
+        queries = current['queries_per_request'] - \
+            previous['queries_per_request']
+        lines.append(
+            f'{name:<20} {speed:>+8.1f}% req/s {queries:>+7.1f} queries'
+        )
+        if speed < -threshold or queries > 0:
+            regressions.append(name)
+
+    return lines, regressions
+
+
+class Command(BaseCommand):
+    """Django command to benchmark the REST API"""
+    help = (
+        'Seed a test database with users, places, visits and plans, time '
+        'list, retrieve, filter and create requests on each viewset through '
+        'the test client and report requests/s, queries/request and peak '
+        'allocations, optionally against a saved run or another revision'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--places', type=int, default=50,
+                            help='Places per user')
+        parser.add_argument('--visits', type=int, default=3,
+                            help='Visits per place')
+        parser.add_argument('--plans', type=int, default=10,
+                            help='Plans per user')
+        parser.add_argument('--requests', type=int, default=50,
+                            help='Timed requests per case')
+        parser.add_argument('--allocations', type=int, default=5,
+                            help='Requests traced for allocations per case')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Save the results as JSON')
+        parser.add_argument('--compare',
+                            help='JSON results of a previous run')
+        parser.add_argument(
+            '--revision',
+            help='Git revision to run the same benchmark on and compare to'
+        )
+        parser.add_argument(
+            '--threshold', type=float, default=DEFAULT_THRESHOLD,
+            help='Slow-down in percent reported as a regression'
+        )
+
+    def run_revision(self, revision, options):
+        """Run the benchmark in a worktree of revision, returning results"""
+        root = subprocess.run(
+            ['git', 'rev-parse', '--show-toplevel'], capture_output=True,
+            text=True, cwd=settings.BASE_DIR,
+        )
+        if root.returncode:
+            raise CommandError(root.stderr.strip())
+        root = root.stdout.strip()
+        project = os.path.relpath(settings.BASE_DIR, root)
+        with tempfile.TemporaryDirectory() as tmp:
+            tree = os.path.join(tmp, 'tree')
+            output = os.path.join(tmp, 'results.json')
+            added = subprocess.run(
+                ['git', 'worktree', 'add', '--detach', tree, revision],
+                capture_output=True, text=True, cwd=root,
+            )
+            if added.returncode:
+                raise CommandError(added.stderr.strip())
+            try:
+                arguments = [
+                    sys.executable, 'manage.py', 'benchmark_api',
+                    '--output', output,
+                ]
+                for name in ('users', 'places', 'visits', 'plans',
+                             'requests', 'allocations', 'seed'):
+                    arguments += [f'--{name}', str(options[name])]
+                run = subprocess.run(
+                    arguments, cwd=os.path.join(tree, project),
+                    capture_output=True, text=True,
+                )
+                if run.returncode:
+                    raise CommandError(
+                        f'Benchmark failed at {revision}: '
+                        f'{run.stderr.strip()}'
+                    )
+                with open(output) as results:
+                    return json.load(results)
+            finally:
+                subprocess.run(
+                    ['git', 'worktree', 'remove', '--force', tree],
+                    capture_output=True, cwd=root,
+                )
+
+    def benchmark(self, options):
+        rng = random.Random(options['seed'])
+        users = seed(
+            options['users'], options['places'], options['visits'],
+            options['plans'], rng,
+        )
+        requests = {}
+        for user in users:
+            client = APIClient()
+            client.credentials(
+                HTTP_AUTHORIZATION=f'Token {user.auth_token.key}'
+            )
+            for name, request in cases(user).items():
+                requests.setdefault(name, []).append((client, *request))
+
+        results = {}
+        for name, variants in requests.items():
+            results[name] = measure(
+                variants, options['requests'], options['allocations']
+            )
+
+        return results
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['revision']:
+            self.stdout.write(
+                f'Running the benchmark at {options["revision"]}'
+            )
+            baseline = self.run_revision(options['revision'], options)
+        elif options['compare']:
+            with open(options['compare']) as saved:
+                baseline = json.load(saved)
+
+        setup_test_environment()
+        databases = setup_databases(verbosity=0, interactive=False)
+        try:
+            results = self.benchmark(options)
+        finally:
+            teardown_databases(databases, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(
+            f'{"case":<20} {"req/s":>8} {"queries":>8} {"peak KiB":>9}'
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name:<20} {result["requests_per_second"]:>8.1f} '
+                f'{result["queries_per_request"]:>8.1f} '
+                f'{result["peak_kib_per_request"]:>9.1f}'
+            )
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+
+        if baseline is not None:
+            lines, regressions = compare(
+                results, baseline, options['threshold']
+            )
+            self.stdout.write('Change against the baseline')
+            for line in lines:
+                self.stdout.write(line)
+            if regressions:
+                raise CommandError(
+                    'Regressions in ' + ', '.join(regressions)
+                )
@@ -0,0 +1,215 @@
+import io
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (
+    setup_databases, setup_test_environment, teardown_databases,
+    teardown_test_environment,
+)
+
+from rest_framework import parsers
+from rest_framework.renderers import JSONRenderer
+
+from core.models import Place, Plan, Visit
+from core.parsers import JSONParser as FastJSONParser, MessagePackParser
+from core.renderers import JSONRenderer as FastJSONRenderer, \
+    MessagePackRenderer, msgpack
+
+from travel import seeding
+from travel.fastpath import RowPlan
+from travel.prefetch import optimize_queryset
+from travel.serializers import PlaceSerializer, PlanSerializer, \
+    VisitSerializer
+
+
+RESOURCES = (
+    ('places', Place, PlaceSerializer),
+    ('visits', Visit, VisitSerializer),
+    ('plans', Plan, PlanSerializer),
+)
+
+
+def best_of(repeat, function, *args):
+    """Return (best seconds, result) of repeat calls of function"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function(*args)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best, result
+
+
+def serialized_data(serializer_class, queryset):
+    """Return the data of a page rendered by the serializer"""
+    return serializer_class(
+        optimize_queryset(queryset, serializer_class()), many=True
+    ).data
+
+
+def render_serialized(serializer_class, queryset):
+    """Return the JSON of a page rendered by the serializer"""
+    return JSONRenderer().render(serialized_data(serializer_class, queryset))
+
+
+def render_rows(serializer_class, queryset):
+    """Return the JSON of a page rendered from values() rows"""
+    plan = RowPlan.for_serializer(serializer_class())
+
+    return JSONRenderer().render(
+        plan.render(queryset.values(*plan.columns))
+    )
+
+
+def compare_renders(serializer_class, queryset, repeat):
+    """Time both renders of a page, returning seconds and whether they
+    produced the same bytes"""
+    serialized, expected = best_of(
+        repeat, render_serialized, serializer_class, queryset
+    )
+    rows, content = best_of(repeat, render_rows, serializer_class, queryset)
+
+    return {
+        'serializer_seconds': serialized,
+        'rows_seconds': rows,
+        'identical': content == expected,
+    }
+
+
+def compare_codecs(data, repeat):
+    """Time encoding and decoding data with DRF's JSON renderer and
+    parser and with the project's, returning seconds and whether they
+    agree"""
+    default, expected = best_of(repeat, JSONRenderer().render, data)
+    fast, content = best_of(repeat, FastJSONRenderer().render, data)
+    default_parse, parsed = best_of(
+        repeat, lambda: parsers.JSONParser().parse(io.BytesIO(content))
+    )
+    fast_parse, fast_parsed = best_of(
+        repeat, lambda: FastJSONParser().parse(io.BytesIO(content))
+    )
+
+    return {
+        'render_seconds': default,
+        'fast_render_seconds': fast,
+        'parse_seconds': default_parse,
+        'fast_parse_seconds': fast_parse,
+        'identical': content == expected and fast_parsed == parsed,
+    }
+
+
+def compare_formats(data, repeat):
+    """Time encoding and decoding data as JSON and as MessagePack,
+    returning sizes, seconds and whether both decode to the same data"""
+    json_encode, json_content = best_of(
+        repeat, FastJSONRenderer().render, data
+    )
+    encode, content = best_of(repeat, MessagePackRenderer().render, data)
+    json_decode, expected = best_of(
+        repeat, lambda: FastJSONParser().parse(io.BytesIO(json_content))
+    )
+    decode, decoded = best_of(
+        repeat, lambda: MessagePackParser().parse(io.BytesIO(content))
+    )
+
+    return {
+        'json_bytes': len(json_content),
+        'msgpack_bytes': len(content),
+        'json_encode_seconds': json_encode,
+        'msgpack_encode_seconds': encode,
+        'json_decode_seconds': json_decode,
+        'msgpack_decode_seconds': decode,
+        'identical': decoded == expected,
+    }
+
+
+class Command(BaseCommand):
+    """Django command to benchmark list rendering and JSON encoding"""
+    help = (
+        'Seed a test database, render pages of places, visits and plans '
+        'with the serializers and from values() rows, and encode and decode '
+        'them with DRF\'s JSON renderer and parser, with the project\'s and '
+        'as MessagePack; check they give the same data and report the time '
+        'each takes and the payload sizes'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000,
+                            help='Objects per rendered page')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Renders per page, the fastest is kept')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        setup_test_environment()
+        databases = setup_databases(verbosity=0, interactive=False)
+        try:
+            for _ in seeding.seed(
+                1, rows, 1, rows, visits_per_plan=3, seed=options['seed']
+            ):
+                pass
+            results, codecs, formats = {}, {}, {}
+            for name, model, serializer_class in RESOURCES:
+                queryset = model.objects.order_by('-id')[:rows]
+                results[name] = compare_renders(
+                    serializer_class, queryset, options['repeat']
+                )
+                data = serialized_data(serializer_class, queryset)
+                codecs[name] = compare_codecs(data, options['repeat'])
+                if msgpack is not None:
+                    formats[name] = compare_formats(data, options['repeat'])
+        finally:
+            teardown_databases(databases, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(
+            f'{"page":<8} {"serializer ms":>14} {"rows ms":>9} {"speed-up":>9}'
+        )
+        for name, result in results.items():
+            serialized = result['serializer_seconds']
+            rows = result['rows_seconds']
+            self.stdout.write(
+                f'{name:<8} {serialized * 1000:>14.1f} {rows * 1000:>9.1f} '
+                f'{serialized / rows:>8.1f}x'
+            )
+        self.stdout.write(
+            f'{"page":<8} {"render ms":>10} {"fast ms":>8} {"speed-up":>9} '
+            f'{"parse ms":>9} {"fast ms":>8} {"speed-up":>9}'
+        )
+        for name, result in codecs.items():
+            self.stdout.write(f'{name:<8} ' + ' '.join(
+                f'{result[slow] * 1000:>{width}.1f} '
+                f'{result[fast] * 1000:>8.1f} '
+                f'{result[slow] / result[fast]:>8.1f}x'
+                for slow, fast, width in (
+                    ('render_seconds', 'fast_render_seconds', 10),
+                    ('parse_seconds', 'fast_parse_seconds', 9),
+                )
+            ))
+        if formats:
+            self.stdout.write(
+                f'{"page":<8} {"JSON KiB":>9} {"msgpack KiB":>12} '
+                f'{"encode ms":>10} {"msgpack ms":>11} '
+                f'{"decode ms":>10} {"msgpack ms":>11}'
+            )
+        for name, result in formats.items():
+            self.stdout.write(
+                f'{name:<8} {result["json_bytes"] / 1024:>9.1f} '
+                f'{result["msgpack_bytes"] / 1024:>12.1f} '
+                f'{result["json_encode_seconds"] * 1000:>10.1f} '
+                f'{result["msgpack_encode_seconds"] * 1000:>11.1f} '
+                f'{result["json_decode_seconds"] * 1000:>10.1f} '
+                f'{result["msgpack_decode_seconds"] * 1000:>11.1f}'
+            )
+        different = [
+            name for name in results
+            if not results[name]['identical'] or
+            not codecs[name]['identical'] or
+            not formats.get(name, {}).get('identical', True)
+        ]
+        if different:
+            raise CommandError(
+                'Different results for ' + ', '.join(different)
+            )
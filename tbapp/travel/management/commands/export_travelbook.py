@@ -0,0 +1,47 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from travel import export
+
+
+class Command(BaseCommand):
+    """Django command to export a user's travel book as NDJSON or CSV"""
+    help = "Stream a user's places, visits and plans to a file or stdout"
+
+    def add_arguments(self, parser):
+        parser.add_argument('email', help='Email of the exported user')
+        parser.add_argument(
+            '--format', dest='output', choices=export.FORMATS,
+            default='ndjson'
+        )
+        parser.add_argument(
+            '--resources', default='',
+            help='Comma separated list of places, visits, plans'
+        )
+        parser.add_argument(
+            '--output', dest='path',
+            help='File to write to instead of stdout'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=export.DEFAULT_CHUNK_SIZE
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(email=options['email'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f'No user with email {options["email"]}')
+        try:
+            resources = export.parse_resources(options['resources'])
+            rows = export.iter_export(
+                user, options['output'], resources, options['chunk_size']
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        if options['path']:
+            with open(options['path'], 'w', newline='') as stream:
+                stream.writelines(rows)
+        else:
+            for row in rows:
+                self.stdout.write(row, ending='')
@@ -0,0 +1,198 @@
+import asyncio
+import statistics
+import threading
+import time
+from wsgiref.util import setup_testing_defaults
+
+from django.contrib.auth import get_user_model
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+
+from rest_framework.authtoken.models import Token
+
+from travel.asgi import TravelASGIHandler
+
+
+def percentile(values, fraction):
+    """Return the value below which a fraction of the values fall"""
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def run_wsgi(app, path, auth, requests, clients, workers, client_delay):
+    """Send requests from client threads to a pool of sync workers
+
+    A sync worker is busy until the client has read the response, so
+    each request pins a worker for the client's read time too.
+    """
+    slots = threading.Semaphore(workers)
+    latencies, failures = [], []
+
+    def client(count):
+        for _ in range(count):
+            started = time.perf_counter()
+            with slots:
+                environ = {
+                    'PATH_INFO': path,
+                    'HTTP_AUTHORIZATION': auth,
+                }
+                setup_testing_defaults(environ)
+                statuses = []
+                body = app(environ, lambda s, h, e=None: statuses.append(s))
+                b''.join(body)
+                body.close()
+                time.sleep(client_delay)
+            latencies.append(time.perf_counter() - started)
+            if not statuses[0].startswith('200'):
+                failures.append(statuses[0])
+
+    threads = [
+        threading.Thread(target=client, args=(count,))
+        for count in split(requests, clients)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return time.perf_counter() - started, latencies, failures
+
+
+def run_asgi(app, path, auth, requests, clients, client_delay):
+    """Send requests from concurrent client tasks to the ASGI handler"""
+    latencies, failures = [], []
+    scope = {
+        'type': 'http',
+        'method': 'GET',
+        'path': path,
+        'query_string': b'',
+        'headers': [(b'authorization', auth.encode())],
+        'server': ('testserver', 80),
+        'client': ('127.0.0.1', 0),
+    }
+
+    async def receive():
+        return {'type': 'http.request', 'body': b''}
+
+    async def client(count):
+        for _ in range(count):
+            started = time.perf_counter()
+            statuses = []
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    statuses.append(message['status'])
+                elif not message.get('more_body'):
+                    await asyncio.sleep(client_delay)
+
+            await app(dict(scope), receive, send)
+            latencies.append(time.perf_counter() - started)
+            if statuses[0] != 200:
+                failures.append(statuses[0])
+
+    async def main():
+        await asyncio.gather(*(
+            client(count) for count in split(requests, clients)
+        ))
+
+    started = time.perf_counter()
+    asyncio.run(main())
+
+    return time.perf_counter() - started, latencies, failures
+
+
+def split(requests, clients):
+    """Return the number of requests sent by each client"""
+    return [
+        requests // clients + (1 if index < requests % clients else 0)
+        for index in range(clients)
+    ]
+
+
+class Command(BaseCommand):
+    """Django command to compare read concurrency of WSGI and ASGI"""
+    help = (
+        'Send the same list requests, from slow clients, to the WSGI '
+        'application with a fixed number of sync workers and to the ASGI '
+        'application with as many threads, and report throughput and '
+        'latency for each number of concurrent clients'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--email', help='User to query as, defaults to the busiest'
+        )
+        parser.add_argument('--path', default='/api/travel/places/')
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument(
+            '--clients', default='1,8,32',
+            help='Comma separated numbers of concurrent clients'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=4,
+            help='WSGI sync workers, and ASGI read threads'
+        )
+        parser.add_argument(
+            '--client-delay', type=float, default=0.05,
+            help='Seconds a client takes to read a response'
+        )
+
+    def get_user(self, email):
+        users = get_user_model().objects
+        if email:
+            user = users.filter(email=email).first()
+        else:
+            user = users.annotate(places=Count('place')) \
+                .order_by('-places').first()
+        if user is None:
+            raise CommandError('No user to send the requests as')
+
+        return user
+
+    def handle(self, *args, **options):
+        user = self.get_user(options['email'])
+        token, _ = Token.objects.get_or_create(user=user)
+        auth = f'Token {token.key}'
+        try:
+            levels = [int(n) for n in options['clients'].split(',')]
+        except ValueError:
+            raise CommandError('--clients must be a list of integers')
+        workers = options['workers']
+        wsgi = WSGIHandler()
+        asgi = TravelASGIHandler(max_threads=workers)
+
+        self.stdout.write(
+            f'{options["requests"]} requests to {options["path"]} as '
+            f'{user.email}, {workers} workers, '
+            f'{options["client_delay"] * 1000:.0f} ms client read time'
+        )
+        self.stdout.write(
+            f'{"clients":>7} {"server":>6} {"req/s":>8} '
+            f'{"p50 ms":>8} {"p95 ms":>8}'
+        )
+        for clients in levels:
+            runs = (
+                ('wsgi', lambda: run_wsgi(
+                    wsgi, options['path'], auth, options['requests'],
+                    clients, workers, options['client_delay']
+                )),
+                ('asgi', lambda: run_asgi(
+                    asgi, options['path'], auth, options['requests'],
+                    clients, options['client_delay']
+                )),
+            )
+            for name, run in runs:
+                elapsed, latencies, failures = run()
+                if failures:
+                    raise CommandError(
+                        f'{name} answered {failures[0]} to {options["path"]}'
+                    )
+                self.stdout.write(
+                    f'{clients:>7} {name:>6} '
+                    f'{len(latencies) / elapsed:>8.1f} '
+                    f'{statistics.median(latencies) * 1000:>8.1f} '
+                    f'{percentile(latencies, 0.95) * 1000:>8.1f}'
+                )
+        asgi.executor.shutdown()
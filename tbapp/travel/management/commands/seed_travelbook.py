@@ -0,0 +1,69 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from travel import seeding
+
+
+class Command(BaseCommand):
+    """Django command to fill the database with synthetic travel books"""
+    help = (
+        'Create users with places, visits and plans using bulk inserts in '
+        'chunked transactions. Run it while nothing else writes to the '
+        'database, as primary keys are assigned by the command'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--places-per-user', type=int, default=50)
+        parser.add_argument('--visits-per-place', type=int, default=3)
+        parser.add_argument('--plans', type=int, default=10,
+                            help='Plans per user')
+        parser.add_argument('--visits-per-plan', type=int, default=5)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument(
+            '--chunk-size', type=int, default=seeding.DEFAULT_CHUNK_SIZE,
+            help='Rows written per transaction'
+        )
+        parser.add_argument('--seed', type=int,
+                            help='Random seed, for a reproducible data set')
+        parser.add_argument('--password', default='travelbook',
+                            help='Password of every created user')
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help='Processes writing chunks in parallel, on PostgreSQL'
+        )
+
+    def handle(self, *args, **options):
+        counts = ('users', 'places_per_user', 'visits_per_place', 'plans',
+                  'visits_per_plan', 'categories', 'chunk_size', 'workers')
+        for name in counts:
+            if options[name] < 0:
+                raise CommandError(f'--{name.replace("_", "-")} is negative')
+        if options['categories'] < 1 or options['chunk_size'] < 1:
+            raise CommandError(
+                '--categories and --chunk-size must be positive'
+            )
+        if options['workers'] > 1 and connection.vendor == 'sqlite':
+            raise CommandError('SQLite does not take parallel writers')
+
+        started = time.perf_counter()
+        written = 0
+        for rows in seeding.seed(
+            options['users'], options['places_per_user'],
+            options['visits_per_place'], options['plans'],
+            visits_per_plan=options['visits_per_plan'],
+            categories=options['categories'],
+            chunk_size=options['chunk_size'], seed=options['seed'],
+            password=options['password'], workers=options['workers'],
+        ):
+            written += rows
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f'{written} rows in {elapsed:.1f} s '
+                f'({written / elapsed:.0f} rows/s)'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {options["users"]} users, {written} rows'
+        ))
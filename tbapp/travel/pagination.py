@@ -0,0 +1,33 @@
+from django.conf import settings
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
+
+
+def parse_limit(query_params):
+    """Return the limit= of a ranked listing, capped at the page size"""
+    try:
+        limit = int(query_params.get(
+            'limit', settings.REST_FRAMEWORK['PAGE_SIZE']
+        ))
+    except ValueError:
+        raise ValidationError({'limit': 'A valid integer is required.'})
+
+    return min(max(limit, 0), settings.TRAVEL_MAX_PAGE_SIZE)
+
+
+class TravelCursorPagination(CursorPagination):
+    """Keyset pagination over the primary key
+
+    Pages are addressed by an opaque cursor holding the last seen key
+    instead of an offset, so every page is a single indexed range scan
+    and no COUNT(*) is issued.
+    """
+    ordering = '-id'
+    page_size_query_param = 'page_size'
+    max_page_size = getattr(settings, 'TRAVEL_MAX_PAGE_SIZE', 1000)
+
+
+class CategoryCursorPagination(TravelCursorPagination):
+    """Keyset pagination over the unique category name"""
+    ordering = '-name'
@@ -0,0 +1,117 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+# Actions whose response is built from objects loaded through get_queryset
+OPTIMIZED_ACTIONS = ('list', 'retrieve', 'update', 'partial_update')
+
+
+def _relation_lookups(model, serializer, prefix=''):
+    """Return the select_related and prefetch_related lookups needed to
+    render the fields of the given serializer for the given model"""
+    selects, prefetches = [], []
+
+    for field in serializer.fields.values():
+        if field.write_only or not field.source or field.source == '*':
+            continue
+        source = field.source.split('.')[0]
+        try:
+            model_field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            continue
+        if not model_field.is_relation:
+            continue
+        lookup = prefix + source
+        related_model = model_field.related_model
+
+        if isinstance(field, serializers.ListSerializer):
+            queryset = optimize_queryset(
+                related_model.objects.all(), field.child
+            )
+            prefetches.append(Prefetch(lookup, queryset=queryset))
+        elif isinstance(field, serializers.BaseSerializer):
+            selects.append(lookup)
+            nested_selects, nested_prefetches = _relation_lookups(
+                related_model, field, prefix=lookup + '__'
+            )
+            selects.extend(nested_selects)
+            prefetches.extend(nested_prefetches)
+        elif isinstance(field, serializers.ManyRelatedField):
+            prefetches.append(lookup)
+        elif isinstance(field, serializers.RelatedField):
+            if not field.use_pk_only_optimization():
+                selects.append(lookup)
+
+    return selects, prefetches
+
+
+def optimize_queryset(queryset, serializer):
+    """Add the joins and prefetches the serializer needs to the queryset"""
+    selects, prefetches = _relation_lookups(queryset.model, serializer)
+    if selects:
+        queryset = queryset.select_related(*selects)
+    if prefetches:
+        queryset = queryset.prefetch_related(*prefetches)
+
+    return queryset
+
+
+def loaded_fields(model, serializer, prefix=''):
+    """Return the only() lookups of the columns a serializer renders,
+    None when a field does not map to a model field"""
+    lookups = [prefix + model._meta.pk.name]
+
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if not field.source or field.source == '*' or '.' in field.source:
+            return None
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+        if model_field.many_to_many or model_field.one_to_many:
+            # Loaded by a prefetch of its own
+            continue
+        lookups.append(prefix + field.source)
+        if isinstance(field, serializers.BaseSerializer):
+            nested = loaded_fields(
+                model_field.related_model, field,
+                prefix=f'{prefix}{field.source}__'
+            )
+            if nested is None:
+                return None
+            lookups.extend(nested)
+
+    return lookups
+
+
+def optimize_sparse_queryset(queryset, serializer):
+    """Optimize the queryset, loading only the rendered columns when the
+    serializer renders a sparse fieldset"""
+    queryset = optimize_queryset(queryset, serializer)
+    if serializer.fields and getattr(serializer, 'sparse', False):
+        lookups = loaded_fields(queryset.model, serializer)
+        if lookups is not None:
+            queryset = queryset.only(*lookups)
+
+    return queryset
+
+
+class PrefetchMixin:
+    """Load the relations used by the action's serializer up front
+
+    Reads of a sparse fieldset also skip the columns left out.
+    """
+
+    def optimize_queryset(self, queryset):
+        """Return the queryset prepared for the current action"""
+        if self.action not in OPTIMIZED_ACTIONS:
+            return queryset
+        if self.request.method not in SAFE_METHODS:
+            return optimize_queryset(queryset, self.get_serializer())
+
+        return optimize_sparse_queryset(queryset, self.get_serializer())
@@ -0,0 +1,33 @@
+from rest_framework.permissions import SAFE_METHODS
+
+from core.db import routers
+
+
+class ReadReplicaMixin:
+    """Serve safe requests from a replica
+
+    A user is pinned to the primary for a short window after any
+    successful write, so they always read their own writes while other
+    users' reads spread over the replicas.
+    """
+    _read_alias_token = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        alias = None
+        if request.method in SAFE_METHODS:
+            alias = routers.choose_replica()
+            if alias and routers.is_pinned(request.user.pk):
+                alias = None
+        self._read_alias_token = routers.set_read_alias(alias)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if self._read_alias_token is not None:
+            routers.reset_read_alias(self._read_alias_token)
+            self._read_alias_token = None
+        if request.method not in SAFE_METHODS \
+                and response.status_code < 400 \
+                and request.user.is_authenticated:
+            routers.pin_to_primary(request.user.pk)
+
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,49 @@
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from travel.pagination import parse_limit
+from travel.prefetch import optimize_sparse_queryset
+
+
+class SearchMixin:
+    """Full-text search over the search_fields of the model's queryset
+
+    search= filters the paginated list, while the search/ route lists
+    the best matches first with their rank.
+    """
+
+    def search_queryset(self, queryset):
+        """Filter the queryset on the search= words, if any"""
+        text = self.request.query_params.get('search')
+        if text:
+            return queryset.search(text)
+
+        return queryset
+
+    def ranked_data(self, queryset, ranking, score_name):
+        """Serialize the objects of (score, pk) pairs in ranking order"""
+        serializer = self.get_serializer()
+        objs = optimize_sparse_queryset(queryset, serializer).in_bulk(
+            [pk for _, pk in ranking]
+        )
+        data = self.get_serializer(
+            [objs[pk] for _, pk in ranking], many=True
+        ).data
+        for item, (score, _) in zip(data, ranking):
+            item[score_name] = score
+
+        return data
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """List the objects matching search=, best match first"""
+        text = request.query_params.get('search')
+        if not text:
+            raise ValidationError({'search': 'This parameter is required.'})
+        limit = parse_limit(request.query_params)
+
+        queryset = self.get_queryset()
+        ranking = queryset.ranked_search(text, limit)
+
+        return Response(self.ranked_data(queryset, ranking, 'rank'))
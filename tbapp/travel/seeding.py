@@ -0,0 +1,285 @@
+import datetime
+import multiprocessing
+import random
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
+from django.db.models import Max
+
+from core import geo
+from core.db.pool import pools
+from core.models import Category, Place, Plan, Visit
+
+from travel.categories import category_cache
+
+
+CATEGORY_NAMES = (
+    'Museum', 'Park', 'Restaurant', 'Cafe', 'Bar', 'Beach', 'Castle',
+    'Church', 'Market', 'Viewpoint', 'Gallery', 'Theatre', 'Zoo',
+    'Garden', 'Bridge', 'Monument', 'Hotel', 'Lake', 'Mountain', 'Harbour',
+)
+
+WORDS = (
+    'old', 'grand', 'little', 'royal', 'hidden', 'central', 'north',
+    'south', 'river', 'hill', 'square', 'tower', 'palace', 'street',
+    'garden', 'harbour', 'station', 'market', 'abbey', 'fort',
+)
+
+# Rows written per transaction
+DEFAULT_CHUNK_SIZE = 20000
+
+# Rows written per INSERT statement, at most
+BATCH_SIZE = 1000
+
+SCORES = [Decimal(score) / 2 for score in range(2, 11)]
+
+ONE_DECIMAL = Decimal('0.1')
+
+DAYS = 4000
+
+
+def next_id(model):
+    """Return the first primary key after the existing rows of a model"""
+    return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+
+def get_categories(count):
+    """Return the ids of count categories, creating the missing ones"""
+    names = [
+        CATEGORY_NAMES[index % len(CATEGORY_NAMES)] +
+        (f' {index // len(CATEGORY_NAMES) + 1}'
+         if index >= len(CATEGORY_NAMES) else '')
+        for index in range(count)
+    ]
+    existing = set(
+        Category.objects.filter(name__in=names).values_list('name', flat=True)
+    )
+    if len(existing) < len(names):
+        Category.objects.bulk_create([
+            Category(name=name) for name in names if name not in existing
+        ])
+        category_cache.invalidate()
+
+    return list(
+        Category.objects.filter(name__in=names).values_list('id', flat=True)
+    )
+
+
+def phrases(rng, count, shortest, longest):
+    """Return count random phrases of shortest to longest words"""
+    return [
+        ' '.join(
+            rng.choice(WORDS) for _ in range(rng.randint(shortest, longest))
+        ).capitalize()
+        for _ in range(count)
+    ]
+
+
+class Generator:
+    """Build the rows of users with their places, visits and plans
+
+    The primary keys of the n-th generated user's rows follow from n and
+    the first free key of each table, so any range of users can be
+    generated on its own, in any process, and written with bulk_create
+    on every backend without reading generated keys back. Nothing else
+    may write the seeded tables while the generator runs.
+    """
+
+    def __init__(self, places_per_user, visits_per_place, plans,
+                 visits_per_plan, categories, password, seed=None):
+        self.places_per_user = places_per_user
+        self.visits_per_place = visits_per_place
+        self.plans = plans
+        self.visits_per_plan = visits_per_plan
+        self.categories = categories
+        self.password = password
+        self.seed = seed
+        self.first_user = next_id(get_user_model())
+        self.first_place = next_id(Place)
+        self.first_visit = next_id(Visit)
+        self.first_plan = next_id(Plan)
+        # Texts are drawn from pools, as generating every one costs more
+        # than inserting it
+        rng = random.Random(seed)
+        self.names = phrases(rng, 4096, 1, 4)
+        self.notes = phrases(rng, 4096, 0, 30)
+        start = datetime.date.today() - datetime.timedelta(days=DAYS)
+        self.days = [
+            start + datetime.timedelta(days=day) for day in range(DAYS)
+        ]
+
+    def rows(self, first, count):
+        """Return the rows of count users from the first-th on, by model
+        in insert order"""
+        rng = random.Random(
+            None if self.seed is None else f'{self.seed}:{first}'
+        )
+        model = get_user_model()
+        rows = {
+            model: [], Place: [], Place.categories.through: [], Visit: [],
+            Plan: [], Plan.visits.through: [],
+        }
+        for index in range(first, first + count):
+            user_id = self.first_user + index
+            rows[model].append(model(
+                id=user_id, email=f'user{user_id}@seed.travelbook.test',
+                name=rng.choice(self.names), password=self.password,
+            ))
+            visit_ids = []
+            for number in range(index * self.places_per_user,
+                                (index + 1) * self.places_per_user):
+                place = self.place(rng, user_id, number)
+                rows[Place].append(place)
+                rows[Place.categories.through] += [
+                    Place.categories.through(
+                        place_id=place.id, category_id=category_id
+                    )
+                    for category_id in rng.sample(
+                        self.categories,
+                        min(rng.randint(1, 3), len(self.categories))
+                    )
+                ]
+                visits = [
+                    self.visit(rng, place, number * self.visits_per_place + n)
+                    for n in range(self.visits_per_place)
+                ]
+                rows[Visit] += visits
+                visit_ids += [visit.id for visit in visits]
+                if place.score_count:
+                    place.avg_score = (
+                        place.score_sum / place.score_count
+                    ).quantize(ONE_DECIMAL, ROUND_HALF_UP)
+            for number in range(index * self.plans, (index + 1) * self.plans):
+                plan = self.plan(rng, user_id, number)
+                rows[Plan].append(plan)
+                rows[Plan.visits.through] += [
+                    Plan.visits.through(plan_id=plan.id, visit_id=visit_id)
+                    for visit_id in rng.sample(
+                        visit_ids, min(self.visits_per_plan, len(visit_ids))
+                    )
+                ]
+
+        return rows
+
+    def place(self, rng, user_id, number):
+        latitude = rng.uniform(-60, 70)
+        longitude = rng.uniform(-180, 180)
+
+        return Place(
+            id=self.first_place + number, user_id=user_id,
+            name=rng.choice(self.names),
+            latitude=Decimal(f'{latitude:.6f}'),
+            longitude=Decimal(f'{longitude:.6f}'),
+            geo_cell=geo.cell_for(latitude, longitude),
+            notes=rng.choice(self.notes), score_sum=Decimal(0),
+        )
+
+    def visit(self, rng, place, number):
+        score = rng.choice(SCORES) if rng.random() < 0.8 else None
+        if score is not None:
+            place.score_sum += score
+            place.score_count += 1
+
+        return Visit(
+            id=self.first_visit + number, user_id=place.user_id,
+            place_id=place.id, title=rng.choice(self.names),
+            notes=rng.choice(self.notes), time=rng.choice(self.days),
+            score=score,
+        )
+
+    def plan(self, rng, user_id, number):
+        begins = rng.choice(self.days)
+
+        return Plan(
+            id=self.first_plan + number, user_id=user_id,
+            name=rng.choice(self.names), begins=begins,
+            ends=begins + datetime.timedelta(days=rng.randint(1, 21)),
+            budget=Decimal(rng.randrange(100, 1000000)) / 100,
+            done=rng.random() < 0.5,
+        )
+
+
+def batch_size(model, objs):
+    """Return the rows per INSERT within the limits of the backend"""
+    fields = model._meta.concrete_fields
+
+    return max(1, min(
+        BATCH_SIZE, connection.ops.bulk_batch_size(fields, objs)
+    ))
+
+
+def write_chunk(generator, first, count):
+    """Write the rows of a range of users in one transaction, returning
+    the number of rows"""
+    rows = generator.rows(first, count)
+    with transaction.atomic():
+        for model, objs in rows.items():
+            model.objects.bulk_create(objs, batch_size=batch_size(model, objs))
+
+    return sum(len(objs) for objs in rows.values())
+
+
+# Generator of the worker processes, inherited from the parent on fork
+_generator = None
+
+
+def _write_chunk(chunk):
+    return write_chunk(_generator, *chunk)
+
+
+def seed(users, places_per_user, visits_per_place, plans, visits_per_plan=5,
+         categories=20, chunk_size=DEFAULT_CHUNK_SIZE, seed=None,
+         password='travelbook', workers=1):
+    """Write users with their travel books, yielding the number of rows
+    written after each transaction
+
+    Users are written in chunks of about chunk_size rows, each chunk in
+    its own transaction, so memory use does not grow with the data set.
+    With several workers, chunks are written by forked processes over
+    their own connections.
+    """
+    global _generator
+
+    generator = Generator(
+        places_per_user, visits_per_place, plans, visits_per_plan,
+        get_categories(categories), make_password(password), seed,
+    )
+    rows_per_user = 1 + places_per_user * (3 + visits_per_place) + \
+        plans * (1 + visits_per_plan)
+    step = max(1, chunk_size // rows_per_user)
+    chunks = [
+        (first, min(step, users - first)) for first in range(0, users, step)
+    ]
+
+    try:
+        if workers <= 1:
+            for chunk in chunks:
+                yield write_chunk(generator, *chunk)
+            return
+
+        # Children must open their own connections instead of sharing
+        # the parent's
+        connections.close_all()
+        for pool in pools().values():
+            pool.close_all()
+        _generator = generator
+        context = multiprocessing.get_context('fork')
+        with context.Pool(workers) as processes:
+            yield from processes.imap_unordered(_write_chunk, chunks)
+    finally:
+        _generator = None
+        reset_sequences()
+
+
+def reset_sequences():
+    """Move the key sequences past the keys assigned by the generator"""
+    statements = connection.ops.sequence_reset_sql(
+        no_style(), [get_user_model(), Place, Visit, Plan]
+    )
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
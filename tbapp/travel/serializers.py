@@ -1,9 +1,178 @@
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.utils.module_loading import import_string
+
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 
+from core.metrics import SerializerTimingMixin
 from core.models import Category, Place, Visit, Plan
 
+from travel.categories import category_cache
+
+
+class PreloadedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Primary key field resolving ids from objects loaded in bulk
+
+    When the serializer context holds a 'preloaded' mapping of model to
+    {pk: object}, ids are looked up there instead of one query per id.
+    """
+    preloaded_from_context = True
+
+    def get_preloaded(self):
+        """Return the {pk: object} mapping to resolve ids from, if any"""
+        model = self.get_queryset().model
+        return self.context.get('preloaded', {}).get(model)
+
+    def preloaded_miss(self, data):
+        """Handle an id missing from the preloaded objects"""
+        self.fail('does_not_exist', pk_value=data)
+
+    def to_internal_value(self, data):
+        model = self.get_queryset().model
+        preloaded = self.get_preloaded()
+        if preloaded is None:
+            return super().to_internal_value(data)
+
+        if self.pk_field is not None:
+            data = self.pk_field.to_internal_value(data)
+        try:
+            pk = model._meta.pk.to_python(data)
+        except (TypeError, DjangoValidationError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return preloaded[pk]
+        except (KeyError, TypeError):
+            return self.preloaded_miss(data)
+
+
+class CategoryPrimaryKeyRelatedField(PreloadedPrimaryKeyRelatedField):
+    """Category id field resolved from the in-process category cache"""
+    preloaded_from_context = False
+
+    def get_preloaded(self):
+        # One snapshot per request, as without a shared cache taking one
+        # checks the category table
+        root = self.root
+        snapshot = getattr(root, '_category_snapshot', None)
+        if snapshot is None:
+            snapshot = root._category_snapshot = category_cache.snapshot()
+
+        return snapshot.categories
+
+    def preloaded_miss(self, data):
+        # Categories committed by another worker may not have reached
+        # this worker's cache yet
+        return serializers.PrimaryKeyRelatedField.to_internal_value(
+            self, data
+        )
+
+
+def split_names(value):
+    """Return the names of a comma separated query parameter"""
+    return [name.strip() for name in (value or '').split(',') if name.strip()]
+
+
+def read_params(serializer):
+    """Return the query parameters of a read request rendered by the
+    serializer at the top level of the response, None otherwise"""
+    request = serializer.context.get('request')
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    parent = serializer.parent
+    if parent is None or (parent.parent is None and
+                          isinstance(parent, serializers.ListSerializer)):
+        return request.query_params
+
+    return None
+
+
+def parse_expand(value):
+    """Return the tree of the dotted paths of an expand= parameter"""
+    tree = {}
+    for path in split_names(value):
+        node = tree
+        for name in path.split('.'):
+            node = node.setdefault(name, {})
+
+    return tree
+
+
+class ExpandableMixin:
+    """Render the relations named by expand= as nested objects
+
+    expandable_fields maps a relation to the import path of the
+    serializer rendering it nested; expand= paths such as
+    place.categories expand the relations of nested objects in turn.
+    """
+    expandable_fields = {}
+
+    def __init__(self, *args, expand=None, **kwargs):
+        self._expand = expand
+        super().__init__(*args, **kwargs)
+
+    def get_expand(self):
+        """Return the tree of relations to expand"""
+        if self._expand is not None:
+            return self._expand
+        params = read_params(self)
+
+        return parse_expand(params.get('expand')) if params else {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        tree = self.get_expand()
+        unknown = [name for name in tree if name not in self.expandable_fields]
+        if unknown:
+            raise serializers.ValidationError({
+                'expand': f'Cannot expand: {", ".join(unknown)}.'
+            })
+        for name, subtree in tree.items():
+            serializer_class = import_string(self.expandable_fields[name])
+            fields[name] = serializer_class(
+                many=isinstance(fields[name], serializers.ManyRelatedField),
+                read_only=True, expand=subtree,
+            )
+
+        return fields
+
+
+class SparseFieldsetMixin:
+    """Render only the fields picked by the fields= and exclude= query
+    parameters of a read request
+
+    Only the top level of the response is trimmed. A trimmed serializer
+    is marked sparse, so views can load only the columns it renders.
+    """
+    sparse = False
+
+    def get_fields(self):
+        fields = super().get_fields()
+        params = read_params(self)
+        if params is None:
+            return fields
+
+        selected = split_names(params.get('fields'))
+        excluded = split_names(params.get('exclude'))
+        for param, names in (('fields', selected), ('exclude', excluded)):
+            unknown = [name for name in names if name not in fields]
+            if unknown:
+                raise serializers.ValidationError({
+                    param: f'Unknown fields: {", ".join(unknown)}.'
+                })
+        if not selected and not excluded:
+            return fields
+
+        self.sparse = True
+        return OrderedDict(
+            (name, field) for name, field in fields.items()
+            if (not selected or name in selected) and name not in excluded
+        )
+
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SerializerTimingMixin, SparseFieldsetMixin,
+                         ExpandableMixin, serializers.ModelSerializer):
     """Serializer for category objects"""
 
     class Meta:
@@ -12,9 +181,13 @@ class CategorySerializer(serializers.ModelSerializer):
         read_only_fields = ('id',)
 
 
-class PlaceSerializer(serializers.ModelSerializer):
+class PlaceSerializer(SerializerTimingMixin, SparseFieldsetMixin,
+                      ExpandableMixin, serializers.ModelSerializer):
     """Serialize a place"""
-    categories = serializers.PrimaryKeyRelatedField(
+    expandable_fields = {
+        'categories': 'travel.serializers.CategorySerializer',
+    }
+    categories = CategoryPrimaryKeyRelatedField(
         many=True,
         queryset=Category.objects.all()
     )
@@ -33,9 +206,11 @@ class PlaceDetailSerializer(PlaceSerializer):
     categories = CategorySerializer(many=True, read_only=True)
 
 
-class VisitSerializer(serializers.ModelSerializer):
+class VisitSerializer(SerializerTimingMixin, SparseFieldsetMixin,
+                      ExpandableMixin, serializers.ModelSerializer):
     """Serialize a visit"""
-    place = serializers.PrimaryKeyRelatedField(
+    expandable_fields = {'place': 'travel.serializers.PlaceSerializer'}
+    place = PreloadedPrimaryKeyRelatedField(
         many=False,
         queryset=Place.objects.all()
     )
@@ -51,8 +226,10 @@ class VisitDetailSerializer(VisitSerializer):
     place = PlaceSerializer(many=False, read_only=True)
 
 
-class PlanSerializer(serializers.ModelSerializer):
+class PlanSerializer(SerializerTimingMixin, SparseFieldsetMixin,
+                     ExpandableMixin, serializers.ModelSerializer):
     """Serialize a plan"""
+    expandable_fields = {'visits': 'travel.serializers.VisitSerializer'}
     visits = serializers.PrimaryKeyRelatedField(
         many=True,
         queryset=Visit.objects.all()
@@ -0,0 +1,43 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from core.models import Category, Place, Visit, Plan
+
+from travel.cache import response_cache
+from travel.categories import category_cache
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Place)
+@receiver(post_delete, sender=Place)
+@receiver(post_save, sender=Visit)
+@receiver(post_delete, sender=Visit)
+@receiver(post_save, sender=Plan)
+@receiver(post_delete, sender=Plan)
+def invalidate_responses(sender, instance, **kwargs):
+    """Invalidate cached responses showing the changed object"""
+    response_cache.invalidate(sender, getattr(instance, 'user_id', None))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_categories(sender, instance, **kwargs):
+    """Reload the category cache of every worker"""
+    category_cache.invalidate()
+
+
+@receiver(m2m_changed, sender=Place.categories.through)
+@receiver(m2m_changed, sender=Plan.visits.through)
+def invalidate_related_responses(sender, instance, action, reverse, model,
+                                 pk_set, **kwargs):
+    """Invalidate cached responses showing changed M2M relations"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        response_cache.invalidate(type(instance), instance.user_id)
+    elif pk_set:
+        user_ids = model.objects.filter(pk__in=pk_set) \
+            .values_list('user_id', flat=True).distinct()
+        for user_id in user_ids:
+            response_cache.invalidate(model, user_id)
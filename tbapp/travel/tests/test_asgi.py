@@ -0,0 +1,114 @@
+import asyncio
+import json
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TransactionTestCase
+
+from rest_framework.authtoken.models import Token
+
+from core.models import Place
+
+from travel.asgi import TravelASGIHandler
+from travel.cache import response_cache
+
+
+def http_scope(path, method='GET', token=None):
+    """Return the ASGI scope of a request"""
+    headers = [(b'authorization', f'Token {token}'.encode())] \
+        if token else []
+    return {
+        'type': 'http',
+        'method': method,
+        'path': path,
+        'query_string': b'',
+        'headers': headers,
+        'server': ('testserver', 80),
+        'client': ('127.0.0.1', 0),
+    }
+
+
+def call(app, scope):
+    """Run a request through an ASGI app and return (status, body)"""
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b''}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    body = b''.join(m.get('body', b'') for m in messages[1:])
+
+    return messages[0]['status'], body
+
+
+class TravelASGIHandlerTests(TransactionTestCase):
+    """Test the ASGI handler of the travel API"""
+
+    def setUp(self):
+        response_cache.clear()
+        self.user = get_user_model().objects.create_user(
+            'test@anytestadressmail.com',
+            'Test123'
+        )
+        self.token = Token.objects.create(user=self.user).key
+        self.app = TravelASGIHandler(max_threads=2)
+        self.addCleanup(self.app.executor.shutdown)
+
+    def test_reads_served_by_pool(self):
+        """Test list and detail reads are served off the thread pool"""
+        place = Place.objects.create(user=self.user, name='Louvre')
+
+        status, body = call(
+            self.app, http_scope('/api/travel/places/', token=self.token)
+        )
+        detail_status, detail = call(self.app, http_scope(
+            f'/api/travel/places/{place.id}/', token=self.token
+        ))
+
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)['results'][0]['name'], 'Louvre')
+        self.assertEqual(detail_status, 200)
+        self.assertEqual(json.loads(detail)['id'], place.id)
+
+    def test_reads_require_authentication(self):
+        """Test reads off the pool still authenticate"""
+        status, _ = call(self.app, http_scope('/api/travel/visits/'))
+
+        self.assertEqual(status, 401)
+
+    def test_only_travel_reads_use_pool(self):
+        """Test writes and other endpoints keep the default path"""
+        self.assertTrue(
+            self.app.is_async_read(http_scope('/api/travel/plans/1/'))
+        )
+        self.assertFalse(self.app.is_async_read(
+            http_scope('/api/travel/plans/', method='POST')
+        ))
+        self.assertFalse(
+            self.app.is_async_read(http_scope('/api/travel/categorys/'))
+        )
+        self.assertFalse(self.app.is_async_read(http_scope('/missing/')))
+
+    def test_other_requests_served(self):
+        """Test requests outside the pool are still answered"""
+        status, _ = call(self.app, http_scope('/api/travel/categorys/'))
+
+        self.assertEqual(status, 200)
+
+    def test_loadtest_reads(self):
+        """Test the load test reports both servers"""
+        Place.objects.create(user=self.user, name='Louvre')
+        out = StringIO()
+
+        call_command(
+            'loadtest_reads', '--requests', '4', '--clients', '2',
+            '--workers', '2', '--client-delay', '0', stdout=out
+        )
+
+        lines = out.getvalue().splitlines()
+        self.assertTrue(any('wsgi' in line for line in lines))
+        self.assertTrue(any('asgi' in line for line in lines))
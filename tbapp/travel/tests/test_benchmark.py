@@ -0,0 +1,55 @@
+import random
+
+from django.test import TestCase
+
+from rest_framework.test import APIClient
+
+from core.models import Place, Plan, Visit
+
+from travel.management.commands.benchmark_api import (
+    cases, compare, measure, seed,
+)
+
+
+class BenchmarkTests(TestCase):
+    """Test the pieces of the API benchmark"""
+
+    def test_seed(self):
+        """Test the generated data set has the requested size"""
+        users = seed(2, 3, 2, 1, random.Random(0))
+
+        self.assertEqual(len(users), 2)
+        self.assertEqual(Place.objects.count(), 6)
+        self.assertEqual(Visit.objects.count(), 12)
+        self.assertEqual(Plan.objects.count(), 2)
+        self.assertTrue(all(user.auth_token for user in users))
+
+    def test_measure_every_case(self):
+        """Test every case answers and reports its measurements"""
+        user, = seed(1, 2, 1, 1, random.Random(0))
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {user.auth_token.key}')
+
+        for name, request in cases(user).items():
+            result = measure([(client, *request)], 2, 1)
+
+            self.assertGreater(result['requests_per_second'], 0, name)
+            self.assertGreater(result['peak_kib_per_request'], 0, name)
+
+    def test_compare(self):
+        """Test slower runs and extra queries are regressions"""
+        baseline = {
+            'list': {'requests_per_second': 100, 'queries_per_request': 2},
+            'create': {'requests_per_second': 100, 'queries_per_request': 2},
+            'detail': {'requests_per_second': 100, 'queries_per_request': 2},
+        }
+        results = {
+            'list': {'requests_per_second': 80, 'queries_per_request': 2},
+            'create': {'requests_per_second': 95, 'queries_per_request': 3},
+            'detail': {'requests_per_second': 95, 'queries_per_request': 2},
+        }
+
+        lines, regressions = compare(results, baseline, 10)
+
+        self.assertEqual(regressions, ['list', 'create'])
+        self.assertEqual(len(lines), 3)
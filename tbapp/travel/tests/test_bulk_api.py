@@ -0,0 +1,224 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.test import TestCase
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Category, Place, Visit
+
+
+PLACES_BULK_URL = reverse('travel:place-bulk')
+VISITS_BULK_URL = reverse('travel:visit-bulk')
+
+
+def sample_place(user, **params):
+    """Create and return a sample place"""
+    defaults = {'name': 'Anywhere buildings'}
+    defaults.update(params)
+
+    return Place.objects.create(user=user, **defaults)
+
+
+class PublicBulkApiTests(TestCase):
+    """Test the publicly available bulk API"""
+
+    def test_auth_required(self):
+        """Test that authentication is required"""
+        res = APIClient().post(PLACES_BULK_URL, [], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateBulkApiTests(TestCase):
+    """Test authenticated bulk API access"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'test@anytestadressmail.com',
+            'Test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_bulk_create_places(self):
+        """Test creating a list of places with categories"""
+        museum = Category.objects.create(name='Museum')
+        pub = Category.objects.create(name='Pub')
+        payload = [
+            {'name': 'Louvre', 'categories': [museum.id]},
+            {'name': 'Old Pub', 'categories': [pub.id, museum.id]},
+            {'name': 'Nowhere', 'categories': []},
+        ]
+
+        res = self.client.post(PLACES_BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([p['name'] for p in res.data],
+                         ['Louvre', 'Old Pub', 'Nowhere'])
+        place = Place.objects.get(name='Old Pub', user=self.user)
+        self.assertEqual(set(place.categories.all()), {museum, pub})
+
+    def test_bulk_create_visits(self):
+        """Test creating a list of visits"""
+        place = sample_place(user=self.user)
+        payload = [
+            {'title': f'Visit {i}', 'place': place.id, 'score': 4}
+            for i in range(3)
+        ]
+
+        res = self.client.post(VISITS_BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            Visit.objects.filter(user=self.user, place=place).count(), 3
+        )
+        place.refresh_from_db()
+        self.assertEqual(place.avg_score, 4)
+
+    def test_bulk_update_moves_scores(self):
+        """Test moving visits in bulk updates both places' scores"""
+        place1 = sample_place(user=self.user)
+        place2 = sample_place(user=self.user)
+        visit = Visit.objects.create(user=self.user, place=place1, score=5)
+        Visit.objects.create(user=self.user, place=place1, score=3)
+
+        res = self.client.patch(
+            VISITS_BULK_URL, [{'id': visit.id, 'place': place2.id}],
+            format='json'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        place1.refresh_from_db()
+        place2.refresh_from_db()
+        self.assertEqual(place1.avg_score, 3)
+        self.assertEqual(place2.avg_score, 5)
+
+    def test_bulk_create_per_item_errors(self):
+        """Test invalid items are reported and nothing is created"""
+        place = sample_place(user=self.user)
+        other = get_user_model().objects.create_user(
+            'other@anytestadressmail.com',
+            'testpass'
+        )
+        foreign = sample_place(user=other)
+        payload = [
+            {'title': 'Valid', 'place': place.id},
+            {'title': 'Missing', 'place': 999999},
+            {'title': 'Foreign', 'place': foreign.id},
+        ]
+
+        res = self.client.post(VISITS_BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn('place', res.data[1])
+        self.assertIn('place', res.data[2])
+        self.assertFalse(Visit.objects.exists())
+
+    def test_bulk_requires_list(self):
+        """Test a non-list payload is rejected"""
+        res = self.client.post(
+            PLACES_BULK_URL, {'name': 'Louvre'}, format='json'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_update_places(self):
+        """Test partially updating a list of places"""
+        museum = Category.objects.create(name='Museum')
+        place1 = sample_place(user=self.user)
+        place2 = sample_place(user=self.user)
+        place2.categories.add(Category.objects.create(name='Pub'))
+        payload = [
+            {'id': place1.id, 'name': 'Louvre'},
+            {'id': place2.id, 'categories': [museum.id]},
+        ]
+
+        res = self.client.patch(PLACES_BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        place1.refresh_from_db()
+        place2.refresh_from_db()
+        self.assertEqual(place1.name, 'Louvre')
+        self.assertEqual(place2.name, 'Anywhere buildings')
+        self.assertEqual(list(place2.categories.all()), [museum])
+
+    def test_bulk_update_unknown_id(self):
+        """Test updating an object of another user is reported"""
+        other = get_user_model().objects.create_user(
+            'other@anytestadressmail.com',
+            'testpass'
+        )
+        place = sample_place(user=other)
+
+        res = self.client.patch(
+            PLACES_BULK_URL, [{'id': place.id, 'name': 'Mine'}],
+            format='json'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        place.refresh_from_db()
+        self.assertEqual(place.name, 'Anywhere buildings')
+
+    def test_bulk_update_ids_validated(self):
+        """Test update ids are validated as integers like delete ids"""
+        place = sample_place(user=self.user)
+
+        res = self.client.patch(
+            PLACES_BULK_URL, [{'id': str(place.id), 'name': 'Louvre'}],
+            format='json'
+        )
+        invalid = self.client.patch(
+            PLACES_BULK_URL,
+            [{'id': True, 'name': 'Orsay'}, {'name': 'Prado'}],
+            format='json'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data[0]['name'], 'Louvre')
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('id', invalid.data[0])
+        self.assertIn('id', invalid.data[1])
+
+    def test_bulk_delete_visits(self):
+        """Test deleting a list of visits"""
+        place = sample_place(user=self.user)
+        visits = [
+            Visit.objects.create(user=self.user, place=place)
+            for _ in range(3)
+        ]
+
+        res = self.client.delete(
+            VISITS_BULK_URL, [visits[0].id, visits[1].id], format='json'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(list(Visit.objects.all()), [visits[2]])
+
+    def test_bulk_delete_unknown_id(self):
+        """Test nothing is deleted when an id is unknown"""
+        place = sample_place(user=self.user)
+
+        res = self.client.delete(
+            PLACES_BULK_URL, [place.id, 999999], format='json'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[1], {'id': ['Not found.']})
+        self.assertTrue(Place.objects.filter(id=place.id).exists())
+
+    def test_bulk_delete_invalid_ids(self):
+        """Test ids that are not integers are rejected before any query"""
+        place = sample_place(user=self.user)
+
+        with self.assertNumQueries(0):
+            res = self.client.delete(
+                PLACES_BULK_URL, [place.id, {'id': 1}, 'abc'], format='json'
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn('id', res.data[1])
+        self.assertIn('id', res.data[2])
+        self.assertTrue(Place.objects.filter(id=place.id).exists())
@@ -0,0 +1,222 @@
+import gzip
+import json
+import tempfile
+from unittest import mock
+
+from django.conf import settings
+
+from django.contrib.auth import get_user_model
+from django.http import QueryDict
+from django.urls import reverse
+from django.utils import timezone
+from django.test import TestCase, override_settings
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import compression
+from core.metrics import registry
+from core.models import Category, Place, Visit
+
+from travel.cache import response_cache
+from travel.conditional import normalize_params
+
+
+PLACES_URL = reverse('travel:place-list')
+VISITS_URL = reverse('travel:visit-list')
+
+# A cache other processes could read, as the response cache requires
+SHARED_CACHES = dict(settings.CACHES, responses={
+    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+    'LOCATION': tempfile.mkdtemp(prefix='tbapp-responses-'),
+})
+
+
+def sample_place(user, **params):
+    """Create and return a sample place"""
+    defaults = {'name': 'Anywhere buildings'}
+    defaults.update(params)
+
+    return Place.objects.create(user=user, **defaults)
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class ResponseCacheApiTests(TestCase):
+    """Test the per-user response cache of list endpoints"""
+
+    def setUp(self):
+        patcher = mock.patch.object(response_cache, 'alias', 'responses')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        response_cache.clear()
+        self.user = get_user_model().objects.create_user(
+            'test@anytestadressmail.com',
+            'Test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_served_from_cache(self):
+        """Test a repeated list runs no query"""
+        place = sample_place(user=self.user)
+        place.categories.add(Category.objects.create(name='Museum'))
+        res = self.client.get(PLACES_URL)
+        hits = response_cache.hits
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(PLACES_URL)
+
+        self.assertEqual(cached.status_code, status.HTTP_200_OK)
+        self.assertEqual(cached.json(), res.json())
+        self.assertEqual(cached['ETag'], res['ETag'])
+        self.assertEqual(response_cache.hits, hits + 1)
+
+    def test_process_local_cache_refused(self):
+        """Test nothing is cached without a cache shared by processes"""
+        sample_place(user=self.user)
+        self.client.get(PLACES_URL)
+        hits = response_cache.hits
+
+        with mock.patch.object(response_cache, 'alias', 'default'):
+            res = self.client.get(PLACES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(response_cache.hits, hits)
+
+    def test_conditional_request_checks_etag(self):
+        """Test an entry is not served when its ETag is outdated"""
+        place = sample_place(user=self.user)
+        etag = self.client.get(PLACES_URL)['ETag']
+        # An update whose signal was missed
+        Place.objects.filter(pk=place.pk).update(
+            name='Louvre', updated_at=timezone.now()
+        )
+
+        res = self.client.get(PLACES_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()['results'][0]['name'], 'Louvre')
+        self.assertNotEqual(res['ETag'], etag)
+
+    def test_stats_exported(self):
+        """Test the hit and miss counts are in the metrics output"""
+        self.client.get(PLACES_URL)
+        self.client.get(PLACES_URL)
+
+        output = registry.render()
+
+        self.assertIn(
+            f'tbapp_response_cache_hits_total {response_cache.hits:.1f}',
+            output
+        )
+        self.assertIn(
+            f'tbapp_response_cache_misses_total {response_cache.misses:.1f}',
+            output
+        )
+
+    def test_cache_per_user(self):
+        """Test users do not see each other's cached lists"""
+        sample_place(user=self.user)
+        self.client.get(PLACES_URL)
+        other = get_user_model().objects.create_user(
+            'other@anytestadressmail.com',
+            'testpass'
+        )
+        self.client.force_authenticate(user=other)
+
+        res = self.client.get(PLACES_URL)
+
+        self.assertEqual(res.data['results'], [])
+
+    def test_invalidated_on_category_delete(self):
+        """Test deleting a category drops it from cached place lists"""
+        category = Category.objects.create(name='Museum')
+        sample_place(user=self.user).categories.add(category)
+        self.client.get(PLACES_URL)
+
+        category.delete()
+        res = self.client.get(PLACES_URL)
+
+        self.assertEqual(res.data['results'][0]['categories'], [])
+
+    def test_invalidated_on_visit_score(self):
+        """Test a new visit score shows in the cached place list"""
+        place = sample_place(user=self.user)
+        self.client.get(PLACES_URL)
+
+        Visit.objects.create(user=self.user, place=place, score=4)
+        res = self.client.get(PLACES_URL)
+
+        self.assertEqual(res.data['results'][0]['avg_score'], '4.0')
+
+    def test_invalidated_on_expanded_place_rename(self):
+        """Test renaming a place shows in cached visit lists expanding it"""
+        place = sample_place(user=self.user, name='Louvre')
+        Visit.objects.create(user=self.user, place=place)
+        self.client.get(VISITS_URL, {'expand': 'place'})
+
+        place.name = 'Orsay'
+        place.save()
+        res = self.client.get(VISITS_URL, {'expand': 'place'})
+
+        self.assertEqual(res.json()['results'][0]['place']['name'], 'Orsay')
+
+    def test_filters_normalized(self):
+        """Test equivalent filters share a cache entry"""
+        place1 = sample_place(user=self.user)
+        place2 = sample_place(user=self.user)
+        self.client.get(VISITS_URL, {'places': f'{place2.id},{place1.id}'})
+        hits = response_cache.hits
+
+        self.client.get(VISITS_URL, {'places': f'{place1.id},{place2.id}'})
+
+        self.assertEqual(response_cache.hits, hits + 1)
+
+    def test_bump_changes_versions(self):
+        """Test bumping a scope changes its version only for that user"""
+        before = response_cache.versions(['place'], self.user.id)
+        other = response_cache.versions(['place'], self.user.id + 1)
+
+        response_cache.invalidate(Place, self.user.id)
+
+        self.assertNotEqual(
+            response_cache.versions(['place'], self.user.id), before
+        )
+        self.assertEqual(
+            response_cache.versions(['place'], self.user.id + 1), other
+        )
+
+    def test_normalize_params(self):
+        """Test query parameters are put in a canonical order"""
+        params = QueryDict('places=3,1,2&page_size=5')
+
+        self.assertEqual(
+            normalize_params(params),
+            [('page_size', '5'), ('places', '1,2,3')]
+        )
+
+    @override_settings(COMPRESSION={'MIN_SIZE': 200})
+    def test_compressed_once_per_fill(self):
+        """Test cached lists are stored compressed and replayed as they
+        are to clients accepting the coding"""
+        for number in range(20):
+            sample_place(user=self.user, name=f'Place {number}')
+        with mock.patch(
+                'core.compression.compress', wraps=compression.compress
+        ) as compress:
+            res = self.client.get(PLACES_URL, HTTP_ACCEPT_ENCODING='gzip')
+            cached = self.client.get(
+                PLACES_URL, HTTP_ACCEPT_ENCODING='gzip'
+            )
+
+        self.assertEqual(compress.call_count, 1)
+        self.assertEqual(cached['Content-Encoding'], res['Content-Encoding'])
+        self.assertEqual(cached.content, res.content)
+        self.assertIn('Accept-Encoding', cached['Vary'])
+
+        plain = self.client.get(PLACES_URL)
+
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        self.assertEqual(
+            plain.json(), json.loads(gzip.decompress(cached.content))
+        )
@@ -29,7 +29,7 @@ class PublicCategoryApiTests(TestCase):
         cats = Category.objects.all().order_by('-name')
         serializer = CategorySerializer(cats, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_create_category_failure(self):
         """Test that category creation not allowed to unauthenticated user"""
@@ -60,7 +60,7 @@ class PrivateCategoryApiTests(TestCase):
         cats = Category.objects.all().order_by('-name')
         serializer = CategorySerializer(cats, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_create_category_successful(self):
         """Test creating a new category"""
@@ -0,0 +1,174 @@
+import tempfile
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Category, Place
+
+from travel.categories import category_cache
+
+
+CATEGORY_URL = reverse('travel:category-list')
+PLACES_URL = reverse('travel:place-list')
+
+# A cache other processes could read, holding the category version
+SHARED_CACHES = dict(settings.CACHES, categories={
+    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+    'LOCATION': tempfile.mkdtemp(prefix='tbapp-categories-'),
+})
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class CategoryCacheTests(TestCase):
+    """Test serving categories from the in-process cache"""
+
+    def setUp(self):
+        patcher = patch.object(category_cache, 'alias', 'categories')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        category_cache.clear()
+        category_cache.shared.clear()
+        self.user = get_user_model().objects.create_user(
+            'test@anytestadressmail.com',
+            'Test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_served_from_memory(self):
+        """Test a repeated category list runs no query"""
+        Category.objects.create(name='Museum')
+        res = self.client.get(CATEGORY_URL)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(CATEGORY_URL)
+
+        self.assertEqual(cached.data, res.data)
+
+    def test_list_sees_created_category(self):
+        """Test a created category shows in the next list"""
+        Category.objects.create(name='Museum')
+        self.client.get(CATEGORY_URL)
+
+        self.client.post(CATEGORY_URL, {'name': 'Pub'})
+        res = self.client.get(CATEGORY_URL)
+
+        names = [item['name'] for item in res.data['results']]
+        self.assertEqual(names, ['Pub', 'Museum'])
+
+    def test_validation_served_from_memory(self):
+        """Test place category ids are validated without a query"""
+        category = Category.objects.create(name='Museum')
+        category_cache.snapshot()
+
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.post(
+                PLACES_URL, {'name': 'Louvre', 'categories': [category.id]}
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        selects = [
+            q['sql'] for q in ctx.captured_queries
+            if q['sql'].startswith('SELECT "core_category"')
+            and 'core_place_categories' not in q['sql']
+        ]
+        self.assertEqual(selects, [])
+
+    def test_unknown_category_rejected(self):
+        """Test an unknown category id is still rejected"""
+        res = self.client.post(
+            PLACES_URL, {'name': 'Louvre', 'categories': [999999]}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Place.objects.exists())
+
+    def test_version_bump_reloads(self):
+        """Test a version bump from another worker reloads the cache"""
+        category_cache.snapshot()
+        Category.objects.bulk_create([Category(name='Museum')])
+
+        category_cache.bump()
+
+        names = [c.name for c in category_cache.snapshot().categories.values()]
+        self.assertEqual(names, ['Museum'])
+
+    def test_category_of_other_worker_accepted(self):
+        """Test ids missing from a stale cache fall back to the database"""
+        category_cache.snapshot()
+        Category.objects.bulk_create([Category(name='Museum')])
+        category = Category.objects.get(name='Museum')
+
+        res = self.client.post(
+            PLACES_URL, {'name': 'Louvre', 'categories': [category.id]}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+
+class ProcessLocalCategoryCacheTests(TestCase):
+    """Test the category cache without a cache shared by processes"""
+
+    def setUp(self):
+        category_cache.clear()
+        self.user = get_user_model().objects.create_user(
+            'test@anytestadressmail.com',
+            'Test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_change_of_other_worker_seen(self):
+        """Test changes without a bump in this process are seen"""
+        category = Category.objects.create(name='Museum')
+        self.client.get(CATEGORY_URL)
+        etag = self.client.get(CATEGORY_URL)['ETag']
+
+        # Writes of another worker, whose signals this one never gets
+        Category.objects.bulk_create([Category(name='Pub')])
+        Category.objects.filter(pk=category.pk).delete()
+        res = self.client.get(CATEGORY_URL)
+
+        names = [item['name'] for item in res.data['results']]
+        self.assertEqual(names, ['Pub'])
+        self.assertNotEqual(res['ETag'], etag)
+
+    def test_list_served_from_memory(self):
+        """Test a repeated list only checks the table for changes"""
+        Category.objects.create(name='Museum')
+        self.client.get(CATEGORY_URL)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(CATEGORY_URL)
+
+        self.assertTrue(ctx.captured_queries)
+        for query in ctx.captured_queries:
+            self.assertIn('COUNT(', query['sql'])
+
+    def test_validation_checks_table_once(self):
+        """Test the category ids of a request share one snapshot"""
+        categories = [
+            Category.objects.create(name=f'Category {number}')
+            for number in range(6)
+        ]
+        category_cache.snapshot()
+
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.post(PLACES_URL, {
+                'name': 'Louvre',
+                'categories': [category.id for category in categories],
+            })
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        checks = [
+            q['sql'] for q in ctx.captured_queries if 'COUNT(' in q['sql']
+        ]
+        self.assertEqual(len(checks), 1)
@@ -0,0 +1,158 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Category, Place, Visit, Plan
+
+from travel.conditional import strip_weak
+
+
+PLACES_URL = reverse('travel:place-list')
+
+
+def plan_detail_url(plan_id):
+    """Return plan detail URL"""
+    return reverse('travel:plan-detail', args=[plan_id])
+
+
+def sample_place(user, **params):
+    """Create and return a sample place"""
+    defaults = {'name': 'Anywhere buildings'}
+    defaults.update(params)
+
+    return Place.objects.create(user=user, **defaults)
+
+
+class StripWeakTests(SimpleTestCase):
+    """Test removing the weakness indicator of ETags"""
+
+    def test_strip_weak(self):
+        """Test only a leading W/ is removed"""
+        self.assertEqual(strip_weak('W/"abc"'), '"abc"')
+        self.assertEqual(strip_weak('"abc"'), '"abc"')
+        self.assertEqual(strip_weak('W/W/"abc"'), 'W/"abc"')
+
+
+class ConditionalApiTests(TestCase):
+    """Test conditional requests on the travel API"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'test@anytestadressmail.com',
+            'Test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def assertNotModified(self, url, **headers):
+        res = self.client.get(url, **headers)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.content, b'')
+
+    def assertModified(self, url, **headers):
+        res = self.client.get(url, **headers)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_list_not_modified(self):
+        """Test an unchanged list is answered with 304"""
+        sample_place(user=self.user)
+        etag = self.client.get(PLACES_URL)['ETag']
+
+        self.assertNotModified(PLACES_URL, HTTP_IF_NONE_MATCH=etag)
+
+    @override_settings(TRAVEL_FAST_LISTS=False)
+    def test_serialized_list_not_modified(self):
+        """Test the ETag of a serialized list page is answered with 304"""
+        place = sample_place(user=self.user)
+        place.categories.add(Category.objects.create(name='Museum'))
+        etag = self.client.get(PLACES_URL)['ETag']
+
+        self.assertNotModified(PLACES_URL, HTTP_IF_NONE_MATCH=etag)
+
+    def test_unconditional_list_single_query(self):
+        """Test a list without validators is not fingerprinted again"""
+        sample_place(user=self.user)
+
+        with self.assertNumQueries(2):
+            res = self.client.get(PLACES_URL)
+
+        self.assertTrue(res.has_header('ETag'))
+
+    def test_list_modified_on_update(self):
+        """Test updating a place changes the list ETag"""
+        place = sample_place(user=self.user)
+        etag = self.client.get(PLACES_URL)['ETag']
+
+        place.name = 'Louvre'
+        place.save()
+
+        self.assertModified(PLACES_URL, HTTP_IF_NONE_MATCH=etag)
+
+    def test_list_modified_on_delete(self):
+        """Test deleting a place changes the list ETag"""
+        sample_place(user=self.user)
+        sample_place(user=self.user).delete()
+        place = sample_place(user=self.user)
+        etag = self.client.get(PLACES_URL)['ETag']
+
+        place.delete()
+
+        self.assertModified(PLACES_URL, HTTP_IF_NONE_MATCH=etag)
+
+    def test_list_modified_on_category_change(self):
+        """Test adding a category to a place changes the list ETag"""
+        place = sample_place(user=self.user)
+        etag = self.client.get(PLACES_URL)['ETag']
+
+        place.categories.add(Category.objects.create(name='Museum'))
+
+        self.assertModified(PLACES_URL, HTTP_IF_NONE_MATCH=etag)
+
+    def test_list_etag_depends_on_page(self):
+        """Test each page has its own ETag"""
+        for _ in range(3):
+            sample_place(user=self.user)
+        res = self.client.get(PLACES_URL, {'page_size': 2})
+
+        next_page = self.client.get(res.data['next'])
+
+        self.assertNotEqual(res['ETag'], next_page['ETag'])
+
+    def test_detail_modified_on_nested_change(self):
+        """Test updating a visit of a plan changes the plan detail ETag"""
+        visit = Visit.objects.create(
+            user=self.user, place=sample_place(user=self.user)
+        )
+        plan = Plan.objects.create(
+            user=self.user, name='Plan', begins='2020-01-01',
+            ends='2020-01-05', budget=300
+        )
+        plan.visits.add(visit)
+        url = plan_detail_url(plan.id)
+        etag = self.client.get(url)['ETag']
+        self.assertNotModified(url, HTTP_IF_NONE_MATCH=etag)
+
+        visit.title = 'Renamed'
+        visit.save()
+
+        self.assertModified(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_detail_if_modified_since(self):
+        """Test a detail is not sent again when not modified since"""
+        plan = Plan.objects.create(
+            user=self.user, name='Plan', begins='2020-01-01',
+            ends='2020-01-05', budget=300
+        )
+        url = plan_detail_url(plan.id)
+        last_modified = self.client.get(url)['Last-Modified']
+
+        self.assertNotModified(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+    def test_detail_not_found(self):
+        """Test conditional handling keeps 404 for unknown objects"""
+        res = self.client.get(plan_detail_url(999999))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
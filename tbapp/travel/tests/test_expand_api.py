@@ -0,0 +1,110 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Category, Place, Plan, Visit
+from core.testing import QueryCountMixin
+
+from travel.cache import response_cache
+
+
+PLACES_URL = reverse('travel:place-list')
+VISITS_URL = reverse('travel:visit-list')
+PLANS_URL = reverse('travel:plan-list')
+
+
+class ExpandApiTests(QueryCountMixin, TestCase):
+    """Test nesting related objects with the expand= parameter"""
+
+    def setUp(self):
+        response_cache.clear()
+        self.user = get_user_model().objects.create_user(
+            'test@anytestadressmail.com',
+            'Test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.museum = Category.objects.create(name='Museum')
+
+    def sample_plan(self):
+        """Create a plan with a visit to a place with a category"""
+        place = Place.objects.create(user=self.user, name='Louvre')
+        place.categories.add(self.museum)
+        visit = Visit.objects.create(
+            user=self.user, place=place, title='First visit'
+        )
+        plan = Plan.objects.create(
+            user=self.user, name='Paris', begins='2021-01-01',
+            ends='2021-01-02', budget=100
+        )
+        plan.visits.add(visit)
+
+        return plan
+
+    def test_expand_list(self):
+        """Test a list nests the expanded relation of every row"""
+        self.sample_plan()
+
+        res = self.client.get(VISITS_URL, {'expand': 'place'})
+
+        place = res.data['results'][0]['place']
+        self.assertEqual(place['name'], 'Louvre')
+        self.assertEqual(place['categories'], [self.museum.id])
+
+    def test_expand_nested_paths(self):
+        """Test dotted paths expand relations of nested objects"""
+        self.sample_plan()
+
+        res = self.client.get(
+            PLANS_URL, {'expand': 'visits,visits.place.categories'}
+        )
+
+        visit, = res.data['results'][0]['visits']
+        self.assertEqual(visit['title'], 'First visit')
+        self.assertEqual(
+            visit['place']['categories'],
+            [{'id': self.museum.id, 'name': 'Museum'}]
+        )
+
+    def test_expand_query_count(self):
+        """Test expanded lists load relations with a fixed number of
+        queries"""
+        self.assertNumQueriesConstant(
+            3, lambda: self.client.get(
+                PLANS_URL, {'expand': 'visits.place.categories'}
+            ), self.sample_plan
+        )
+
+    def test_retrieve_expands_on_request(self):
+        """Test retrieve nests by default and follows expand= if given"""
+        plan = self.sample_plan()
+        url = reverse('travel:plan-detail', args=[plan.id])
+
+        default = self.client.get(url)
+        flat = self.client.get(url, {'expand': ''})
+
+        self.assertEqual(default.data['visits'][0]['title'], 'First visit')
+        self.assertEqual(flat.data['visits'], [plan.visits.get().id])
+
+    def test_expand_with_fields(self):
+        """Test expanded relations can be picked with fields="""
+        self.sample_plan()
+
+        res = self.client.get(
+            PLACES_URL, {'expand': 'categories', 'fields': 'categories'}
+        )
+
+        self.assertEqual(
+            res.data['results'],
+            [{'categories': [{'id': self.museum.id, 'name': 'Museum'}]}]
+        )
+
+    def test_unknown_expansion_rejected(self):
+        """Test expanding a field that is not a relation is an error"""
+        res = self.client.get(VISITS_URL, {'expand': 'place.notes'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('notes', str(res.data['expand']))
@@ -0,0 +1,134 @@
+import csv
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.test import TestCase
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Category, Place, Visit, Plan
+
+from travel.serializers import PlaceSerializer, VisitSerializer, \
+                               PlanSerializer
+
+
+EXPORT_URL = reverse('travel:export')
+
+
+def sample_place(user, **params):
+    """Create and return a sample place"""
+    defaults = {
+        'name': 'Anywhere buildings',
+        'latitude': 30,
+        'longitude': 60.5,
+        'notes': 'I like here. Should be visited again!!',
+    }
+    defaults.update(params)
+
+    return Place.objects.create(user=user, **defaults)
+
+
+def streamed(res):
+    """Return the decoded body of a streaming response"""
+    return b''.join(res.streaming_content).decode()
+
+
+class PublicExportApiTests(TestCase):
+    """Test the publicly available export API"""
+
+    def test_auth_required(self):
+        """Test that authentication is required"""
+        res = APIClient().get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateExportApiTests(TestCase):
+    """Test authenticated export API access"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'test@anytestadressmail.com',
+            'Test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        self.place = sample_place(user=self.user)
+        self.place.categories.add(Category.objects.create(name='Museum'))
+        self.visit = Visit.objects.create(
+            user=self.user, place=self.place, title='Trip', score=4.5,
+            time='2020-05-01'
+        )
+        self.plan = Plan.objects.create(
+            user=self.user, name='Plan', begins='2020-01-01',
+            ends='2020-01-05', budget=300
+        )
+        self.plan.visits.add(self.visit)
+        self.place.refresh_from_db()
+
+    def test_export_ndjson(self):
+        """Test exporting everything as NDJSON matches the API output"""
+        other = get_user_model().objects.create_user(
+            'other@anytestadressmail.com',
+            'testpass'
+        )
+        sample_place(user=other)
+
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'application/x-ndjson')
+        lines = [json.loads(line) for line in streamed(res).splitlines()]
+        self.assertEqual([line.pop('type') for line in lines],
+                         ['places', 'visits', 'plans'])
+        expected = [
+            PlaceSerializer(self.place).data,
+            VisitSerializer(self.visit).data,
+            PlanSerializer(self.plan).data,
+        ]
+        self.assertEqual(lines, json.loads(json.dumps(expected)))
+
+    def test_export_csv(self):
+        """Test exporting a single resource as CSV"""
+        res = self.client.get(
+            EXPORT_URL, {'output': 'csv', 'resources': 'places'}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        rows = list(csv.DictReader(io.StringIO(streamed(res))))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['name'], self.place.name)
+        self.assertEqual(
+            rows[0]['categories'],
+            str(self.place.categories.get().id)
+        )
+
+    def test_export_csv_needs_single_resource(self):
+        """Test CSV export of several resources is rejected"""
+        res = self.client.get(EXPORT_URL, {'output': 'csv'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_unknown_resource(self):
+        """Test exporting an unknown resource is rejected"""
+        res = self.client.get(EXPORT_URL, {'resources': 'hotels'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_command(self):
+        """Test the export_travelbook command writes NDJSON to stdout"""
+        out = io.StringIO()
+        call_command(
+            'export_travelbook', self.user.email, '--resources', 'visits',
+            '--chunk-size', '1', stdout=out
+        )
+
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]['id'], self.visit.id)
+        self.assertEqual(lines[0]['place'], self.place.id)
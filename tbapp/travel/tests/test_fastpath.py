@@ -0,0 +1,101 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from core.models import Category, Place, Plan, Visit
+
+from travel.cache import response_cache
+from travel.fastpath import RowPlan
+from travel.management.commands.benchmark_serializers import (
+    compare_renders,
+)
+from travel.serializers import PlaceSerializer, PlanSerializer, \
+    VisitSerializer
+
+
+PLACES_URL = reverse('travel:place-list')
+VISITS_URL = reverse('travel:visit-list')
+PLANS_URL = reverse('travel:plan-list')
+
+
+class FastListApiTests(TestCase):
+    """Test list pages rendered from values() rows"""
+
+    def setUp(self):
+        response_cache.clear()
+        self.user = get_user_model().objects.create_user(
+            'test@anytestadressmail.com',
+            'Test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        museum = Category.objects.create(name='Museum')
+        park = Category.objects.create(name='Park')
+        louvre = Place.objects.create(
+            user=self.user, name='Louvre', notes='Long queue',
+            latitude=Decimal('48.860600'), longitude=Decimal('2.337600'),
+        )
+        louvre.categories.add(museum, park)
+        Place.objects.create(user=self.user, name='Nowhere')
+        visit = Visit.objects.create(
+            user=self.user, place=louvre, title='First visit',
+            score=Decimal('4.5'),
+        )
+        Visit.objects.create(user=self.user, place=louvre, title='Again')
+        plan = Plan.objects.create(
+            user=self.user, name='Paris', begins='2021-01-01',
+            ends='2021-01-05', budget=Decimal('500.00'),
+        )
+        plan.visits.add(visit)
+
+    def get_both(self, url, params=None):
+        """Return the bodies of a list with and without the fast path"""
+        with override_settings(TRAVEL_FAST_LISTS=False):
+            response_cache.clear()
+            expected = self.client.get(url, params)
+        response_cache.clear()
+        fast = self.client.get(url, params)
+
+        return expected.content, fast.content
+
+    def test_same_json(self):
+        """Test every list renders the same bytes as the serializer"""
+        for url in (PLACES_URL, VISITS_URL, PLANS_URL):
+            expected, fast = self.get_both(url)
+
+            self.assertEqual(fast, expected, url)
+
+    def test_same_json_sparse(self):
+        """Test sparse fieldsets render the same bytes"""
+        expected, fast = self.get_both(PLACES_URL, {'fields': 'id,name'})
+
+        self.assertEqual(fast, expected)
+        self.assertNotIn(b'notes', fast)
+
+    def test_expand_falls_back(self):
+        """Test nested objects are still rendered by the serializer"""
+        expected, fast = self.get_both(VISITS_URL, {'expand': 'place'})
+
+        self.assertEqual(fast, expected)
+        self.assertIn(b'"name":"Louvre"', fast)
+
+    def test_plan_only_for_plain_fields(self):
+        """Test a plan is built only for serializers it can render"""
+        self.assertIsNotNone(RowPlan.for_serializer(PlaceSerializer()))
+        self.assertIsNone(
+            RowPlan.for_serializer(VisitSerializer(expand={'place': {}}))
+        )
+
+    def test_benchmark_compare(self):
+        """Test the benchmark finds both renders identical"""
+        for serializer_class, model in ((PlaceSerializer, Place),
+                                        (PlanSerializer, Plan)):
+            result = compare_renders(
+                serializer_class, model.objects.order_by('-id'), 1
+            )
+
+            self.assertTrue(result['identical'], model.__name__)
@@ -0,0 +1,152 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.urls import reverse
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import geo
+from core.models import Place
+
+
+PLACES_URL = reverse('travel:place-list')
+NEAREST_URL = reverse('travel:place-nearest')
+BULK_URL = reverse('travel:place-bulk')
+
+
+def sample_place(user, name, latitude=None, longitude=None):
+    """Create and return a sample place"""
+    return Place.objects.create(
+        user=user, name=name, latitude=latitude, longitude=longitude
+    )
+
+
+class PlaceGeoApiTests(TestCase):
+    """Test the bounding-box and radius filters on places"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'test@anytestadressmail.com',
+            'Test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.paris = sample_place(self.user, 'Paris', 48.8566, 2.3522)
+        self.versailles = sample_place(
+            self.user, 'Versailles', 48.8049, 2.1204
+        )
+        self.london = sample_place(self.user, 'London', 51.5074, -0.1278)
+        sample_place(self.user, 'Nowhere')
+
+    def names(self, res):
+        return sorted(item['name'] for item in res.data['results'])
+
+    def test_filter_near(self):
+        """Test filtering places within a radius of a point"""
+        res = self.client.get(
+            PLACES_URL, {'near': '48.8566,2.3522', 'radius': 20}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.names(res), ['Paris', 'Versailles'])
+
+    def test_filter_near_in_sql(self):
+        """Test the radius filter does not list the ids of its places"""
+        places = [
+            Place(user=self.user, name=f'Cafe {number}',
+                  latitude=geo.to_decimal(48.85 + number / 100000),
+                  longitude=geo.to_decimal(2.35))
+            for number in range(1500)
+        ]
+        for place in places:
+            place.set_geo_cell()
+        Place.objects.bulk_create(places)
+
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(
+                PLACES_URL, {'near': '48.8566,2.3522', 'page_size': 10}
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 10)
+        self.assertTrue(all(
+            len(query['sql']) < 2000 for query in ctx.captured_queries
+        ))
+
+    def test_filter_near_default_radius(self):
+        """Test the default radius excludes farther places"""
+        res = self.client.get(PLACES_URL, {'near': '48.8566,2.3522'})
+
+        self.assertEqual(self.names(res), ['Paris'])
+
+    def test_filter_bbox(self):
+        """Test filtering places inside a bounding box"""
+        res = self.client.get(PLACES_URL, {'bbox': '48,-1,52,2.2'})
+
+        self.assertEqual(self.names(res), ['London', 'Versailles'])
+
+    def test_filter_bbox_across_antimeridian(self):
+        """Test a bounding box crossing longitude 180"""
+        sample_place(self.user, 'Fiji', -17.7134, 178.065)
+        sample_place(self.user, 'Samoa', -13.759, -172.1046)
+
+        res = self.client.get(PLACES_URL, {'bbox': '-20,170,-10,-170'})
+
+        self.assertEqual(self.names(res), ['Fiji', 'Samoa'])
+
+    def test_filter_invalid(self):
+        """Test invalid coordinates are rejected"""
+        for params in ({'near': 'paris'}, {'near': '95,0'},
+                       {'near': '48,2', 'radius': '-1'},
+                       {'bbox': '52,0,48,2'}):
+            res = self.client.get(PLACES_URL, params)
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_nearest_ranked(self):
+        """Test nearest lists places by distance with the distance"""
+        res = self.client.get(
+            NEAREST_URL, {'near': '48.8566,2.3522', 'radius': 500}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item['name'] for item in res.data],
+            ['Paris', 'Versailles', 'London']
+        )
+        self.assertEqual(res.data[0]['distance'], 0)
+        self.assertAlmostEqual(res.data[2]['distance'], 343.5, delta=1)
+
+    def test_nearest_limited(self):
+        """Test nearest returns at most limit places"""
+        res = self.client.get(
+            NEAREST_URL, {'near': '48.8566,2.3522', 'radius': 500, 'limit': 2}
+        )
+
+        self.assertEqual(
+            [item['name'] for item in res.data], ['Paris', 'Versailles']
+        )
+
+    def test_nearest_requires_point(self):
+        """Test nearest without a point is rejected"""
+        res = self.client.get(NEAREST_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cell_follows_coordinates(self):
+        """Test moving a place updates its grid cell"""
+        self.client.patch(
+            reverse('travel:place-detail', args=[self.paris.id]),
+            {'latitude': 51.5, 'longitude': -0.12}
+        )
+        self.client.patch(
+            BULK_URL, [{'id': self.london.id, 'latitude': 48.85}],
+            format='json'
+        )
+
+        self.paris.refresh_from_db()
+        self.london.refresh_from_db()
+        self.assertEqual(self.paris.geo_cell, geo.cell_for(51.5, -0.12))
+        self.assertEqual(self.london.geo_cell, geo.cell_for(48.85, -0.1278))
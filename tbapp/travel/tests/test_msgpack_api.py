@@ -0,0 +1,87 @@
+from decimal import Decimal
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Category, Place, Plan, Visit
+from core.renderers import msgpack
+
+from travel.cache import response_cache
+
+
+PLACES_URL = reverse('travel:place-list')
+VISITS_URL = reverse('travel:visit-list')
+PLANS_URL = reverse('travel:plan-list')
+
+MSGPACK = 'application/msgpack'
+
+
+@skipUnless(msgpack, 'msgpack is not installed')
+class MessagePackApiTests(TestCase):
+    """Test the travel API in MessagePack"""
+
+    def setUp(self):
+        response_cache.clear()
+        self.user = get_user_model().objects.create_user(
+            'test@anytestadressmail.com',
+            'Test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.category = Category.objects.create(name='Museum')
+        self.place = Place.objects.create(
+            user=self.user, name='Louvre', latitude=Decimal('48.860600'),
+            longitude=Decimal('2.337600'),
+        )
+        self.place.categories.add(self.category)
+        visit = Visit.objects.create(
+            user=self.user, place=self.place, title='Café',
+            score=Decimal('4.5'),
+        )
+        plan = Plan.objects.create(
+            user=self.user, name='Paris', begins='2021-01-01',
+            ends='2021-01-05', budget=Decimal('500.00'),
+        )
+        plan.visits.add(visit)
+
+    def test_lists_match_json(self):
+        """Test lists decode to the data of their JSON responses"""
+        for url in (PLACES_URL, VISITS_URL, PLANS_URL):
+            expected = self.client.get(url)
+            res = self.client.get(url, HTTP_ACCEPT=MSGPACK)
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(res['Content-Type'], MSGPACK)
+            self.assertEqual(msgpack.unpackb(res.content), expected.json())
+            self.assertLess(len(res.content), len(expected.content))
+
+    def test_create(self):
+        """Test a visit is created from a MessagePack body"""
+        payload = {
+            'title': 'Second visit', 'place': self.place.id, 'score': '3.5',
+        }
+        res = self.client.post(
+            VISITS_URL, payload, format='msgpack', HTTP_ACCEPT=MSGPACK
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        data = msgpack.unpackb(res.content)
+        self.assertEqual(data['title'], 'Second visit')
+        self.assertEqual(data['score'], '3.5')
+        self.assertEqual(
+            Visit.objects.get(id=data['id']).score, Decimal('3.5')
+        )
+
+    def test_invalid_body(self):
+        """Test a malformed body is a bad request"""
+        res = self.client.generic(
+            'POST', VISITS_URL, b'\xc1', content_type=MSGPACK
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('MessagePack parse error', res.json()['detail'])
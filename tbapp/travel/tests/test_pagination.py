@@ -0,0 +1,83 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Category, Place
+
+
+PLACES_URL = reverse('travel:place-list')
+CATEGORY_URL = reverse('travel:category-list')
+
+
+def sample_place(user, **params):
+    """Create and return a sample place"""
+    defaults = {'name': 'Anywhere buildings'}
+    defaults.update(params)
+
+    return Place.objects.create(user=user, **defaults)
+
+
+class CursorPaginationTests(TestCase):
+    """Test cursor pagination of the travel list endpoints"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'test@anytestadressmail.com',
+            'Test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_walk_pages(self):
+        """Test following next cursors returns every place exactly once"""
+        places = [sample_place(user=self.user) for _ in range(5)]
+
+        ids = []
+        res = self.client.get(PLACES_URL, {'page_size': 2})
+        while True:
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(res.data['results']), 2)
+            ids.extend(item['id'] for item in res.data['results'])
+            if not res.data['next']:
+                break
+            res = self.client.get(res.data['next'])
+
+        self.assertEqual(ids, sorted((p.id for p in places), reverse=True))
+
+    def test_cursor_stable_after_insert(self):
+        """Test new rows do not shift the following pages"""
+        places = [sample_place(user=self.user) for _ in range(4)]
+
+        res = self.client.get(PLACES_URL, {'page_size': 2})
+        sample_place(user=self.user)
+        res = self.client.get(res.data['next'])
+
+        ids = [item['id'] for item in res.data['results']]
+        self.assertEqual(ids, [places[1].id, places[0].id])
+
+    def test_no_count_query(self):
+        """Test listing a page does not count the table"""
+        sample_place(user=self.user)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(PLACES_URL)
+
+        for query in ctx.captured_queries:
+            self.assertNotIn('COUNT(', query['sql'].upper())
+
+    def test_categories_paged_by_name(self):
+        """Test categories are paged in descending name order"""
+        for name in ('Museum', 'Pub', 'Cafe'):
+            Category.objects.create(name=name)
+
+        res = self.client.get(CATEGORY_URL, {'page_size': 2})
+        names = [item['name'] for item in res.data['results']]
+        res = self.client.get(res.data['next'])
+        names += [item['name'] for item in res.data['results']]
+
+        self.assertEqual(names, ['Pub', 'Museum', 'Cafe'])
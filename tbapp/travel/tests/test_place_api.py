@@ -6,6 +6,7 @@ from rest_framework import status
 from rest_framework.test import APIClient
 
 from core.models import Place, Category
+from core.testing import QueryCountMixin
 
 from travel.serializers import PlaceSerializer, PlaceDetailSerializer
 
@@ -50,7 +51,7 @@ class PublicPlaceApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
-class PrivatePlaceApiTests(TestCase):
+class PrivatePlaceApiTests(QueryCountMixin, TestCase):
     """Test authenticated place API access"""
 
     def setUp(self):
@@ -71,7 +72,7 @@ class PrivatePlaceApiTests(TestCase):
         places = Place.objects.all().order_by('-id')
         serializer = PlaceSerializer(places, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_places_limited_to_user(self):
         """Test retrieving places for user"""
@@ -87,8 +88,18 @@ class PrivatePlaceApiTests(TestCase):
         places = Place.objects.filter(user=self.user)
         serializer = PlaceSerializer(places, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 1)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(len(res.data['results']), 1)
+        self.assertEqual(res.data['results'], serializer.data)
+
+    def test_list_places_query_count(self):
+        """Test listing places does not run a query per place"""
+        def grow():
+            place = sample_place(user=self.user)
+            place.categories.add(sample_category(name=f'Cat {place.id}'))
+
+        self.assertNumQueriesConstant(
+            2, lambda: self.client.get(PLACES_URL), grow
+        )
 
     def test_view_place_detail(self):
         """Test viewing a place detail"""
@@ -6,6 +6,7 @@ from rest_framework import status
 from rest_framework.test import APIClient
 
 from core.models import Plan, Visit, Place
+from core.testing import QueryCountMixin
 
 from travel.serializers import PlanSerializer, PlanDetailSerializer
 
@@ -74,7 +75,7 @@ class PublicPlanApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
-class PrivatePlanApiTests(TestCase):
+class PrivatePlanApiTests(QueryCountMixin, TestCase):
     """Test authenticated plan API access"""
 
     def setUp(self):
@@ -95,7 +96,7 @@ class PrivatePlanApiTests(TestCase):
         plans = Plan.objects.all().order_by('-id')
         serializer = PlanSerializer(plans, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_plans_limited_to_user(self):
         """Test retrieving plans for user"""
@@ -111,8 +112,8 @@ class PrivatePlanApiTests(TestCase):
         plans = Plan.objects.filter(user=self.user)
         serializer = PlanSerializer(plans, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 1)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(len(res.data['results']), 1)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_view_plan_detail(self):
         """Test viewing a plan detail"""
@@ -124,6 +125,23 @@ class PrivatePlanApiTests(TestCase):
         serializer = PlanDetailSerializer(plan)
         self.assertEqual(res.data, serializer.data)
 
+    def test_list_and_view_plans_query_count(self):
+        """Test plan list and detail do not run a query per visit"""
+        plan = sample_plan(user=self.user)
+
+        def grow():
+            sample_plan(user=self.user).visits.add(
+                sample_visit(user=self.user)
+            )
+            plan.visits.add(sample_visit(user=self.user))
+
+        self.assertNumQueriesConstant(
+            2, lambda: self.client.get(PLANS_URL), grow
+        )
+        self.assertNumQueriesConstant(
+            2, lambda: self.client.get(detail_url(plan.id)), grow
+        )
+
     def test_create_basic_plan(self):
         """Test creating plan"""
         payload = {
@@ -223,6 +241,6 @@ class PrivatePlanApiTests(TestCase):
         serializer1 = PlanSerializer(plan1)
         serializer2 = PlanSerializer(plan2)
         serializer3 = PlanSerializer(plan3)
-        self.assertIn(serializer1.data, res.data)
-        self.assertIn(serializer2.data, res.data)
-        self.assertNotIn(serializer3.data, res.data)
+        self.assertIn(serializer1.data, res.data['results'])
+        self.assertIn(serializer2.data, res.data['results'])
+        self.assertNotIn(serializer3.data, res.data['results'])
@@ -0,0 +1,126 @@
+import os
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import connections
+from django.urls import reverse
+from django.test import TestCase, override_settings
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.db.routers import ReplicaRouter, set_read_alias, reset_read_alias
+from core.models import Place
+
+from travel.cache import response_cache
+
+
+PLACES_URL = reverse('travel:place-list')
+
+# A cache other processes could read, holding the read-your-writes pins
+SHARED_CACHES = dict(settings.CACHES, pins={
+    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+    'LOCATION': tempfile.mkdtemp(prefix='tbapp-pins-'),
+})
+
+
+@override_settings(
+    DATABASE_REPLICAS=['replica'], CACHES=SHARED_CACHES,
+    READ_YOUR_WRITES_CACHE='pins',
+)
+class ReplicaRoutingTests(TestCase):
+    """Test reads routed to a replica held in a second SQLite file"""
+    databases = {'default', 'replica'}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        connections.databases['replica'] = {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.path.join(cls.tmp.name, 'replica.sqlite3'),
+        }
+        connections.ensure_defaults('replica')
+        connections.prepare_test_settings('replica')
+        call_command('migrate', database='replica', verbosity=0)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections['replica'].close()
+        del connections.databases['replica']
+        cls.tmp.cleanup()
+
+    def setUp(self):
+        cache.clear()
+        caches['pins'].clear()
+        response_cache.clear()
+        self.user = get_user_model().objects.create_user(
+            'test@anytestadressmail.com',
+            'Test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_reads_served_by_replica(self):
+        """Test a list reads the replica, which has not seen the place"""
+        Place.objects.create(user=self.user, name='Louvre')
+
+        res = self.client.get(PLACES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'], [])
+
+    def test_writer_reads_own_writes(self):
+        """Test a user reads the primary right after creating a place"""
+        self.client.post(PLACES_URL, {'name': 'Louvre'})
+
+        res = self.client.get(PLACES_URL)
+
+        self.assertEqual(
+            [item['name'] for item in res.data['results']], ['Louvre']
+        )
+
+    def test_pin_expires(self):
+        """Test reads go back to the replica after the window"""
+        with override_settings(READ_YOUR_WRITES_SECONDS=0):
+            self.client.post(PLACES_URL, {'name': 'Louvre'})
+
+        res = self.client.get(PLACES_URL)
+
+        self.assertEqual(res.data['results'], [])
+
+    def test_primary_without_shared_cache(self):
+        """Test reads go to the primary when pins cannot be shared"""
+        Place.objects.create(user=self.user, name='Louvre')
+
+        with override_settings(READ_YOUR_WRITES_CACHE=None):
+            res = self.client.get(PLACES_URL)
+
+        self.assertEqual(
+            [item['name'] for item in res.data['results']], ['Louvre']
+        )
+
+    def test_failed_write_does_not_pin(self):
+        """Test a rejected write keeps the user on the replica"""
+        self.client.post(PLACES_URL, {'name': ''})
+        Place.objects.create(user=self.user, name='Louvre')
+
+        res = self.client.get(PLACES_URL)
+
+        self.assertEqual(res.data['results'], [])
+
+    def test_router(self):
+        """Test writes go to the primary and reads follow the request"""
+        router = ReplicaRouter()
+        self.assertEqual(router.db_for_read(Place), 'default')
+
+        token = set_read_alias('replica')
+        try:
+            self.assertEqual(router.db_for_read(Place), 'replica')
+            self.assertEqual(router.db_for_write(Place), 'default')
+        finally:
+            reset_read_alias(token)
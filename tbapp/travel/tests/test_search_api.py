@@ -0,0 +1,146 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.urls import reverse
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Place, Visit
+from core.search import tokenize
+
+
+PLACES_URL = reverse('travel:place-list')
+PLACE_SEARCH_URL = reverse('travel:place-search')
+VISITS_URL = reverse('travel:visit-list')
+VISIT_SEARCH_URL = reverse('travel:visit-search')
+
+
+def sample_place(user, **params):
+    """Create and return a sample place"""
+    defaults = {'name': 'Anywhere buildings'}
+    defaults.update(params)
+
+    return Place.objects.create(user=user, **defaults)
+
+
+class SearchApiTests(TestCase):
+    """Test full-text search on places and visits"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'test@anytestadressmail.com',
+            'Test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.louvre = sample_place(
+            self.user, name='Louvre Museum', notes='Paintings everywhere'
+        )
+        self.orsay = sample_place(
+            self.user, name="Musée d'Orsay",
+            notes='Impressionist paintings in an old museum station'
+        )
+        sample_place(self.user, name='Eiffel Tower', notes='Great view')
+
+    def test_search_places(self):
+        """Test search= keeps places holding every word"""
+        res = self.client.get(PLACES_URL, {'search': 'museum paintings'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {item['id'] for item in res.data['results']},
+            {self.louvre.id, self.orsay.id}
+        )
+
+    def test_search_limited_to_user(self):
+        """Test search does not return places of other users"""
+        other = get_user_model().objects.create_user(
+            'other@anytestadressmail.com',
+            'testpass'
+        )
+        sample_place(other, name='Louvre Museum')
+
+        res = self.client.get(PLACES_URL, {'search': 'louvre'})
+
+        self.assertEqual(
+            [item['id'] for item in res.data['results']], [self.louvre.id]
+        )
+
+    def test_search_matches_in_sql(self):
+        """Test search does not list the ids of its matches"""
+        Place.objects.bulk_create([
+            Place(user=self.user, name=f'Cafe {number}')
+            for number in range(1500)
+        ])
+
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(
+                PLACES_URL, {'search': 'cafe', 'page_size': 10}
+            )
+
+        self.assertEqual(len(res.data['results']), 10)
+        self.assertTrue(all(
+            len(query['sql']) < 2000 for query in ctx.captured_queries
+        ))
+
+    def test_search_ranked(self):
+        """Test matches in the name rank above matches in the notes"""
+        res = self.client.get(PLACE_SEARCH_URL, {'search': 'museum'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item['id'] for item in res.data],
+            [self.louvre.id, self.orsay.id]
+        )
+        self.assertGreater(res.data[0]['rank'], res.data[1]['rank'])
+
+    def test_search_sees_updates(self):
+        """Test search reflects edited and bulk edited places"""
+        self.client.patch(
+            reverse('travel:place-detail', args=[self.louvre.id]),
+            {'notes': 'Sculptures'}
+        )
+        self.client.patch(
+            reverse('travel:place-bulk'),
+            [{'id': self.orsay.id, 'name': 'Rodin garden'}],
+            format='json'
+        )
+
+        res = self.client.get(PLACES_URL, {'search': 'sculptures'})
+        self.assertEqual(
+            [item['id'] for item in res.data['results']], [self.louvre.id]
+        )
+        res = self.client.get(PLACES_URL, {'search': 'paintings'})
+        self.assertEqual(
+            [item['id'] for item in res.data['results']], [self.orsay.id]
+        )
+
+    def test_search_visits(self):
+        """Test searching visits by title and notes"""
+        visit = Visit.objects.create(
+            user=self.user, place=self.louvre, title='Rainy Sunday',
+            notes='Queued for the Mona Lisa'
+        )
+        Visit.objects.create(user=self.user, place=self.orsay, title='Sun')
+
+        res = self.client.get(VISITS_URL, {'search': 'mona'})
+        ranked = self.client.get(VISIT_SEARCH_URL, {'search': 'sunday'})
+
+        self.assertEqual(
+            [item['id'] for item in res.data['results']], [visit.id]
+        )
+        self.assertEqual([item['id'] for item in ranked.data], [visit.id])
+
+    def test_search_requires_words(self):
+        """Test the ranked search requires search="""
+        res = self.client.get(PLACE_SEARCH_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_tokenize(self):
+        """Test text is split into lower-cased words"""
+        self.assertEqual(
+            tokenize("Musée d'Orsay, PARIS"), ['musée', 'd', 'orsay', 'paris']
+        )
@@ -0,0 +1,100 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from core import geo
+from core.models import Category, Place, Plan, Visit
+
+from travel import seeding
+
+
+def place_scores():
+    return list(Place.objects.order_by('id').values_list(
+        'score_sum', 'score_count', 'avg_score'
+    ))
+
+
+class SeedTravelbookTests(TestCase):
+    """Test generating synthetic travel books"""
+
+    def test_seed_command(self):
+        """Test the requested rows and relations are created"""
+        out = StringIO()
+
+        call_command(
+            'seed_travelbook', '--users', '3', '--places-per-user', '4',
+            '--visits-per-place', '2', '--plans', '2',
+            '--visits-per-plan', '3', '--chunk-size', '40', stdout=out,
+        )
+
+        self.assertEqual(get_user_model().objects.count(), 3)
+        self.assertEqual(Place.objects.count(), 12)
+        self.assertEqual(Visit.objects.count(), 24)
+        self.assertEqual(Plan.objects.count(), 6)
+        self.assertEqual(Category.objects.count(), 20)
+        self.assertEqual(Plan.visits.through.objects.count(), 18)
+        for place in Place.objects.prefetch_related('categories'):
+            self.assertTrue(1 <= len(place.categories.all()) <= 3)
+            self.assertEqual(
+                place.geo_cell,
+                geo.cell_for(place.latitude, place.longitude)
+            )
+        for plan in Plan.objects.prefetch_related('visits'):
+            self.assertEqual(
+                {visit.user_id for visit in plan.visits.all()},
+                {plan.user_id}
+            )
+        self.assertIn('Seeded 3 users', out.getvalue())
+
+    def test_scores_match_visits(self):
+        """Test the generated score totals equal recomputed ones"""
+        for _ in seeding.seed(4, 5, 3, 1, seed=7):
+            pass
+        generated = place_scores()
+
+        Place.objects.recompute_scores()
+
+        # Averages ending in 5 round differently per backend
+        for (total, count, average), expected in zip(
+                generated, place_scores()):
+            self.assertEqual((total, count), expected[:2])
+            if count:
+                self.assertAlmostEqual(average, expected[2], delta=0.1)
+
+    def test_keys_follow_existing_rows(self):
+        """Test seeding after existing rows and creating rows after it"""
+        user = get_user_model().objects.create_user(
+            'test@anytestadressmail.com', 'Test123'
+        )
+        Place.objects.create(user=user, name='Louvre')
+
+        for _ in seeding.seed(2, 2, 1, 1, chunk_size=1):
+            pass
+        place = Place.objects.create(user=user, name='Orsay')
+
+        self.assertEqual(Place.objects.count(), 6)
+        self.assertEqual(place.id, Place.objects.order_by('-id')[0].id)
+
+    def test_seed_reproducible(self):
+        """Test the same seed generates the same rows"""
+        generator = seeding.Generator(2, 2, 1, 2, [1, 2, 3], 'x', seed=3)
+
+        first = generator.rows(0, 2)
+        again = generator.rows(0, 2)
+
+        self.assertEqual(
+            [place.name for place in first[Place]],
+            [place.name for place in again[Place]]
+        )
+        self.assertEqual(
+            [visit.score for visit in first[Visit]],
+            [visit.score for visit in again[Visit]]
+        )
+
+    def test_parallel_writers_rejected_on_sqlite(self):
+        """Test workers are refused on SQLite"""
+        with self.assertRaises(CommandError):
+            call_command('seed_travelbook', '--workers', '2')
@@ -0,0 +1,121 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Category, Place, Plan, Visit
+
+from travel.cache import response_cache
+
+
+PLACES_URL = reverse('travel:place-list')
+VISITS_URL = reverse('travel:visit-list')
+PLANS_URL = reverse('travel:plan-list')
+
+
+def place_queries(queries):
+    """Return the SQL of the queries loading place rows"""
+    return [
+        query['sql'] for query in queries
+        if query['sql'].startswith('SELECT "core_place"."id"')
+    ]
+
+
+class SparseFieldsetApiTests(TestCase):
+    """Test the fields= and exclude= query parameters"""
+
+    def setUp(self):
+        response_cache.clear()
+        self.user = get_user_model().objects.create_user(
+            'test@anytestadressmail.com',
+            'Test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.place = Place.objects.create(
+            user=self.user, name='Louvre', notes='Long queue'
+        )
+        self.place.categories.add(Category.objects.create(name='Museum'))
+        self.visit = Visit.objects.create(
+            user=self.user, place=self.place, title='First visit'
+        )
+
+    def test_fields_trim_list_and_columns(self):
+        """Test only the picked fields are rendered and loaded"""
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(PLACES_URL, {'fields': 'id,name'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data['results'], [{'id': self.place.id, 'name': 'Louvre'}]
+        )
+        loads = place_queries(queries.captured_queries)
+        self.assertTrue(loads)
+        self.assertFalse(any('"notes"' in sql for sql in loads))
+        self.assertFalse(any(
+            'core_place_categories' in query['sql']
+            for query in queries.captured_queries
+        ))
+
+    def test_exclude(self):
+        """Test excluded fields are left out of the response"""
+        res = self.client.get(PLACES_URL, {'exclude': 'notes,categories'})
+
+        item = res.data['results'][0]
+        self.assertNotIn('notes', item)
+        self.assertNotIn('categories', item)
+        self.assertEqual(item['name'], 'Louvre')
+
+    def test_unknown_field_rejected(self):
+        """Test asking for a field the serializer lacks is an error"""
+        res = self.client.get(PLACES_URL, {'fields': 'id,password'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('password', str(res.data['fields']))
+
+    def test_nested_objects_kept_whole(self):
+        """Test a retrieved visit trims itself but not its place"""
+        url = reverse('travel:visit-detail', args=[self.visit.id])
+
+        res = self.client.get(url, {'fields': 'title,place'})
+
+        self.assertEqual(set(res.data), {'title', 'place'})
+        self.assertEqual(res.data['place']['notes'], 'Long queue')
+
+    def test_related_ids(self):
+        """Test picked many-to-many ids are still prefetched"""
+        plan = Plan.objects.create(
+            user=self.user, name='Paris', begins='2021-01-01',
+            ends='2021-01-02', budget=100
+        )
+        plan.visits.add(self.visit)
+
+        res = self.client.get(PLANS_URL, {'fields': 'name,visits'})
+
+        self.assertEqual(
+            res.data['results'], [{'name': 'Paris', 'visits': [self.visit.id]}]
+        )
+
+    def test_search_trimmed(self):
+        """Test ranked search results honour the fieldset"""
+        url = reverse('travel:visit-search')
+
+        res = self.client.get(url, {'search': 'first', 'fields': 'title'})
+
+        self.assertEqual(len(res.data), 1)
+        self.assertEqual(res.data[0]['title'], 'First visit')
+        self.assertNotIn('notes', res.data[0])
+
+    def test_writes_render_every_field(self):
+        """Test a create response is not trimmed"""
+        res = self.client.post(
+            f'{VISITS_URL}?fields=id',
+            {'title': 'Again', 'place': self.place.id}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data['title'], 'Again')
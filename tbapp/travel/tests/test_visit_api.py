@@ -5,7 +5,8 @@ from django.test import TestCase
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from core.models import Visit, Place
+from core.models import Visit, Place, Category
+from core.testing import QueryCountMixin
 
 from travel.serializers import VisitSerializer, VisitDetailSerializer
 
@@ -60,7 +61,7 @@ class PublicVisitApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
-class PrivateVisitApiTests(TestCase):
+class PrivateVisitApiTests(QueryCountMixin, TestCase):
     """Test authenticated visit API access"""
 
     def setUp(self):
@@ -81,7 +82,7 @@ class PrivateVisitApiTests(TestCase):
         visits = Visit.objects.all().order_by('-id')
         serializer = VisitSerializer(visits, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_visits_limited_to_user(self):
         """Test retrieving visits for user"""
@@ -97,8 +98,8 @@ class PrivateVisitApiTests(TestCase):
         visits = Visit.objects.filter(user=self.user)
         serializer = VisitSerializer(visits, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 1)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(len(res.data['results']), 1)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_view_visit_detail(self):
         """Test viewing a visit detail"""
@@ -110,6 +111,20 @@ class PrivateVisitApiTests(TestCase):
         serializer = VisitDetailSerializer(visit)
         self.assertEqual(res.data, serializer.data)
 
+    def test_view_visit_detail_query_count(self):
+        """Test the visit detail loads the nested place in fixed queries"""
+        visit = sample_visit(user=self.user)
+
+        def grow():
+            category = Category.objects.create(
+                name=f'Cat {visit.place.categories.count()}'
+            )
+            visit.place.categories.add(category)
+
+        self.assertNumQueriesConstant(
+            2, lambda: self.client.get(detail_url(visit.id)), grow
+        )
+
     def test_create_basic_visit(self):
         """Test creating visit"""
         place = sample_place(self.user)
@@ -201,5 +216,5 @@ class PrivateVisitApiTests(TestCase):
 
         visit1 = VisitSerializer(visit1)
         visit2 = VisitSerializer(visit2)
-        self.assertIn(visit1.data, res.data)
-        self.assertNotIn(visit2.data, res.data)
+        self.assertIn(visit1.data, res.data['results'])
+        self.assertNotIn(visit2.data, res.data['results'])
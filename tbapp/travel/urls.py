@@ -15,5 +15,6 @@ router.register('plans', views.PlanViewSet)
 app_name = 'travel'
 
 urlpatterns = [
+    path('export/', views.ExportView.as_view(), name='export'),
     path('', include(router.urls))
 ]
@@ -1,41 +1,101 @@
+from django.conf import settings
+from django.http import StreamingHttpResponse
+
 from rest_framework import viewsets, mixins
-from rest_framework.authentication import TokenAuthentication
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, \
                                         IsAuthenticated
 
+from core import geo
+from core.authentication import CachedTokenAuthentication
 from core.models import Category, Place, Visit, Plan
 
-from travel import serializers
+from travel import export, serializers
+from travel.bulk import BulkMixin
+from travel.cache import CachedListMixin
+from travel.categories import CachedCategoryListMixin, category_cache
+from travel.conditional import ConditionalMixin
+from travel.fastpath import FastListMixin
+from travel.pagination import CategoryCursorPagination, parse_limit
+from travel.prefetch import PrefetchMixin
+from travel.replicas import ReadReplicaMixin
+from travel.search import SearchMixin
 
 
-class CategoryViewSet(viewsets.GenericViewSet,
+class CategoryViewSet(ConditionalMixin, CachedCategoryListMixin,
+                      viewsets.GenericViewSet,
                       mixins.ListModelMixin,
                       mixins.CreateModelMixin):
     """Manage categories in the database"""
     queryset = Category.objects.all()
     serializer_class = serializers.CategorySerializer
-    authentication_classes = (TokenAuthentication,)
+    pagination_class = CategoryCursorPagination
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (IsAuthenticatedOrReadOnly,)
 
     def get_queryset(self):
         """Return objects"""
         return self.queryset.order_by('-name')
 
+    def get_fingerprint(self):
+        """Fingerprint the list from the category cache, without a query"""
+        snapshot = category_cache.snapshot()
+
+        return snapshot.last_modified, list(snapshot.categories)
 
-class PlaceViewSet(viewsets.ModelViewSet):
+
+class PlaceViewSet(ReadReplicaMixin, ConditionalMixin, CachedListMixin,
+                   FastListMixin, BulkMixin, SearchMixin, PrefetchMixin,
+                   viewsets.ModelViewSet):
     """Manage places in the database"""
+    cache_scopes = ('place', 'category')
     serializer_class = serializers.PlaceSerializer
     queryset = Place.objects.all()
-    authentication_classes = (TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (IsAuthenticated,)
 
     def get_queryset(self):
         """Retrieve the places for the authenticated user"""
-        return self.queryset.filter(user=self.request.user)
+        queryset = self.queryset.filter(user=self.request.user)
+        bbox = self.request.query_params.get('bbox')
+        if bbox:
+            try:
+                queryset = queryset.in_bbox(*geo.parse_bbox(bbox))
+            except ValueError as exc:
+                raise ValidationError({'bbox': str(exc)})
+        if self.request.query_params.get('near'):
+            queryset = queryset.within(*self.get_near())
+        queryset = self.search_queryset(queryset)
+
+        return self.optimize_queryset(queryset)
+
+    def get_near(self):
+        """Return the (latitude, longitude, radius) of near= queries"""
+        params = self.request.query_params
+        try:
+            latitude, longitude = geo.parse_point(params.get('near'))
+        except ValueError as exc:
+            raise ValidationError({'near': str(exc)})
+        try:
+            radius = float(
+                params.get('radius', settings.TRAVEL_NEAR_RADIUS_KM)
+            )
+        except ValueError:
+            radius = 0
+        if not radius > 0:
+            raise ValidationError(
+                {'radius': 'Must be a positive number of km.'}
+            )
+
+        return latitude, longitude, radius
 
     def get_serializer_class(self):
         """Return appropriate serializer class"""
-        if self.action == 'retrieve':
+        if self.action == 'retrieve' and \
+                'expand' not in self.request.query_params:
             return serializers.PlaceDetailSerializer
 
         return self.serializer_class
@@ -44,12 +104,39 @@ class PlaceViewSet(viewsets.ModelViewSet):
         """Create a new recipe"""
         serializer.save(user=self.request.user)
 
+    def prepare_bulk_write(self, places):
+        """Derive the grid cells that save() would set"""
+        for place in places:
+            place.set_geo_cell()
+
+        return ('geo_cell',)
+
+    @action(detail=False, methods=['get'])
+    def nearest(self, request):
+        """List the places within radius of near, nearest first"""
+        if not request.query_params.get('near'):
+            raise ValidationError({'near': 'This parameter is required.'})
+        limit = parse_limit(request.query_params)
+
+        # get_queryset() keeps the places within radius, with distance
+        queryset = self.get_queryset()
+        nearby = [
+            (round(distance, 3), pk)
+            for distance, pk in queryset.prefetch_related(None)
+            .order_by('distance', 'pk').values_list('distance', 'pk')[:limit]
+        ]
+
+        return Response(self.ranked_data(queryset, nearby, 'distance'))
 
-class VisitViewSet(viewsets.ModelViewSet):
+
+class VisitViewSet(ReadReplicaMixin, ConditionalMixin, CachedListMixin,
+                   FastListMixin, BulkMixin, SearchMixin, PrefetchMixin,
+                   viewsets.ModelViewSet):
     """Manage visits in the database"""
+    cache_scopes = ('visit',)
     serializer_class = serializers.VisitSerializer
     queryset = Visit.objects.all()
-    authentication_classes = (TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (IsAuthenticated,)
 
     def _params_to_ints(self, qs):
@@ -64,11 +151,16 @@ class VisitViewSet(viewsets.ModelViewSet):
             place_ids = self._params_to_ints(places)
             queryset = queryset.filter(place__id__in=place_ids)
 
-        return queryset.filter(user=self.request.user)
+        queryset = self.search_queryset(
+            queryset.filter(user=self.request.user)
+        )
+
+        return self.optimize_queryset(queryset)
 
     def get_serializer_class(self):
         """Return appropriate serializer class"""
-        if self.action == 'retrieve':
+        if self.action == 'retrieve' and \
+                'expand' not in self.request.query_params:
             return serializers.VisitDetailSerializer
 
         return self.serializer_class
@@ -77,12 +169,22 @@ class VisitViewSet(viewsets.ModelViewSet):
         """Create a new visit"""
         serializer.save(user=self.request.user)
 
+    def perform_bulk_write(self, visits):
+        """Rebuild the scores of places gaining or losing visits"""
+        place_ids = set()
+        for visit in visits:
+            place_ids.add(visit.place_id)
+            place_ids.add(getattr(visit, '_stored_score', (None,))[0])
+            visit.remember_score()
+        Place.objects.filter(id__in=place_ids - {None}).recompute_scores()
 
-class PlanViewSet(viewsets.ModelViewSet):
+
+class PlanViewSet(ReadReplicaMixin, ConditionalMixin, FastListMixin,
+                  PrefetchMixin, viewsets.ModelViewSet):
     """Manage plans in the database"""
     serializer_class = serializers.PlanSerializer
     queryset = Plan.objects.all()
-    authentication_classes = (TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (IsAuthenticated,)
 
     def _params_to_ints(self, qs):
@@ -95,13 +197,16 @@ class PlanViewSet(viewsets.ModelViewSet):
         visits = self.request.query_params.get('visits')
         if visits:
             visits_ids = self._params_to_ints(visits)
-            queryset = queryset.filter(visits__id__in=visits_ids)
+            queryset = queryset.filter(visits__id__in=visits_ids).distinct()
+
+        queryset = queryset.filter(user=self.request.user)
 
-        return queryset.filter(user=self.request.user)
+        return self.optimize_queryset(queryset)
 
     def get_serializer_class(self):
         """Return appropriate serializer class"""
-        if self.action == 'retrieve':
+        if self.action == 'retrieve' and \
+                'expand' not in self.request.query_params:
             return serializers.PlanDetailSerializer
 
         return self.serializer_class
@@ -109,3 +214,36 @@ class PlanViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         """Create a new plan"""
         serializer.save(user=self.request.user)
+
+
+class ExportView(APIView):
+    """Stream the authenticated user's travel book as NDJSON or CSV"""
+    authentication_classes = (CachedTokenAuthentication,)
+    permission_classes = (IsAuthenticated,)
+    content_types = {
+        'ndjson': 'application/x-ndjson',
+        'csv': 'text/csv',
+    }
+
+    def get(self, request):
+        """Return a streaming response with the requested resources"""
+        output = request.query_params.get('output', 'ndjson')
+        if output not in export.FORMATS:
+            raise ValidationError(
+                {'output': f'Must be one of {", ".join(export.FORMATS)}'}
+            )
+        try:
+            resources = export.parse_resources(
+                request.query_params.get('resources')
+            )
+            rows = export.iter_export(request.user, output, resources)
+        except ValueError as exc:
+            raise ValidationError({'resources': str(exc)})
+
+        response = StreamingHttpResponse(
+            rows, content_type=self.content_types[output]
+        )
+        filename = f'travelbook-{"-".join(resources)}.{output}'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+
+        return response
@@ -3,8 +3,10 @@ from django.utils.translation import ugettext_lazy as _
 
 from rest_framework import serializers
 
+from core.metrics import SerializerTimingMixin
 
-class UserSerializer(serializers.ModelSerializer):
+
+class UserSerializer(SerializerTimingMixin, serializers.ModelSerializer):
     """Serializer for user object"""
 
     class Meta:
@@ -1,3 +1,5 @@
+from unittest import skipUnless
+
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.urls import reverse
@@ -5,6 +7,8 @@ from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
 
+from core.renderers import msgpack
+
 
 CREATE_USER_URL = reverse('user:create')
 TOKEN_URL = reverse('user:token')
@@ -154,3 +158,37 @@ class PrivateUserApiTests(TestCase):
         self.assertEqual(self.user.name, payload['name'])
         self.assertTrue(self.user.check_password(payload['password']))
         self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+
+@skipUnless(msgpack, 'msgpack is not installed')
+class MessagePackUserApiTests(TestCase):
+    """Test the user API in MessagePack"""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_create_and_token(self):
+        """Test signing up and getting a token with MessagePack bodies"""
+        payload = {
+            'email': 'testuser@anytestaddressmail.com',
+            'password': 'Test123',
+            'name': 'testname'
+        }
+        res = self.client.post(
+            CREATE_USER_URL, payload, format='msgpack',
+            HTTP_ACCEPT='application/msgpack',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res['Content-Type'], 'application/msgpack')
+        self.assertEqual(msgpack.unpackb(res.content), {
+            'email': payload['email'], 'name': payload['name'],
+        })
+
+        res = self.client.post(
+            TOKEN_URL, {'email': payload['email'], 'password': 'Test123'},
+            format='msgpack', HTTP_ACCEPT='application/msgpack',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('token', msgpack.unpackb(res.content))